@@ -0,0 +1,101 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .extractor import apply_event_info, build_markets, finalize_markets, new_event_data
+from .series import copy_event, plain_histories
+from .http_engine import CLOB_API_URL, HttpClient, fetch_price_history
+from .singleflight import SingleFlight
+from .utils import extract_slug_from_url, normalize_to_url
+
+
+GAMMA_API_URL = "https://gamma-api.polymarket.com"
+
+
+class ApiEngine:
+    """Scrape events straight from Polymarket's JSON endpoints over a keep-alive pool.
+
+    ``concurrency`` bounds how many events and price-history requests run at once;
+    ``per_host`` caps open connections to each host (callers block for a free one).
+    Concurrent requests for the same event share one extraction, each getting its own copy.
+    """
+
+    def __init__(self, gamma_url=GAMMA_API_URL, clob_url=CLOB_API_URL, concurrency=8, per_host=4,
+                 timeout=10, retries=2, include_history=True, history_interval="max",
+                 history_fidelity=60):
+        self.gamma_url = gamma_url.rstrip("/")
+        self.clob_url = clob_url.rstrip("/")
+        self.concurrency = max(1, concurrency)
+        self.include_history = include_history
+        self.history_interval = history_interval
+        self.history_fidelity = history_fidelity
+        self.client = HttpClient(timeout=timeout, retries=retries, maxsize=max(1, per_host), block=True)
+        self._event_pool = ThreadPoolExecutor(max_workers=self.concurrency)
+        self._request_pool = ThreadPoolExecutor(max_workers=self.concurrency)
+        self._flights = SingleFlight(copy=copy_event)
+
+    def fetch_event(self, slug) -> Optional[Dict[str, Any]]:
+        data = self.client.get_json(f"{self.gamma_url}/events", fields={"slug": slug})
+        if isinstance(data, list):
+            data = data[0] if data else None
+        return data if isinstance(data, dict) else None
+
+    def fetch_price_history(self, token_id) -> List[Dict[str, Any]]:
+        return fetch_price_history(self.client, token_id, clob_url=self.clob_url,
+                                   interval=self.history_interval, fidelity=self.history_fidelity)
+
+    def _fetch_histories(self, raw_markets):
+        token_ids = []
+        for market in raw_markets:
+            if not isinstance(market, dict):
+                continue
+            ids = market.get("clobTokenIds") or []
+            if isinstance(ids, str):
+                try:
+                    ids = json.loads(ids)
+                except ValueError:
+                    ids = []
+            token_ids.extend(str(token_id) for token_id in ids if token_id)
+
+        token_ids = list(dict.fromkeys(token_ids))
+        results = self._request_pool.map(self.fetch_price_history, token_ids)
+        return dict(zip(token_ids, results))
+
+    def extract_event(self, url_or_slug, columnar=False) -> Optional[Dict[str, Any]]:
+        """Return the event in the same shape as ``extract_event_data``, or None if unknown."""
+        event_data = self._flights.do(url_or_slug, self._extract_event, url_or_slug)
+        if event_data is None or columnar:
+            return event_data
+        return plain_histories(event_data)
+
+    def _extract_event(self, url_or_slug):
+        slug = extract_slug_from_url(url_or_slug) or url_or_slug
+        url = url_or_slug if "/event/" in url_or_slug else normalize_to_url(slug, "id")
+
+        event = self.fetch_event(slug)
+        if not event:
+            return None
+
+        event_data = new_event_data(url)
+        apply_event_info(event_data, event)
+
+        raw_markets = event.get("markets") or []
+        histories = self._fetch_histories(raw_markets) if self.include_history else None
+        markets = build_markets(raw_markets, histories=histories)
+        event_data["markets"] = finalize_markets(markets, [])
+        return event_data
+
+    def extract_events(self, urls_or_slugs) -> List[Optional[Dict[str, Any]]]:
+        """Scrape several events concurrently; results keep the input order."""
+        return list(self._event_pool.map(self.extract_event, urls_or_slugs))
+
+    def close(self):
+        self._event_pool.shutdown(wait=True)
+        self._request_pool.shutdown(wait=True)
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
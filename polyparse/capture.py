@@ -9,6 +9,8 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 
+from .page import scroll_until_settled
+
 
 def capture_all_network_data(url: str, output_dir: str = "./captures", url_patterns: List[str] = None, headless: bool = True):
     if url_patterns is None:
@@ -52,17 +54,7 @@ def capture_all_network_data(url: str, output_dir: str = "./captures", url_patte
         driver.get(url)
         time.sleep(4)
         
-        last_height = 0
-        for scroll_round in range(15):
-            try:
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2.0)
-                new_height = driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    break
-                last_height = new_height
-            except Exception:
-                break
+        scroll_until_settled(driver, max_rounds=15, fallback_pause=2.0)
         
         time.sleep(3)
         
@@ -10,6 +10,21 @@ from .driver import create_driver, enable_network_logging
 from .auth import login
 from .utils import normalize_to_url, extract_slug_from_url
 from .extractor import extract_event_data, extract_recurring_events
+from .http_engine import extract_event_data_http
+from .api import ApiEngine, GAMMA_API_URL, CLOB_API_URL
+from .matrix import MATRIX_FORMATS, align_event
+from .store import EventCache, HistoryStore, ResolvedEventCache
+from .series import RESAMPLE_METHODS, json_default, parse_interval, resample_event
+
+
+def _validate_interval(ctx, param, value):
+    if value is None:
+        return value
+    try:
+        parse_interval(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    return value
 
 
 @click.command()
@@ -18,11 +33,39 @@ from .extractor import extract_event_data, extract_recurring_events
 @click.option("--search", help="Search query to find event")
 @click.option("--output-dir", default="./polyparse_data", help="Output directory for JSON files")
 @click.option("--capture-dir", default=None, help="Directory to save all captured network responses")
+@click.option("--cache-dir", default=None,
+              help="Directory for cached results; resolved past events stored there are not scraped again")
+@click.option("--cache-ttl", type=click.FloatRange(min=0), default=0,
+              help="Reuse a cached result for a single event younger than this many seconds (needs --cache-dir)")
+@click.option("--engine", type=click.Choice(["browser", "http", "api"]), default="browser",
+              help="Scraping engine; 'http' parses the page HTML and 'api' calls the JSON endpoints, both without a browser, falling back to the browser when they find no data (past events always use the browser)")
+@click.option("--gamma-url", default=GAMMA_API_URL, help="Base URL of the events API used by --engine api and to look up past events")
+@click.option("--clob-url", default=CLOB_API_URL, help="Base URL of the price-history API used by --engine http and api")
+@click.option("--collector", is_flag=True, help="Collect JSON responses in-page instead of per-request CDP calls")
+@click.option("--race", is_flag=True,
+              help="Probe the rendered page while network capture runs and keep whichever yields the event first")
+@click.option("--client-nav", is_flag=True,
+              help="Move between past events inside the loaded app instead of reloading each page")
+@click.option("--pipeline", is_flag=True,
+              help="Parse each past event in a worker thread while the browser loads the next one")
+@click.option("--prefetch", type=click.IntRange(min=0), default=0,
+              help="Number of upcoming past events to prefetch in the background while the current one is scraped")
+@click.option("--prefetch-concurrency", type=click.IntRange(min=1), default=2,
+              help="Maximum prefetches in flight at once")
+@click.option("--resample", default=None, callback=_validate_interval,
+              help="Resample price history into bars of this width, e.g. 15m, 1h, 1d")
+@click.option("--resample-method", type=click.Choice(RESAMPLE_METHODS), default="ohlc",
+              help="Bar type for --resample: open/high/low/close, or the last price of each bar")
+@click.option("--matrix", type=click.Choice(MATRIX_FORMATS), default=None,
+              help="Also write all outcomes aligned on one time index as a .npz or Arrow file")
+@click.option("--normalize", is_flag=True, help="Scale each --matrix row so outcome prices sum to 1")
+@click.option("--incremental", is_flag=True,
+              help="Append only new price points to a per-event store in the output directory instead of writing a new snapshot")
 @click.option("--past-events", type=int, help="Number of past events to scrape for recurring events")
 @click.option("--auth", is_flag=True, help="Enable authentication")
 @click.option("--headless", is_flag=True, help="Run browser in headless mode")
 @click.option("--verbose", is_flag=True, help="Verbose output")
-def main(url, id, search, output_dir, capture_dir, past_events, auth, headless, verbose):
+def main(url, id, search, output_dir, capture_dir, cache_dir, cache_ttl, engine, gamma_url, clob_url, collector, race, client_nav, pipeline, prefetch, prefetch_concurrency, resample, resample_method, matrix, normalize, incremental, past_events, auth, headless, verbose):
     if not any([url, id, search]):
         click.echo("Error: Must provide --url, --id, or --search")
         return
@@ -43,6 +86,29 @@ def main(url, id, search, output_dir, capture_dir, past_events, auth, headless,
     if verbose:
         click.echo(f"Target URL: {event_url}")
     
+    event_data = None
+    if engine != "browser" and input_type != "search" and not auth:
+        if past_events is None:
+            past_events = click.prompt("How many past events to scrape?", type=int, default=0)
+        
+        if past_events <= 0:
+            if engine == "http":
+                click.echo(f"Fetching event page: {event_url}")
+                event_data = extract_event_data_http(event_url, columnar=True, clob_url=clob_url)
+            else:
+                click.echo(f"Fetching event from API: {event_url}")
+                with ApiEngine(gamma_url=gamma_url, clob_url=clob_url) as api:
+                    event_data = api.extract_event(event_url, columnar=True)
+            if event_data is None:
+                click.echo("No event data without a browser, falling back to browser")
+        else:
+            click.echo(f"--engine {engine} does not scrape past events, using the browser")
+    
+    if event_data is not None:
+        _save_event_data(event_data, event_url, output_dir, past_events, resample, resample_method,
+                         matrix, normalize, incremental)
+        return
+    
     driver = None
     try:
         driver = create_driver(headless=headless)
@@ -80,30 +146,31 @@ def main(url, id, search, output_dir, capture_dir, past_events, auth, headless,
             os.makedirs(capture_dir, exist_ok=True)
         
         if past_events > 0:
+            resolved_cache = ResolvedEventCache(os.path.join(cache_dir, "resolved")) if cache_dir else None
             click.echo("Extracting main event data...")
-            event_data = extract_recurring_events(driver, event_url, past_events, capture_dir=capture_dir)
+            event_data = extract_recurring_events(driver, event_url, past_events, capture_dir=capture_dir,
+                                                  use_collector=collector, race_dom=race,
+                                                  in_app=client_nav, pipeline=pipeline,
+                                                  prefetch_depth=prefetch,
+                                                  prefetch_concurrency=prefetch_concurrency,
+                                                  resolved_cache=resolved_cache,
+                                                  gamma_url=gamma_url, columnar=True)
             click.echo(f"Scraped {len(event_data.get('past_events', []))} past events")
         else:
             click.echo("Extracting event data...")
-            event_data = extract_event_data(driver, event_url, capture_dir=capture_dir)
-        
-        click.echo(f"Found {len(event_data.get('markets', []))} market outcomes")
-        
-        os.makedirs(output_dir, exist_ok=True)
-        
-        slug = extract_slug_from_url(event_url) or event_data.get("event_id", "unknown")
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{slug}_{timestamp}.json"
-        filepath = os.path.join(output_dir, filename)
-        
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(event_data, f, indent=2, ensure_ascii=False)
+            if cache_dir and cache_ttl > 0:
+                with EventCache(os.path.join(cache_dir, "live"), ttl=cache_ttl, stale_ttl=0) as event_cache:
+                    event_data = event_cache.fetch(event_url, extract_event_data, driver, event_url,
+                                                   capture_dir=capture_dir, use_collector=collector,
+                                                   race_dom=race, columnar=True)
+                if event_data and verbose:
+                    click.echo(f"Cache {event_data['cache']['status']} (age {event_data['cache']['age_seconds']:.0f}s)")
+            else:
+                event_data = extract_event_data(driver, event_url, capture_dir=capture_dir,
+                                                use_collector=collector, race_dom=race, columnar=True)
         
-        click.echo(f"✓ Data saved to: {filepath}")
-        click.echo(f"  Event: {event_data.get('title', 'Unknown')}")
-        click.echo(f"  Markets: {len(event_data.get('markets', []))}")
-        if past_events > 0:
-            click.echo(f"  Past events: {len(event_data.get('past_events', []))}")
+        _save_event_data(event_data, event_url, output_dir, past_events, resample, resample_method,
+                         matrix, normalize, incremental)
         
     except WebDriverException as e:
         click.echo(f"Error: WebDriver error - {e}")
@@ -117,6 +184,66 @@ def main(url, id, search, output_dir, capture_dir, past_events, auth, headless,
             driver.quit()
 
 
+def _save_event_data(event_data, event_url, output_dir, past_events, resample=None, resample_method="ohlc",
+                     matrix=None, normalize=False, incremental=False):
+    click.echo(f"Found {len(event_data.get('markets', []))} market outcomes")
+    
+    if incremental:
+        _update_store(event_data, event_url, output_dir, past_events)
+        if resample or matrix:
+            click.echo("Note: --resample and --matrix are not applied to the incremental store")
+        return
+    
+    if resample:
+        resample_event(event_data, resample, resample_method)
+    
+    os.makedirs(output_dir, exist_ok=True)
+    
+    slug = extract_slug_from_url(event_url) or event_data.get("event_id", "unknown")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"{slug}_{timestamp}.json"
+    filepath = os.path.join(output_dir, filename)
+    
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(event_data, f, indent=2, ensure_ascii=False, default=json_default)
+    
+    click.echo(f"✓ Data saved to: {filepath}")
+    
+    if matrix:
+        matrix_path = os.path.join(output_dir, f"{slug}_{timestamp}.{matrix}")
+        try:
+            aligned = align_event(event_data, normalize=normalize).save(matrix_path)
+            click.echo(f"✓ Price matrix saved to: {aligned}")
+        except ImportError as e:
+            click.echo(f"Error: {e}")
+    click.echo(f"  Event: {event_data.get('title', 'Unknown')}")
+    click.echo(f"  Markets: {len(event_data.get('markets', []))}")
+    if past_events and past_events > 0:
+        click.echo(f"  Past events: {len(event_data.get('past_events', []))}")
+
+
+def _update_store(event_data, event_url, output_dir, past_events):
+    slug = extract_slug_from_url(event_url) or event_data.get("event_id", "unknown")
+    events = [(slug, event_data)]
+    for past_event in event_data.get("past_events", []):
+        if isinstance(past_event, dict):
+            past_slug = extract_slug_from_url(past_event.get("url", "")) or past_event.get("event_id")
+            if past_slug:
+                events.append((past_slug, past_event))
+    
+    for event_slug, event in events:
+        store = HistoryStore(output_dir, event_slug)
+        is_new = not store.exists()
+        added = store.append(event)
+        status = "Created" if is_new else "Updated"
+        click.echo(f"✓ {status} store: {store.snapshot_path} (+{added} price points)")
+    
+    click.echo(f"  Event: {event_data.get('title', 'Unknown')}")
+    click.echo(f"  Markets: {len(event_data.get('markets', []))}")
+    if past_events and past_events > 0:
+        click.echo(f"  Past events: {len(event_data.get('past_events', []))}")
+
+
 if __name__ == "__main__":
     main()
 
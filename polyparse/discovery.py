@@ -0,0 +1,150 @@
+import json
+import time
+from typing import Any, Dict, Iterable, List
+
+from .parser import extract_next_data
+from .utils import extract_slug_from_url, normalize_to_url, to_epoch_ms
+
+
+SERIES_PAGE_SIZE = 100
+
+
+def _series_objects(data, found=None):
+    """Every dict reachable from ``data`` that describes a series (``series`` values, or dicts with ``recurrence``)."""
+    if found is None:
+        found = []
+    if isinstance(data, dict):
+        if "recurrence" in data and isinstance(data.get("events"), list):
+            found.append(data)
+        for key, value in data.items():
+            if key == "series":
+                # Chart configs also use "series"; Polymarket series carry a slug or recurrence.
+                for series in value if isinstance(value, list) else [value]:
+                    if isinstance(series, dict) and ("slug" in series or "recurrence" in series):
+                        found.append(series)
+            if isinstance(value, (dict, list)):
+                _series_objects(value, found)
+    elif isinstance(data, list):
+        for item in data:
+            if isinstance(item, (dict, list)):
+                _series_objects(item, found)
+    return found
+
+
+def _end_ms(event):
+    try:
+        return to_epoch_ms(event.get("endDate") or event.get("end_date"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_past(event, now_ms):
+    if event.get("closed") or event.get("resolved"):
+        return True
+    end = _end_ms(event)
+    return end is not None and end < now_ms
+
+
+def collect_series(sources: Iterable[Any]):
+    """Series ids and the events listed under them, from parsed JSON ``sources``."""
+    series_ids = []
+    events = []
+    for source in sources:
+        for series in _series_objects(source):
+            series_id = series.get("id")
+            if series_id is not None and str(series_id) not in series_ids:
+                series_ids.append(str(series_id))
+            for event in series.get("events") or []:
+                if isinstance(event, dict) and event.get("slug"):
+                    events.append(event)
+    return series_ids, events
+
+
+def past_events_from(events, current_slug=None, now_ms=None) -> List[Dict[str, Any]]:
+    """Closed or ended events other than ``current_slug``, most recently ended first, one per slug."""
+    now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    past = {}
+    for event in events:
+        slug = event["slug"]
+        if slug == current_slug or slug in past or not _is_past(event, now_ms):
+            continue
+        past[slug] = {
+            "slug": slug,
+            "url": normalize_to_url(slug, "id"),
+            "end_date": event.get("endDate") or event.get("end_date"),
+            "_end_ms": _end_ms(event),
+        }
+
+    ordered = sorted(past.values(), key=lambda e: e["_end_ms"] if e["_end_ms"] is not None else float("-inf"),
+                     reverse=True)
+    for event in ordered:
+        del event["_end_ms"]
+    return ordered
+
+
+def fetch_series_events(client, gamma_url, series_id, limit, offset=0) -> List[Dict[str, Any]]:
+    """One page of a series' closed events from the Gamma API, most recently ended first."""
+    data = client.get_json(f"{gamma_url.rstrip('/')}/events", fields={
+        "series_id": series_id,
+        "closed": "true",
+        "order": "endDate",
+        "ascending": "false",
+        "limit": limit,
+        "offset": offset,
+    })
+    if not isinstance(data, list):
+        return []
+    return [event for event in data if isinstance(event, dict) and event.get("slug")]
+
+
+def discover_past_events(driver, max_events, current_url=None, responses=None, client=None,
+                         gamma_url=None) -> List[Dict[str, Any]]:
+    """Past events of the series ``current_url`` belongs to, without touching the page's UI.
+
+    Series data comes from the page's Next.js props and any captured ``responses``
+    (``NetworkMonitor.responses`` entries). When that lists fewer than ``max_events``
+    past events, the series is paged through the Gamma API (``client`` is an
+    ``HttpClient``; one is created if needed). Returns ``{"slug", "url", "end_date"}``
+    dicts, most recently ended first; empty if no series was found.
+    """
+    if max_events <= 0:
+        return []
+
+    sources = []
+    page_props = extract_next_data(driver) if driver is not None else None
+    if page_props:
+        sources.append(page_props)
+    for response in responses or []:
+        body = response.get("body") if isinstance(response, dict) else None
+        if not body:
+            continue
+        try:
+            sources.append(json.loads(body))
+        except (TypeError, ValueError):
+            continue
+
+    current_slug = extract_slug_from_url(current_url) if current_url else None
+    series_ids, events = collect_series(sources)
+    past = past_events_from(events, current_slug)
+    if len(past) >= max_events or not series_ids:
+        return past[:max_events]
+
+    from .api import GAMMA_API_URL
+    from .http_engine import HttpClient
+
+    own_client = client is None
+    client = client or HttpClient()
+    try:
+        for series_id in series_ids:
+            offset = 0
+            while len(past) < max_events:
+                page = fetch_series_events(client, gamma_url or GAMMA_API_URL, series_id, SERIES_PAGE_SIZE, offset)
+                events.extend(page)
+                past = past_events_from(events, current_slug)
+                if len(page) < SERIES_PAGE_SIZE:
+                    break
+                offset += SERIES_PAGE_SIZE
+    finally:
+        if own_client:
+            client.close()
+    return past[:max_events]
@@ -1,4 +1,5 @@
 from selenium import webdriver
+from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
@@ -58,7 +59,10 @@ def create_driver(headless=False, enable_network_capture=True):
         service = Service(ChromeDriverManager().install())
         driver = webdriver.Chrome(service=service, options=options)
         driver.set_window_size(1920, 1080)
-        driver.implicitly_wait(5)
+        # Lookups wait explicitly (find_first, wait_for_element); an implicit wait would
+        # stack on top of every missing selector in a fallback chain.
+        driver.implicitly_wait(0)
+        driver.set_script_timeout(SCRIPT_TIMEOUT)
         
         if enable_network_capture:
             enable_network_logging(driver)
@@ -108,7 +112,194 @@ def capture_network_responses(driver, timeout=10):
     return captured_responses
 
 
+FIND_FIRST_SCRIPT = """
+    var candidates = arguments[0];
+    for (var i = 0; i < candidates.length; i++) {
+        var kind = candidates[i][0];
+        var value = candidates[i][1];
+        var element = null;
+        try {
+            if (kind === 'xpath') {
+                element = document.evaluate(value, document, null,
+                    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            } else {
+                element = document.querySelector(value);
+            }
+        } catch (e) {
+            element = null;
+        }
+        if (element) return [i, element];
+    }
+    return [-1, null];
+"""
+
+
+# Blocks inside the page until one of the candidates matches, re-checking on DOM
+# mutations instead of polling over the wire. Resolves with [index, element] (or
+# [index, elements] when all matches are requested) and [-1, null] at the deadline.
+WAIT_FOR_FIRST_SCRIPT = """
+    var candidates = arguments[0];
+    var timeoutMs = arguments[1];
+    var wantAll = arguments[2];
+    var done = arguments[arguments.length - 1];
+    
+    function lookup() {
+        for (var i = 0; i < candidates.length; i++) {
+            var kind = candidates[i][0];
+            var value = candidates[i][1];
+            try {
+                if (kind === 'xpath') {
+                    var snapshot = document.evaluate(value, document, null,
+                        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                    if (snapshot.snapshotLength) {
+                        if (!wantAll) return [i, snapshot.snapshotItem(0)];
+                        var nodes = [];
+                        for (var j = 0; j < snapshot.snapshotLength; j++) nodes.push(snapshot.snapshotItem(j));
+                        return [i, nodes];
+                    }
+                } else if (wantAll) {
+                    var found = document.querySelectorAll(value);
+                    if (found.length) return [i, Array.prototype.slice.call(found)];
+                } else {
+                    var element = document.querySelector(value);
+                    if (element) return [i, element];
+                }
+            } catch (e) {}
+        }
+        return null;
+    }
+    
+    var hit = lookup();
+    if (hit) {
+        done(hit);
+        return;
+    }
+    
+    var finished = false;
+    var observer = new MutationObserver(function() {
+        if (finished) return;
+        var hit = lookup();
+        if (hit) finish(hit);
+    });
+    var timer = setTimeout(function() { finish([-1, null]); }, timeoutMs);
+    function finish(result) {
+        finished = true;
+        observer.disconnect();
+        clearTimeout(timer);
+        done(result);
+    }
+    observer.observe(document.documentElement || document, {childList: true, subtree: true, attributes: true});
+"""
+
+# Async script budget set on the driver; waits longer than this are split into several calls.
+SCRIPT_TIMEOUT = 30
+
+
+def _css_escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def to_locator(candidate):
+    """``(kind, value)`` for the in-page lookup: ``kind`` is ``'css'`` or ``'xpath'``."""
+    if isinstance(candidate, str):
+        return "css", candidate
+    by, value = candidate
+    if by == By.XPATH:
+        return "xpath", value
+    if by == By.CSS_SELECTOR:
+        return "css", value
+    if by == By.NAME:
+        return "css", f'[name="{_css_escape(value)}"]'
+    if by == By.ID:
+        return "css", f'[id="{_css_escape(value)}"]'
+    if by == By.CLASS_NAME:
+        return "css", f'[class~="{_css_escape(value)}"]'
+    if by == By.TAG_NAME:
+        return "css", value
+    raise ValueError(f"Unsupported locator strategy: {by}")
+
+
+def _find_first_once(driver, locators):
+    try:
+        result = driver.execute_script(FIND_FIRST_SCRIPT, [list(locator) for locator in locators])
+    except Exception:
+        result = None
+    
+    if isinstance(result, (list, tuple)) and len(result) == 2 and isinstance(result[0], int):
+        if result[0] >= 0 and result[1] is not None:
+            return result[0], result[1]
+        return None, None
+    
+    # Script unavailable: check each candidate with an immediate WebDriver lookup.
+    for index, (kind, value) in enumerate(locators):
+        try:
+            elements = driver.find_elements(By.XPATH if kind == "xpath" else By.CSS_SELECTOR, value)
+        except Exception:
+            continue
+        if isinstance(elements, list) and elements:
+            return index, elements[0]
+    return None, None
+
+
+def find_first(driver, candidates, timeout=0, poll_interval=0.1):
+    """First of ``candidates`` present on the page, as ``(index, element)``; ``(None, None)`` if none.
+    
+    Candidates are CSS selector strings or ``(By, value)`` pairs. All of them are checked
+    in a single script call, in order, so a miss costs one round trip rather than one
+    timeout per selector. With ``timeout`` the page itself waits for the first match
+    (see ``wait_for_first``), falling back to repeating the lookup.
+    """
+    locators = [to_locator(candidate) for candidate in candidates]
+    if not locators:
+        return None, None
+    
+    if timeout > 0:
+        result = wait_for_first(driver, locators, timeout)
+        if result is not None:
+            return result
+    
+    deadline = time.time() + timeout
+    while True:
+        index, element = _find_first_once(driver, locators)
+        if element is not None or time.time() >= deadline:
+            return index, element
+        time.sleep(poll_interval)
+
+
+def wait_for_first(driver, locators, timeout, all_matches=False):
+    """Block in one async script until a ``to_locator`` pair matches or ``timeout`` seconds pass.
+    
+    Returns ``(index, element)`` (``(index, elements)`` with ``all_matches``) or
+    ``(None, None)`` at the deadline, and None when async scripts are unavailable so
+    callers can fall back to polling.
+    """
+    deadline = time.time() + timeout
+    while True:
+        remaining = deadline - time.time()
+        chunk = max(0.0, min(remaining, SCRIPT_TIMEOUT - 1))
+        try:
+            result = driver.execute_async_script(
+                WAIT_FOR_FIRST_SCRIPT, [list(locator) for locator in locators], int(chunk * 1000), all_matches
+            )
+        except Exception:
+            return None
+        
+        if not (isinstance(result, (list, tuple)) and len(result) == 2 and isinstance(result[0], int)):
+            return None
+        if result[0] >= 0 and result[1]:
+            return result[0], result[1]
+        if time.time() >= deadline - 0.05:
+            return None, None
+
+
 def wait_for_element(driver, by, value, timeout=10):
+    try:
+        result = wait_for_first(driver, [to_locator((by, value))], timeout)
+    except ValueError:
+        result = None
+    if result is not None:
+        return result[1]
+    
     try:
         element = WebDriverWait(driver, timeout).until(
             EC.presence_of_element_located((by, value))
@@ -119,6 +310,13 @@ def wait_for_element(driver, by, value, timeout=10):
 
 
 def wait_for_elements(driver, by, value, timeout=10):
+    try:
+        result = wait_for_first(driver, [to_locator((by, value))], timeout, all_matches=True)
+    except ValueError:
+        result = None
+    if result is not None:
+        return list(result[1] or [])
+    
     try:
         elements = WebDriverWait(driver, timeout).until(
             EC.presence_of_all_elements_located((by, value))
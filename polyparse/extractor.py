@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import time
 import json
@@ -9,20 +10,443 @@ from .parser import (
     detect_recurring_event,
     get_past_event_urls,
     extract_market_data_from_network,
+    extract_next_data,
+    prefetch_pages,
 )
+from .discovery import discover_past_events
 from .network import NetworkMonitor
-from .utils import extract_event_id_from_url, extract_slug_from_url
+from .page import scroll_until_settled
+from .markets import MarketSet
+from .series import PriceSeries, plain_histories
+from .utils import extract_event_id_from_url, extract_slug_from_url, to_epoch_ms
 
 
-def extract_event_data(driver, url, use_network=True, capture_dir=None, fast_mode=False):
+def _as_list(value):
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    return value if isinstance(value, list) else []
+
+
+def apply_event_info(event_data, event_info):
+    if not event_data.get("title") and event_info.get("title"):
+        event_data["title"] = event_info["title"]
+    if not event_data.get("description") and event_info.get("description"):
+        event_data["description"] = event_info["description"]
+    if not event_data.get("category") and isinstance(event_info.get("category"), str):
+        event_data["category"] = event_info["category"]
+    if event_info.get("endDate") or event_info.get("end_date"):
+        event_data["end_date"] = str(event_info.get("endDate") or event_info.get("end_date", ""))
+    # Unlike the page's keyword-based flag, these come from the event itself.
+    if event_info.get("resolved") is not None:
+        event_data["resolved"] = event_info["resolved"]
+        event_data["resolved_source"] = "event"
+    elif event_info.get("closed") is not None:
+        event_data["resolved"] = bool(event_info["closed"])
+        event_data["resolved_source"] = "event"
+
+
+def build_markets(markets_list, histories=None):
+    """Turn Gamma-style markets into market objects; ``histories`` maps CLOB token ids to points."""
+    markets = []
+    for market in markets_list:
+        if not isinstance(market, dict):
+            continue
+        
+        outcomes = _as_list(market.get("outcomes", []))
+        outcome_prices = _as_list(market.get("outcomePrices", []))
+        token_ids = _as_list(market.get("clobTokenIds", []))
+        market_id = market.get("conditionId") or market.get("id")
+        volume = market.get("volume") or market.get("volumeNum") or market.get("volume_num") or 0
+        liquidity = market.get("liquidity") or market.get("liquidityNum") or market.get("liquidity_num") or volume
+        
+        # Get the market identifier (candidate name, etc.)
+        market_name = (market.get("title") or market.get("question") or
+                       market.get("groupItemTitle") or market.get("token") or
+                       market.get("ticker") or market.get("name") or
+                       market.get("description", ""))
+        
+        for idx, outcome in enumerate(outcomes):
+            if idx >= len(outcome_prices):
+                continue
+            try:
+                price = float(outcome_prices[idx])
+                if price > 1:
+                    price = price / 100
+                
+                # For multi-candidate markets, prepend candidate name to outcome
+                outcome_label = str(outcome)
+                if market_name and len(outcomes) > 1 and len(markets_list) > 1:
+                    # If there are multiple markets with Yes/No outcomes, prefix with market name
+                    if outcome_label in ["Yes", "No", "Up", "Down"]:
+                        outcome_label = f"{market_name}"
+                
+                market_obj = {
+                    "outcome": outcome_label,
+                    "current_price": price,
+                    "volume": float(volume) if volume else 0.0,
+                    "liquidity": float(liquidity) if liquidity else 0.0,
+                    "price_history": PriceSeries(),
+                }
+                if market_id:
+                    market_obj["market_id"] = str(market_id)
+                if idx < len(token_ids) and token_ids[idx]:
+                    market_obj["token_id"] = str(token_ids[idx])
+                
+                history = market.get("priceHistory") or market.get("history")
+                if histories and idx < len(token_ids) and histories.get(str(token_ids[idx])):
+                    history = histories[str(token_ids[idx])]
+                
+                if isinstance(history, list):
+                    market_obj["price_history"] = PriceSeries.from_points(history)
+                
+                markets.append(market_obj)
+            except (TypeError, ValueError):
+                pass
+    
+    return markets
+
+
+def market_ids(market):
+    """The CLOB token id and condition id a raw captured market names, keyed like ``build_markets`` output."""
+    ids = {}
+    token_id = market.get("token_id") or market.get("asset_id") or market.get("tokenId")
+    if token_id:
+        ids["token_id"] = str(token_id)
+    market_id = market.get("conditionId") or market.get("condition_id")
+    if market_id:
+        ids["market_id"] = str(market_id)
+    return ids
+
+
+def _outcome_market(market):
+    """Market object for a captured single-outcome entry (a CLOB token, a DOM-like record), or None."""
+    outcome = (market.get("outcome") or market.get("token") or 
+              market.get("name") or market.get("side") or 
+              market.get("label"))
+    
+    if not outcome:
+        return None
+    
+    price = (market.get("price") or market.get("currentPrice") or 
+            market.get("lastPrice") or market.get("latestPrice") or
+            market.get("yesPrice") or market.get("noPrice"))
+    
+    if price is None:
+        price_str = market.get("priceDisplay") or market.get("priceStr")
+        if price_str:
+            try:
+                price = float(price_str.replace("%", "").replace("$", "").strip())
+                if price > 1:
+                    price = price / 100
+            except:
+                pass
+    
+    if price is None:
+        return None
+    
+    volume = (market.get("volume") or market.get("totalVolume") or 
+             market.get("volume24h") or market.get("volumeUsd") or 0)
+    
+    liquidity = (market.get("liquidity") or market.get("totalLiquidity") or
+                market.get("liquidityUsd") or volume)
+    
+    try:
+        price = float(price)
+        market_obj = {
+            "outcome": str(outcome),
+            "current_price": price if price <= 1 else price / 100,
+            "volume": float(volume) if volume else 0.0,
+            "liquidity": float(liquidity) if liquidity else 0.0,
+        }
+    except (TypeError, ValueError):
+        return None
+    market_obj.update(market_ids(market))
+    
+    market_history = (market.get("priceHistory") or market.get("history") or
+                     market.get("priceData") or market.get("timeSeries") or
+                     market.get("candles") or market.get("ticks") or [])
+    
+    if isinstance(market_history, list):
+        market_obj["price_history"] = PriceSeries.from_points(market_history)
+    else:
+        market_obj["price_history"] = PriceSeries()
+    
+    return market_obj
+
+
+def network_markets(raw_markets):
+    """Market objects for the raw markets a ``NetworkMonitor`` parsed out of its responses.
+    
+    Gamma-style markets (``outcomes``/``outcomePrices``) go through ``build_markets``,
+    once each; single-outcome entries such as CLOB tokens become one market apiece.
+    """
+    gamma_markets, seen, markets = [], set(), []
+    for market in raw_markets or []:
+        if not isinstance(market, dict):
+            continue
+        if "outcomes" in market and "outcomePrices" in market:
+            key = market.get("conditionId") or market.get("id") or market.get("question") or id(market)
+            if key not in seen:
+                seen.add(key)
+                gamma_markets.append(market)
+            continue
+        market_obj = _outcome_market(market)
+        if market_obj is not None:
+            markets.append(market_obj)
+    return build_markets(gamma_markets) + markets
+
+
+def new_event_data(url):
+    return {
+        "event_id": extract_event_id_from_url(url) or extract_slug_from_url(url) or "unknown",
+        "url": url,
+        "scraped_at": datetime.utcnow().isoformat() + "Z",
+    }
+
+
+def parse_page_props(page_props, event_data):
+    """Pull event info and markets out of a Next.js ``pageProps`` dehydrated react-query state."""
+    markets = []
+    dehydrated = page_props.get("dehydratedState")
+    if not isinstance(dehydrated, dict):
+        return markets
+    
+    for query in dehydrated.get("queries") or []:
+        if not isinstance(query, dict) or not isinstance(query.get("state"), dict):
+            continue
+        query_data = query["state"].get("data")
+        
+        if isinstance(query_data, dict):
+            if "event" in query_data or "market" in query_data or "markets" in query_data:
+                event_info = query_data.get("event") or query_data.get("market") or query_data
+                if isinstance(event_info, dict):
+                    apply_event_info(event_data, event_info)
+            
+            markets_list = query_data.get("markets")
+            if isinstance(markets_list, list):
+                markets.extend(build_markets(markets_list))
+        
+        elif isinstance(query_data, list):
+            for item in query_data:
+                if isinstance(item, dict) and isinstance(item.get("markets"), list):
+                    markets.extend(build_markets(item["markets"]))
+    
+    return markets
+
+
+def finalize_markets(markets, price_history):
+    """Merge duplicate markets and normalize each history; history-less markets share the event-level series."""
+    if not isinstance(markets, MarketSet):
+        markets = MarketSet(markets)
+    markets = markets.to_list()
+    
+    shared_history = PriceSeries.from_points(price_history)
+    for market in markets:
+        history = market.get("price_history")
+        if history:
+            market["price_history"] = PriceSeries.from_points(history)
+        else:
+            # Every market without its own history points at the same series.
+            market["price_history"] = shared_history
+    
+    return markets
+
+
+def event_is_complete(event_data, markets):
+    """True when there is a title and at least one priced market."""
+    return bool(event_data.get("title")) and any(
+        m.get("current_price") is not None for m in markets
+    )
+
+
+def event_from_page_props(page_props, url, columnar=False):
+    """Build a full event dict from Next.js ``pageProps``, or None if it lacks the event or markets.
+    
+    Histories are lists of points unless ``columnar``, which keeps them as ``PriceSeries``.
+    """
+    event_data = new_event_data(url)
+    markets = parse_page_props(page_props, event_data)
+    if not event_is_complete(event_data, markets):
+        return None
+    
+    history = page_props.get("priceHistory")
+    price_history = history if isinstance(history, list) else []
+    event_data["markets"] = finalize_markets(markets, price_history)
+    return event_data if columnar else plain_histories(event_data)
+
+
+def event_has_history(event_data):
+    """True when at least one of the event's markets carries price history."""
+    return any(market.get("price_history") for market in event_data.get("markets") or [])
+
+
+def capture_is_sufficient(min_markets=1, require_history=False):
+    """Sufficiency predicate for ``NetworkMonitor``: a titled event with ``min_markets`` priced markets.
+    
+    Markets are counted as ``build_event`` will build them (``network_markets``), so
+    capture never stops on data the parser would throw away. With ``require_history``
+    each of those markets also needs a captured history for its CLOB token (or, for
+    markets without a token id, the event-level history must be non-empty).
+    """
+    def sufficient(progress):
+        event = progress.get("event")
+        if not isinstance(event, dict) or not event.get("title"):
+            return False
+        priced = [m for m in network_markets(progress.get("markets")) if m.get("current_price") is not None]
+        if len(priced) < min_markets:
+            return False
+        if not require_history:
+            return True
+        
+        history_tokens = progress.get("history_tokens") or set()
+        for market in priced:
+            if market.get("price_history"):
+                continue
+            if market.get("token_id"):
+                if market["token_id"] not in history_tokens:
+                    return False
+            elif not progress.get("price_history"):
+                return False
+        return True
+    
+    return sufficient
+
+
+def history_is_captured(token_ids):
+    """Sufficiency predicate for a history-only capture: every token in ``token_ids`` has a history.
+    
+    Without token ids any captured history will do.
+    """
+    token_ids = [str(token_id) for token_id in token_ids if token_id]
+    
+    def sufficient(progress):
+        if token_ids:
+            history_tokens = progress.get("history_tokens") or set()
+            return all(token_id in history_tokens for token_id in token_ids)
+        return bool(progress.get("price_history"))
+    
+    return sufficient
+
+
+def probe_dom_event(driver, url, require_history=False):
+    """Read the rendered page once; the event if it is already complete, else None.
+    
+    Complete means what ``capture_is_sufficient`` asks of the network side: a title and at
+    least one real (non-placeholder) market with a price, plus a price history when
+    ``require_history`` is set.
+    """
+    try:
+        metadata = extract_event_metadata(driver)
+        markets = [m for m in extract_market_data(driver) if m.get("outcome") != "Unknown"]
+        event_data = new_event_data(url)
+        event_data.update(metadata)
+        if not event_is_complete(event_data, markets):
+            return None
+        price_history = extract_price_history(driver)
+        if require_history and not price_history:
+            return None
+        event_data["markets"] = finalize_markets(markets, price_history)
+        return event_data
+    except Exception:
+        return None
+
+
+def has_network_markets(network_monitor):
+    """True when ``build_event`` will get priced markets out of the monitor's captured markets.
+    
+    Uses the incrementally parsed ``progress`` when the monitor keeps one (it has a
+    sufficiency predicate), else parses the captured responses.
+    """
+    if network_monitor.sufficient is not None:
+        raw_markets = network_monitor.progress.get("markets")
+    else:
+        raw_markets = network_monitor.extract_market_data().get("markets")
+    return any(market.get("current_price") is not None for market in network_markets(raw_markets))
+
+
+class EventCapture:
+    """What ``capture_event`` collected in the browser for one event, ready for ``build_event``."""
+    
+    def __init__(self, url, event_data=None, monitor=None, dom_event=None, result=None,
+                 history_only=False):
+        self.url = url
+        self.event_data = event_data
+        self.monitor = monitor
+        self.dom_event = dom_event
+        # Set when a fast path (Next.js data, a winning DOM probe) already produced the event.
+        self.result = result
+        # The event and markets in ``event_data`` are complete (from Next.js data); the
+        # capture only ran to collect their price history.
+        self.history_only = history_only
+        self.dom_markets = None
+        self.dom_history = None
+
+
+def capture_event(driver, url, use_network=True, capture_dir=None, fast_mode=False,
+                  use_collector=False, use_next_data=True, race_dom=False, in_app=False,
+                  collect_dom_fallback=False, prefetch=None, prefetch_concurrency=2):
+    """Browser phase of ``extract_event_data``: navigate, capture responses and read the page.
+    
+    With ``collect_dom_fallback`` the rendered markets are also read up front whenever the
+    capture shows no priced markets, so ``build_event`` never needs the driver. URLs in
+    ``prefetch`` are fetched in the background once the page has loaded.
+    """
     network_monitor = None
     if use_network:
-        network_monitor = NetworkMonitor(driver, capture_all=True)
+        # Past events (fast_mode) stop capturing once the event, its prices and every
+        # token's history have arrived instead of sitting out the full wait and scroll.
+        # Racing the DOM holds the capture to the same rules as the DOM probe.
+        sufficient = None
+        if fast_mode or race_dom:
+            sufficient = capture_is_sufficient(require_history=fast_mode)
+        network_monitor = NetworkMonitor(driver, capture_all=True, use_collector=use_collector,
+                                         sufficient=sufficient)
         network_monitor.start()
+        if in_app:
+            network_monitor.discard_pending()
     
-    navigate_to_event(driver, url, fast_mode=fast_mode)
+    navigate_to_event(driver, url, fast_mode=fast_mode, in_app=in_app)
+    if prefetch:
+        prefetch_pages(driver, prefetch, concurrency=prefetch_concurrency, in_app=in_app)
     
+    # Fast path: the server-rendered Next.js blob usually carries the event and its markets.
+    # It rarely carries price history, so unless it does the capture still runs, but only
+    # until every market's history has arrived.
+    history_event = None
+    if use_next_data:
+        page_props = extract_next_data(driver)
+        next_data_event = event_from_page_props(page_props, url, columnar=True) if page_props else None
+        if next_data_event:
+            if not network_monitor or event_has_history(next_data_event):
+                if network_monitor:
+                    network_monitor.stop()
+                return EventCapture(url, result=next_data_event)
+            history_event = next_data_event
+            network_monitor.sufficient = history_is_captured(
+                market.get("token_id") for market in history_event["markets"]
+            )
+            race_dom = False
+    
+    dom_event = None
     if network_monitor:
+        # With race_dom the DOM is probed between the capture's polls, on this thread since
+        # the driver is not thread-safe; whichever side first has a complete event wins.
+        raced = {}
+        if race_dom:
+            last_probe = [0.0]
+            
+            def probe():
+                if time.time() - last_probe[0] < 1.5:
+                    return False
+                last_probe[0] = time.time()
+                raced["event"] = probe_dom_event(driver, url, require_history=fast_mode)
+                return raced["event"] is not None
+            
+            network_monitor.probe = probe
+        
         if fast_mode:
             time.sleep(1)
             all_responses = network_monitor.capture_all_responses(wait_time=2, scroll_attempts=5)
@@ -30,6 +454,10 @@ def extract_event_data(driver, url, use_network=True, capture_dir=None, fast_mod
             time.sleep(2)
             all_responses = network_monitor.capture_all_responses(wait_time=3, scroll_attempts=8)
         
+        if raced.get("event"):
+            network_monitor.stop()
+            return EventCapture(url, monitor=network_monitor, result=raced["event"])
+        
         if capture_dir:
             from pathlib import Path
             import re
@@ -61,22 +489,77 @@ def extract_event_data(driver, url, use_network=True, capture_dir=None, fast_mod
                             f.write(body)
                 except Exception:
                     pass
+        
+        if history_event is not None:
+            if not network_monitor.is_sufficient():
+                try:
+                    network_monitor.get_responses(wait_time=3)
+                except Exception:
+                    pass
+            network_monitor.stop()
+            return EventCapture(url, event_data=history_event, monitor=network_monitor, history_only=True)
     
-    event_data = {
-        "event_id": extract_event_id_from_url(url) or extract_slug_from_url(url) or "unknown",
-        "url": url,
-        "scraped_at": datetime.utcnow().isoformat() + "Z",
-    }
+    event_data = new_event_data(url)
     
     metadata = extract_event_metadata(driver)
     event_data.update(metadata)
     
+    if network_monitor:
+        try:
+            network_monitor.get_responses(wait_time=3)
+        except Exception:
+            pass
+        network_monitor.stop()
+    
+    capture = EventCapture(url, event_data=event_data, monitor=network_monitor, dom_event=dom_event)
+    if collect_dom_fallback and not (network_monitor and has_network_markets(network_monitor)):
+        capture.dom_markets = extract_market_data(driver)
+        capture.dom_history = extract_price_history(driver)
+    return capture
+
+
+def apply_captured_history(event_data, network_monitor):
+    """Fill history-less markets of ``event_data`` from the monitor's captured history responses.
+    
+    Markets get their own token's history where it was captured; the rest share the
+    event-level history, as with a full capture.
+    """
+    try:
+        histories = network_monitor.histories_by_token()
+        price_history = network_monitor.extract_market_data().get("price_history") or []
+    except Exception:
+        histories, price_history = {}, []
+    
     markets = []
+    for market in event_data.get("markets") or []:
+        if not market.get("price_history"):
+            market = dict(market)
+            market["price_history"] = PriceSeries.from_points(histories.get(market.get("token_id")) or [])
+        markets.append(market)
+    event_data["markets"] = finalize_markets(markets, price_history)
+    return event_data
+
+
+def build_event(capture, driver=None):
+    """Parse phase of ``extract_event_data``: build the event dict from a ``capture_event`` result.
+    
+    Pure Python, except that a capture with no markets and no DOM fallback reads the
+    rendered markets from ``driver`` when one is given. Histories are ``PriceSeries``.
+    """
+    if capture.result is not None:
+        return capture.result
+    if capture.history_only:
+        return apply_captured_history(capture.event_data, capture.monitor)
+    
+    event_data = capture.event_data
+    network_monitor = capture.monitor
+    dom_event = capture.dom_event
+    
+    markets = MarketSet()
     price_history = []
     
     if network_monitor:
         try:
-            all_responses = network_monitor.get_responses(wait_time=3)
             graphql_responses = network_monitor.get_graphql_queries()
             
             for response in network_monitor.responses:
@@ -112,238 +595,33 @@ def extract_event_data(driver, url, use_network=True, capture_dir=None, fast_mod
                     if isinstance(data, dict):
                         if "openPrice" in data or "closePrice" in data or "timestamp" in data:
                             if "crypto-price" in url_val.lower() or "price" in url_val.lower():
-                                timestamp = data.get("timestamp") or data.get("time") or data.get("t")
+                                timestamp = to_epoch_ms(data.get("timestamp") or data.get("time") or data.get("t"))
                                 open_price = data.get("openPrice") or data.get("open") or data.get("price")
                                 close_price = data.get("closePrice") or data.get("close") or data.get("price")
                                 
-                                if timestamp:
+                                if timestamp is not None:
                                     if open_price:
-                                        price_history.append({
-                                            "timestamp": str(timestamp),
-                                            "price": float(open_price)
-                                        })
+                                        price_history.append((timestamp, float(open_price)))
                                     if close_price and close_price != open_price:
-                                        price_history.append({
-                                            "timestamp": str(timestamp),
-                                            "price": float(close_price)
-                                        })
+                                        price_history.append((timestamp, float(close_price)))
                         
-                        if "pageProps" in data:
-                            page_props = data["pageProps"]
-                            if isinstance(page_props, dict):
-                                if "dehydratedState" in page_props:
-                                    dehydrated = page_props["dehydratedState"]
-                                    if isinstance(dehydrated, dict) and "queries" in dehydrated:
-                                        for query in dehydrated["queries"]:
-                                            if isinstance(query, dict) and "state" in query:
-                                                query_state = query["state"]
-                                                if isinstance(query_state, dict) and "data" in query_state:
-                                                    query_data = query_state["data"]
-                                                    if isinstance(query_data, dict):
-                                                        if "event" in query_data or "market" in query_data:
-                                                            event_info = query_data.get("event") or query_data.get("market") or query_data
-                                                            if isinstance(event_info, dict):
-                                                                if not event_data.get("title") and event_info.get("title"):
-                                                                    event_data["title"] = event_info["title"]
-                                                                if not event_data.get("description") and event_info.get("description"):
-                                                                    event_data["description"] = event_info["description"]
-                                                                if event_info.get("endDate") or event_info.get("end_date"):
-                                                                    event_data["end_date"] = str(event_info.get("endDate") or event_info.get("end_date", ""))
-                                                                if event_info.get("resolved") is not None:
-                                                                    event_data["resolved"] = event_info["resolved"]
-                                                        
-                                                        if "markets" in query_data:
-                                                            markets_list = query_data["markets"]
-                                                            if isinstance(markets_list, list):
-                                                                for market in markets_list:
-                                                                    if isinstance(market, dict):
-                                                                        outcomes = market.get("outcomes", [])
-                                                                        outcome_prices = market.get("outcomePrices", [])
-                                                                        volume = market.get("volume") or market.get("volumeNum") or market.get("volume_num") or 0
-                                                                        liquidity = market.get("liquidity") or market.get("liquidityNum") or market.get("liquidity_num") or volume
-
-                                                                        # Get the market identifier (candidate name, etc.)
-                                                                        market_name = (market.get("title") or market.get("question") or
-                                                                                     market.get("groupItemTitle") or market.get("token") or
-                                                                                     market.get("ticker") or market.get("name") or
-                                                                                     market.get("description", ""))
-
-                                                                        for idx, outcome in enumerate(outcomes):
-                                                                            if idx < len(outcome_prices):
-                                                                                try:
-                                                                                    price = float(outcome_prices[idx])
-                                                                                    if price > 1:
-                                                                                        price = price / 100
-
-                                                                                    # For multi-candidate markets, prepend candidate name to outcome
-                                                                                    outcome_label = str(outcome)
-                                                                                    if market_name and len(outcomes) > 1 and len(markets_list) > 1:
-                                                                                        # If there are multiple markets with Yes/No outcomes, prefix with market name
-                                                                                        if outcome_label in ["Yes", "No", "Up", "Down"]:
-                                                                                            outcome_label = f"{market_name}"
-
-                                                                                    market_obj = {
-                                                                                        "outcome": outcome_label,
-                                                                                        "current_price": price,
-                                                                                        "volume": float(volume) if volume else 0.0,
-                                                                                        "liquidity": float(liquidity) if liquidity else 0.0,
-                                                                                        "price_history": [],
-                                                                                    }
-                                                                                    
-                                                                                    if market.get("priceHistory") or market.get("history"):
-                                                                                        history = market.get("priceHistory") or market.get("history")
-                                                                                        if isinstance(history, list):
-                                                                                            market_obj["price_history"] = [
-                                                                                                {
-                                                                                                    "timestamp": str(h.get("timestamp") or h.get("time") or h.get("date") or h.get("t", "")),
-                                                                                                    "price": float(h.get("price") or h.get("value") or h.get("close") or h.get("p", 0))
-                                                                                                }
-                                                                                                for h in history if isinstance(h, dict)
-                                                                                            ]
-                                                                                    
-                                                                                    markets.append(market_obj)
-                                                                                except:
-                                                                                    pass
-                                        
-                                                        if isinstance(query_data, list):
-                                                            for item in query_data:
-                                                                if isinstance(item, dict):
-                                                                    if "markets" in item:
-                                                                        markets_list = item["markets"]
-                                                                        if isinstance(markets_list, list):
-                                                                            for market in markets_list:
-                                                                                if isinstance(market, dict):
-                                                                                    outcomes = market.get("outcomes", [])
-                                                                                    outcome_prices = market.get("outcomePrices", [])
-                                                                                    volume = market.get("volume") or market.get("volumeNum") or market.get("volume_num") or 0
-                                                                                    liquidity = market.get("liquidity") or market.get("liquidityNum") or market.get("liquidity_num") or volume
-
-                                                                                    # Get the market identifier (candidate name, etc.)
-                                                                                    market_name = (market.get("title") or market.get("question") or
-                                                                                                 market.get("groupItemTitle") or market.get("token") or
-                                                                                                 market.get("ticker") or market.get("name") or
-                                                                                                 market.get("description", ""))
-
-                                                                                    for idx, outcome in enumerate(outcomes):
-                                                                                        if idx < len(outcome_prices):
-                                                                                            try:
-                                                                                                price = float(outcome_prices[idx])
-                                                                                                if price > 1:
-                                                                                                    price = price / 100
-
-                                                                                                # For multi-candidate markets, prepend candidate name to outcome
-                                                                                                outcome_label = str(outcome)
-                                                                                                if market_name and len(outcomes) > 1 and len(markets_list) > 1:
-                                                                                                    # If there are multiple markets with Yes/No outcomes, prefix with market name
-                                                                                                    if outcome_label in ["Yes", "No", "Up", "Down"]:
-                                                                                                        outcome_label = f"{market_name}"
-
-                                                                                                market_obj = {
-                                                                                                    "outcome": outcome_label,
-                                                                                                    "current_price": price,
-                                                                                                    "volume": float(volume) if volume else 0.0,
-                                                                                                    "liquidity": float(liquidity) if liquidity else 0.0,
-                                                                                                    "price_history": [],
-                                                                                                }
-                                                                                                
-                                                                                                if market.get("priceHistory") or market.get("history"):
-                                                                                                    history = market.get("priceHistory") or market.get("history")
-                                                                                                    if isinstance(history, list):
-                                                                                                        market_obj["price_history"] = [
-                                                                                                            {
-                                                                                                                "timestamp": str(h.get("timestamp") or h.get("time") or h.get("date") or h.get("t", "")),
-                                                                                                                "price": float(h.get("price") or h.get("value") or h.get("close") or h.get("p", 0))
-                                                                                                            }
-                                                                                                            for h in history if isinstance(h, dict)
-                                                                                                        ]
-                                                                                                
-                                                                                                markets.append(market_obj)
-                                                                                            except:
-                                                                                                pass
+                        if "pageProps" in data and isinstance(data["pageProps"], dict):
+                            markets.update(parse_page_props(data["pageProps"], event_data))
                 except Exception as e:
                     pass
             
             if extracted_data.get("event"):
                 event_info = extracted_data["event"]
                 if isinstance(event_info, dict):
-                    if not event_data.get("title") and event_info.get("title"):
-                        event_data["title"] = event_info["title"]
-                    if not event_data.get("description") and event_info.get("description"):
-                        event_data["description"] = event_info["description"]
-                    if event_info.get("endDate") or event_info.get("end_date"):
-                        event_data["end_date"] = event_info.get("endDate") or event_info.get("end_date")
-                    if event_info.get("resolved") is not None:
-                        event_data["resolved"] = event_info["resolved"]
+                    apply_event_info(event_data, event_info)
             
             all_markets = extracted_data.get("markets", [])
             all_price_history = extracted_data.get("price_history", [])
             
-            for market in all_markets:
-                if not isinstance(market, dict):
-                    continue
-                
-                outcome = (market.get("outcome") or market.get("token") or 
-                          market.get("name") or market.get("side") or 
-                          market.get("label"))
-                
-                if not outcome:
-                    continue
-                
-                price = (market.get("price") or market.get("currentPrice") or 
-                        market.get("lastPrice") or market.get("latestPrice") or
-                        market.get("yesPrice") or market.get("noPrice"))
-                
-                if price is None:
-                    price_str = market.get("priceDisplay") or market.get("priceStr")
-                    if price_str:
-                        try:
-                            price = float(price_str.replace("%", "").replace("$", "").strip())
-                            if price > 1:
-                                price = price / 100
-                        except:
-                            pass
-                
-                if price is None:
-                    continue
-                
-                volume = (market.get("volume") or market.get("totalVolume") or 
-                         market.get("volume24h") or market.get("volumeUsd") or 0)
-                
-                liquidity = (market.get("liquidity") or market.get("totalLiquidity") or
-                            market.get("liquidityUsd") or volume)
-                
-                market_obj = {
-                    "outcome": str(outcome),
-                    "current_price": float(price) if price <= 1 else float(price) / 100,
-                    "volume": float(volume) if volume else 0.0,
-                    "liquidity": float(liquidity) if liquidity else 0.0,
-                }
-                
-                market_history = (market.get("priceHistory") or market.get("history") or
-                                 market.get("priceData") or market.get("timeSeries") or
-                                 market.get("candles") or market.get("ticks") or [])
-                
-                if isinstance(market_history, list) and market_history:
-                    market_obj["price_history"] = [
-                        {
-                            "timestamp": str(h.get("timestamp") or h.get("time") or h.get("date") or h.get("t", "")),
-                            "price": float(h.get("price") or h.get("value") or h.get("close") or h.get("p", 0))
-                        }
-                        for h in market_history if isinstance(h, dict)
-                    ]
-                else:
-                    market_obj["price_history"] = []
-                
-                markets.append(market_obj)
+            markets.update(network_markets(all_markets))
             
             if all_price_history and isinstance(all_price_history, list):
-                price_history = [
-                    {
-                        "timestamp": str(h.get("timestamp") or h.get("time") or h.get("date") or h.get("t", "")),
-                        "price": float(h.get("price") or h.get("value") or h.get("close") or h.get("p", 0))
-                    }
-                    for h in all_price_history if isinstance(h, dict)
-                ]
+                price_history.extend(all_price_history)
             
             for response in graphql_responses:
                 data = response.get("data", {})
@@ -368,18 +646,12 @@ def extract_event_data(driver, url, use_network=True, capture_dir=None, fast_mod
                                     price = market.get("price") or market.get("currentPrice") or market.get("lastPrice")
                                     
                                     if outcome and price is not None:
-                                        existing_market = next((m for m in markets if m["outcome"] == str(outcome)), None)
+                                        existing_market = markets.find(outcome)
                                         if existing_market:
                                             if not existing_market.get("price_history") and (market.get("priceHistory") or market.get("history")):
                                                 history = market.get("priceHistory") or market.get("history")
                                                 if isinstance(history, list):
-                                                    existing_market["price_history"] = [
-                                                        {
-                                                            "timestamp": str(h.get("timestamp") or h.get("time") or h.get("date", "")),
-                                                            "price": float(h.get("price") or h.get("value", 0))
-                                                        }
-                                                        for h in history
-                                                    ]
+                                                    existing_market["price_history"] = PriceSeries.from_points(history)
                                         else:
                                             market_obj = {
                                                 "outcome": str(outcome),
@@ -387,109 +659,213 @@ def extract_event_data(driver, url, use_network=True, capture_dir=None, fast_mod
                                                 "volume": float(market.get("volume", 0) or market.get("totalVolume", 0) or 0),
                                                 "liquidity": float(market.get("liquidity", 0) or market.get("totalLiquidity", 0) or 0),
                                             }
+                                            market_obj.update(market_ids(market))
                                             
-                                            if market.get("priceHistory") or market.get("history"):
-                                                history = market.get("priceHistory") or market.get("history")
-                                                if isinstance(history, list):
-                                                    market_obj["price_history"] = [
-                                                        {
-                                                            "timestamp": str(h.get("timestamp") or h.get("time") or h.get("date", "")),
-                                                            "price": float(h.get("price") or h.get("value", 0))
-                                                        }
-                                                        for h in history
-                                                    ]
-                                                else:
-                                                    market_obj["price_history"] = []
+                                            history = market.get("priceHistory") or market.get("history")
+                                            if isinstance(history, list):
+                                                market_obj["price_history"] = PriceSeries.from_points(history)
                                             else:
-                                                market_obj["price_history"] = []
+                                                market_obj["price_history"] = PriceSeries()
                                             
-                                            markets.append(market_obj)
+                                            markets.add(market_obj)
                         
                         if "priceHistory" in data or "history" in data or "priceData" in data:
                             history = data.get("priceHistory") or data.get("history") or data.get("priceData")
                             if isinstance(history, list):
-                                price_history.extend([
-                                    {
-                                        "timestamp": str(h.get("timestamp") or h.get("time") or h.get("date", "")),
-                                        "price": float(h.get("price") or h.get("value", 0))
-                                    }
-                                    for h in history if isinstance(h, dict)
-                                ])
+                                price_history.extend(history)
         except Exception as e:
             pass
-        
-        if network_monitor:
-            network_monitor.stop()
-    
-    if not markets:
-        markets = extract_market_data(driver)
-        price_history = extract_price_history(driver)
     
-    seen_markets = {}
-    for market in markets:
-        outcome = market.get("outcome", "")
-        key = f"{outcome}_{market.get('current_price', 0)}"
-        
-        if key not in seen_markets:
-            seen_markets[key] = market
-        else:
-            existing = seen_markets[key]
-            if market.get("volume", 0) > existing.get("volume", 0):
-                seen_markets[key] = market
-            if market.get("price_history") and len(market["price_history"]) > len(existing.get("price_history", [])):
-                existing["price_history"] = market["price_history"]
+    if not markets and dom_event:
+        for key in ("title", "description", "category", "end_date"):
+            if not event_data.get(key) and dom_event.get(key):
+                event_data[key] = dom_event[key]
+        markets = dom_event["markets"]
+        price_history = []
     
-    markets = list(seen_markets.values())
+    if not markets:
+        if capture.dom_markets is not None:
+            markets = capture.dom_markets
+            price_history = capture.dom_history or []
+        elif driver is not None:
+            markets = extract_market_data(driver)
+            price_history = extract_price_history(driver)
     
-    for market in markets:
-        if "price_history" not in market or not market["price_history"]:
-            if price_history:
-                market["price_history"] = price_history.copy()
-            else:
-                market["price_history"] = []
-        
-        if market["price_history"]:
-            market["price_history"] = sorted(market["price_history"], 
-                                            key=lambda x: int(x.get("timestamp", 0)) if str(x.get("timestamp", "")).isdigit() else x.get("timestamp", ""))
+    markets = finalize_markets(markets, price_history)
     
     event_data["markets"] = markets
     
     return event_data
 
 
-def extract_recurring_events(driver, url, num_past_events, capture_dir=None):
-    main_event_data = extract_event_data(driver, url, capture_dir=capture_dir)
+def extract_event_data(driver, url, use_network=True, capture_dir=None, fast_mode=False,
+                       use_collector=False, use_next_data=True, race_dom=False, in_app=False,
+                       prefetch=None, prefetch_concurrency=2, captured=None, columnar=False):
+    """Scrape one event; when ``captured`` is a list the captured network responses are appended to it.
+    
+    Price histories are lists of ``{"timestamp", "price"}`` points, so the result is
+    JSON-serializable as is; with ``columnar`` they stay ``PriceSeries`` (see
+    ``polyparse.series.json_default`` for writing those).
+    """
+    capture = capture_event(driver, url, use_network=use_network, capture_dir=capture_dir,
+                            fast_mode=fast_mode, use_collector=use_collector,
+                            use_next_data=use_next_data, race_dom=race_dom, in_app=in_app,
+                            prefetch=prefetch, prefetch_concurrency=prefetch_concurrency)
+    if captured is not None and capture.monitor is not None:
+        captured.extend(capture.monitor.responses)
+    event_data = build_event(capture, driver)
+    return event_data if columnar else plain_histories(event_data)
+
+
+class _PrefetchPlan:
+    """Which URLs to prefetch while each past event is processed: the next ``depth`` not yet requested."""
+    
+    def __init__(self, urls, depth):
+        self.urls = list(urls)
+        self.depth = max(0, depth)
+        self.requested = set()
     
-    is_recurring = detect_recurring_event(driver)
+    def ahead_of(self, index):
+        """Upcoming URLs for the event at ``index`` (-1 for the page listing them)."""
+        upcoming = [u for u in self.urls[index + 1:index + 1 + self.depth] if u not in self.requested]
+        self.requested.update(upcoming)
+        return upcoming
+
+
+def extract_past_events_pipelined(driver, urls, use_collector=False, race_dom=False, in_app=False,
+                                  prefetch_depth=0, prefetch_concurrency=2, columnar=False):
+    """Extract past events with the browser and the parser overlapping.
     
-    if not is_recurring and num_past_events > 0:
-        for scroll_round in range(3):
+    The calling thread navigates and captures each URL while a worker thread builds the
+    previous event from its capture, so throughput approaches the page-load rate. Events
+    come back in ``urls`` order; ones that fail are skipped. ``columnar`` is as for
+    ``extract_event_data``.
+    """
+    plan = _PrefetchPlan(urls, prefetch_depth)
+    prefetch_pages(driver, plan.ahead_of(-1), concurrency=prefetch_concurrency, in_app=in_app)
+    past_events = []
+    with ThreadPoolExecutor(max_workers=1) as parser_pool:
+        builds = []
+        for index, past_url in enumerate(plan.urls):
             try:
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1.5)
+                capture = capture_event(driver, past_url, fast_mode=True, use_collector=use_collector,
+                                        race_dom=race_dom, in_app=in_app, collect_dom_fallback=True,
+                                        prefetch=plan.ahead_of(index),
+                                        prefetch_concurrency=prefetch_concurrency)
             except Exception:
-                break
-        is_recurring = detect_recurring_event(driver)
+                continue
+            builds.append(parser_pool.submit(build_event, capture))
+        
+        for build in builds:
+            try:
+                past_event = build.result()
+            except Exception:
+                continue
+            past_events.append(past_event if columnar else plain_histories(past_event))
+    return past_events
+
+
+def extract_recurring_events(driver, url, num_past_events, capture_dir=None, use_collector=False,
+                             race_dom=False, in_app=False, pipeline=False, prefetch_depth=0,
+                             prefetch_concurrency=2, resolved_cache=None, gamma_url=None, client=None,
+                             columnar=False):
+    """Extract ``url`` and up to ``num_past_events`` of its past events.
     
-    if not is_recurring:
-        main_event_data["past_events"] = []
-        return main_event_data
+    Past events are discovered from the series data in the main event's page and captured
+    responses, paging through the events API at ``gamma_url`` with ``client`` (an
+    ``HttpClient``) when needed; see ``discover_past_events``.
     
-    past_event_urls = get_past_event_urls(driver, num_past_events)
+    With ``in_app`` past events are reached by client-side navigation inside the loaded
+    app, so only each event's route data is fetched instead of reloading the whole app.
+    With ``pipeline`` each past event is parsed while the next one loads
+    (see ``extract_past_events_pipelined``). ``prefetch_depth`` upcoming past events are
+    fetched in the background, ``prefetch_concurrency`` at a time, so the following
+    navigation is mostly served from the browser cache. Past events found in
+    ``resolved_cache`` (a ``ResolvedEventCache``) are not scraped again, and newly
+    scraped resolved ones are added to it. ``columnar`` is as for ``extract_event_data``.
+    """
+    finish = (lambda event_data: event_data) if columnar else plain_histories
+    main_responses = []
+    main_event_data = extract_event_data(driver, url, capture_dir=capture_dir,
+                                         use_collector=use_collector, race_dom=race_dom,
+                                         captured=main_responses, columnar=True)
+    
+    # The series data behind the page lists past events directly; the page's links are
+    # only scraped when no series was found.
+    try:
+        past_event_urls = [e["url"] for e in discover_past_events(
+            driver, num_past_events, current_url=url, responses=main_responses,
+            client=client, gamma_url=gamma_url
+        )]
+    except Exception:
+        past_event_urls = []
+    
+    if not past_event_urls:
+        is_recurring = detect_recurring_event(driver)
+        
+        if not is_recurring and num_past_events > 0:
+            scroll_until_settled(driver, max_rounds=3)
+            is_recurring = detect_recurring_event(driver)
+        
+        if not is_recurring:
+            main_event_data["past_events"] = []
+            return finish(main_event_data)
+        
+        past_event_urls = get_past_event_urls(driver, num_past_events)
     
     if not past_event_urls:
         main_event_data["past_events"] = []
-        return main_event_data
+        return finish(main_event_data)
     
-    past_events = []
-    for i, past_url in enumerate(past_event_urls, 1):
-        try:
-            past_event = extract_event_data(driver, past_url, use_network=True, capture_dir=None, fast_mode=True)
-            past_events.append(past_event)
-        except Exception as e:
-            continue
+    cached = {}
+    if resolved_cache is not None:
+        for past_url in past_event_urls:
+            cached_event = resolved_cache.get(extract_slug_from_url(past_url) or past_url, columnar=True)
+            if cached_event is not None:
+                cached[past_url] = cached_event
+    urls_to_scrape = [past_url for past_url in past_event_urls if past_url not in cached]
+    
+    if pipeline:
+        past_events = extract_past_events_pipelined(
+            driver, urls_to_scrape, use_collector=use_collector, race_dom=race_dom, in_app=in_app,
+            prefetch_depth=prefetch_depth, prefetch_concurrency=prefetch_concurrency, columnar=True
+        )
+    else:
+        plan = _PrefetchPlan(urls_to_scrape, prefetch_depth)
+        prefetch_pages(driver, plan.ahead_of(-1), concurrency=prefetch_concurrency, in_app=in_app)
+        past_events = []
+        for i, past_url in enumerate(urls_to_scrape, 1):
+            try:
+                past_event = extract_event_data(driver, past_url, use_network=True, capture_dir=None,
+                                                fast_mode=True, use_collector=use_collector,
+                                                race_dom=race_dom, in_app=in_app,
+                                                prefetch=plan.ahead_of(i - 1),
+                                                prefetch_concurrency=prefetch_concurrency,
+                                                columnar=True)
+                past_events.append(past_event)
+            except Exception as e:
+                continue
+    
+    if resolved_cache is not None:
+        for past_event in past_events:
+            try:
+                resolved_cache.put(past_event)
+            except OSError:
+                pass
+        if cached:
+            past_events = _in_url_order(past_event_urls, cached, past_events)
     
     main_event_data["past_events"] = past_events
     
-    return main_event_data
+    return finish(main_event_data)
+
+
+def _in_url_order(urls, cached, scraped):
+    """Cached and freshly scraped past events merged back into ``urls`` order."""
+    by_url = {event.get("url"): event for event in scraped if isinstance(event, dict)}
+    ordered = [cached.get(url) or by_url.get(url) for url in urls]
+    ordered = [event for event in ordered if event is not None]
+    kept = {id(event) for event in ordered}
+    ordered.extend(event for event in scraped if id(event) not in kept)
+    return ordered
 
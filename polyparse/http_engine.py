@@ -0,0 +1,134 @@
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import urllib3
+
+from .extractor import event_from_page_props, event_has_history
+from .series import PriceSeries, plain_histories
+
+
+NEXT_DATA_PATTERN = re.compile(
+    r"<script[^>]*\bid=[\"']__NEXT_DATA__[\"'][^>]*>(.*?)</script>",
+    re.DOTALL | re.IGNORECASE,
+)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/json;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+CLOB_API_URL = "https://clob.polymarket.com"
+
+
+class HttpClient:
+    """Keep-alive HTTP client backed by a urllib3 pool, shared across requests to the same hosts."""
+
+    def __init__(self, timeout=10, retries=2, num_pools=10, maxsize=10, block=False, headers=None):
+        self.pool = urllib3.PoolManager(
+            num_pools=num_pools,
+            maxsize=maxsize,
+            block=block,
+            headers={**DEFAULT_HEADERS, **(headers or {})},
+            timeout=urllib3.Timeout(total=timeout),
+            retries=urllib3.Retry(total=retries, backoff_factor=0.2,
+                                  status_forcelist=(429, 500, 502, 503, 504)),
+        )
+
+    def get(self, url, fields=None):
+        return self.pool.request("GET", url, fields=fields)
+
+    def get_text(self, url, fields=None) -> Optional[str]:
+        try:
+            response = self.get(url, fields=fields)
+        except urllib3.exceptions.HTTPError:
+            return None
+        if response.status != 200:
+            return None
+        return response.data.decode("utf-8", errors="replace")
+
+    def get_json(self, url, fields=None) -> Any:
+        text = self.get_text(url, fields=fields)
+        if text is None:
+            return None
+        try:
+            return json.loads(text)
+        except ValueError:
+            return None
+
+    def close(self):
+        self.pool.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def extract_next_data_from_html(html: str) -> Optional[Dict[str, Any]]:
+    """Return the ``pageProps`` embedded in a page's ``__NEXT_DATA__`` script tag."""
+    match = NEXT_DATA_PATTERN.search(html or "")
+    if not match:
+        return None
+    try:
+        data = json.loads(match.group(1))
+    except ValueError:
+        return None
+
+    page_props = (data.get("props") or {}).get("pageProps") if isinstance(data, dict) else None
+    return page_props if isinstance(page_props, dict) else None
+
+
+def fetch_price_history(client, token_id, clob_url=CLOB_API_URL, interval="max",
+                        fidelity=60) -> List[Dict[str, Any]]:
+    """Fetch one CLOB token's price history; an empty list when it is unavailable."""
+    data = client.get_json(f"{clob_url.rstrip('/')}/prices-history", fields={
+        "market": token_id,
+        "interval": interval,
+        "fidelity": fidelity,
+    })
+    history = data.get("history") if isinstance(data, dict) else data
+    return history if isinstance(history, list) else []
+
+
+def _fetch_market_histories(client, event_data, clob_url, concurrency=4):
+    token_ids = list(dict.fromkeys(
+        str(market["token_id"]) for market in event_data["markets"] if market.get("token_id")
+    ))
+    if not token_ids:
+        return
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(token_ids))) as pool:
+        histories = dict(zip(token_ids, pool.map(lambda token_id: fetch_price_history(client, token_id, clob_url),
+                                                 token_ids)))
+    for market in event_data["markets"]:
+        history = histories.get(str(market.get("token_id")))
+        if history:
+            market["price_history"] = PriceSeries.from_points(history)
+
+
+def extract_event_data_http(url, client=None, columnar=False, clob_url=CLOB_API_URL):
+    """Scrape an event from its server-rendered HTML, without a browser.
+
+    The page rarely embeds price history, so each market's history is fetched from the
+    CLOB by token id. Returns None when the page does not embed the event and its
+    markets, or no history could be found, so callers can fall back to the Selenium
+    path. ``columnar`` is as for ``extract_event_data``.
+    """
+    own_client = client is None
+    if own_client:
+        client = HttpClient()
+    try:
+        page_props = extract_next_data_from_html(client.get_text(url))
+        event_data = event_from_page_props(page_props, url, columnar=True) if page_props else None
+        if event_data and not event_has_history(event_data):
+            _fetch_market_histories(client, event_data, clob_url)
+    finally:
+        if own_client:
+            client.close()
+
+    if not event_data or not event_has_history(event_data):
+        return None
+    return event_data if columnar else plain_histories(event_data)
@@ -0,0 +1,105 @@
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional
+
+from .series import PriceSeries
+
+
+class MarketSet:
+    """Market objects keyed by a stable identity, merged in place on re-insert.
+
+    The identity is the CLOB token id when known, else the market/condition id plus
+    outcome, else the outcome label alone. A market whose identity is not stored yet
+    still merges into an entry with the same label when their ids do not conflict, so
+    the same outcome seen with and without ids is kept once. Lookups and inserts are
+    O(1) per label, so building an event from hundreds of candidate markets stays linear.
+    """
+
+    def __init__(self, markets: Optional[Iterable[Dict[str, Any]]] = None):
+        self._markets: Dict[Hashable, Dict[str, Any]] = {}
+        self._by_outcome: Dict[str, List[Dict[str, Any]]] = {}
+        if markets:
+            self.update(markets)
+
+    @staticmethod
+    def key_for(market: Dict[str, Any]) -> Hashable:
+        outcome = str(market.get("outcome", ""))
+        if market.get("token_id"):
+            return ("token", str(market["token_id"]))
+        if market.get("market_id"):
+            return ("market", str(market["market_id"]), outcome)
+        return ("outcome", outcome)
+
+    def add(self, market: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert ``market`` or merge it into the entry with the same identity; returns the stored entry."""
+        key = self.key_for(market)
+        label = str(market.get("outcome", ""))
+        existing = self._markets.get(key)
+        if existing is None:
+            existing = next(
+                (entry for entry in self._by_outcome.get(label, []) if self._compatible(entry, market)),
+                None,
+            )
+        if existing is None:
+            self._markets[key] = market
+            self._by_outcome.setdefault(label, []).append(market)
+            return market
+
+        self._merge(existing, market)
+        return existing
+
+    def update(self, markets: Iterable[Dict[str, Any]]):
+        for market in markets:
+            if isinstance(market, dict):
+                self.add(market)
+
+    def find(self, outcome) -> Optional[Dict[str, Any]]:
+        """First market stored under the given outcome label."""
+        entries = self._by_outcome.get(str(outcome))
+        return entries[0] if entries else None
+
+    @staticmethod
+    def _compatible(existing: Dict[str, Any], market: Dict[str, Any]) -> bool:
+        """True when no id known to both markets differs."""
+        return not any(
+            existing.get(field) and market.get(field) and str(existing[field]) != str(market[field])
+            for field in ("token_id", "market_id")
+        )
+
+    @staticmethod
+    def _merge(existing: Dict[str, Any], market: Dict[str, Any]):
+        new_volume = market.get("volume") or 0.0
+        if new_volume > (existing.get("volume") or 0.0):
+            existing["volume"] = new_volume
+            if market.get("current_price") is not None:
+                existing["current_price"] = market["current_price"]
+        elif existing.get("current_price") is None and market.get("current_price") is not None:
+            existing["current_price"] = market["current_price"]
+
+        new_liquidity = market.get("liquidity") or 0.0
+        if new_liquidity > (existing.get("liquidity") or 0.0):
+            existing["liquidity"] = new_liquidity
+
+        for field in ("market_id", "token_id"):
+            if market.get(field) and not existing.get(field):
+                existing[field] = market[field]
+
+        history = market.get("price_history")
+        if history:
+            current = existing.get("price_history")
+            if not current:
+                existing["price_history"] = history
+            elif current is not history:
+                existing["price_history"] = PriceSeries.from_points(history).merge(
+                    PriceSeries.from_points(current)
+                )
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self._markets.values())
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._markets.values())
+
+    def __len__(self) -> int:
+        return len(self._markets)
+
+    def __bool__(self) -> bool:
+        return bool(self._markets)
@@ -0,0 +1,132 @@
+import os
+from typing import Any, Dict, List, Optional
+
+from .series import OHLCSeries, PriceSeries
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = None
+
+
+MATRIX_FORMATS = ("npz", "arrow")
+
+
+class PriceMatrix:
+    """Outcome prices of one event on a shared time index.
+
+    ``timestamps`` is an ``int64`` vector of epoch milliseconds, ``prices`` a
+    ``(len(timestamps), len(outcomes))`` ``float64`` array. A cell is the outcome's
+    latest price at or before that timestamp, ``NaN`` before its first point.
+    """
+
+    __slots__ = ("timestamps", "outcomes", "prices")
+
+    def __init__(self, timestamps, outcomes: List[str], prices):
+        self.timestamps = timestamps
+        self.outcomes = outcomes
+        self.prices = prices
+
+    @property
+    def shape(self):
+        return self.prices.shape
+
+    def save(self, path: str, format: Optional[str] = None) -> str:
+        """Write to ``.npz`` or an Arrow IPC file; the format defaults to the file extension."""
+        format = format or os.path.splitext(path)[1].lstrip(".").lower()
+        if format == "npz":
+            with open(path, "wb") as f:
+                np.savez(f, timestamps=self.timestamps, prices=self.prices,
+                         outcomes=np.array(self.outcomes, dtype=str))
+        elif format in ("arrow", "feather"):
+            if pa is None:
+                raise ImportError("Arrow export requires pyarrow (pip install polyparse[arrow])")
+            columns = [pa.array(self.timestamps, type=pa.timestamp("ms", tz="UTC"))]
+            columns += [pa.array(self.prices[:, i]) for i in range(len(self.outcomes))]
+            table = pa.Table.from_arrays(columns, names=["timestamp"] + list(self.outcomes))
+            with pa.OSFile(path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        else:
+            raise ValueError(f"Unknown matrix format: {format!r} (expected one of {', '.join(MATRIX_FORMATS)})")
+        return path
+
+    def __repr__(self) -> str:
+        return f"PriceMatrix(rows={len(self.timestamps)}, outcomes={len(self.outcomes)})"
+
+
+def _columns(history):
+    if isinstance(history, OHLCSeries):
+        return history.timestamps, history.close
+    series = PriceSeries.from_points(history)
+    return series.timestamps, series.prices
+
+
+def _outcome_markets(markets):
+    """One market per outcome column, with a unique label for each.
+
+    Candidate events label both sides of a candidate's market with the candidate name;
+    only the first (the Yes side) is kept. Distinct markets that still share a label
+    get a numbered suffix.
+    """
+    seen, chosen = set(), []
+    for market in markets:
+        label = str(market.get("outcome", ""))
+        key = (market.get("market_id"), label)
+        if key in seen:
+            continue
+        seen.add(key)
+        chosen.append((label, market))
+
+    counts, labels = {}, []
+    for label, _ in chosen:
+        counts[label] = counts.get(label, 0) + 1
+        labels.append(label if counts[label] == 1 else f"{label} ({counts[label]})")
+    return labels, [market for _, market in chosen]
+
+
+def align_markets(markets: List[Dict[str, Any]], normalize: bool = False) -> PriceMatrix:
+    """Forward-fill every outcome's price history onto the union of their timestamps.
+
+    There is one column per outcome: for a candidate event, per candidate (its Yes
+    side). With ``normalize`` each row is divided by its sum so outcome probabilities
+    add up to 1; rows with no known price stay ``NaN``.
+    """
+    if np is None:
+        raise ImportError("Matrix export requires NumPy (pip install polyparse[fast])")
+
+    outcomes, markets = _outcome_markets(markets)
+    columns = []
+    for market in markets:
+        ts, ps = _columns(market.get("price_history"))
+        columns.append((np.frombuffer(ts, dtype=np.int64), np.frombuffer(ps, dtype=np.float64)))
+
+    if columns:
+        grid = np.unique(np.concatenate([ts for ts, _ in columns]))
+    else:
+        grid = np.empty(0, dtype=np.int64)
+    prices = np.full((len(grid), len(columns)), np.nan)
+    for i, (ts, ps) in enumerate(columns):
+        if not len(ts):
+            continue
+        # Index of the latest point at or before each grid time; -1 before the first point.
+        idx = np.searchsorted(ts, grid, side="right") - 1
+        known = idx >= 0
+        prices[known, i] = ps[idx[known]]
+
+    if normalize and len(grid):
+        totals = np.nansum(prices, axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            prices = np.where(totals > 0, prices / totals, np.nan)
+
+    return PriceMatrix(grid, outcomes, prices)
+
+
+def align_event(event_data: Dict[str, Any], normalize: bool = False) -> PriceMatrix:
+    """``align_markets`` over the markets of one event."""
+    return align_markets(event_data.get("markets", []), normalize=normalize)
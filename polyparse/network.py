@@ -4,9 +4,103 @@ import re
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+from .page import scroll_until_settled
+
+
+# CLOB ``prices-history`` requests name the token they cover in ``market=``.
+HISTORY_TOKEN_RE = re.compile(r"[?&]market=([^&#]+)")
+
+
+COLLECTOR_SCRIPT = """
+(function(config) {
+    if (window.__polyparseCollector) return;
+    var collector = {buffer: [], dropped: 0, seq: 0};
+    window.__polyparseCollector = collector;
+    var patterns = config.patterns.map(function(p) { return new RegExp(p, 'i'); });
+
+    function wanted(url) {
+        if (!url) return false;
+        if (config.captureAll) return true;
+        for (var i = 0; i < patterns.length; i++) {
+            if (patterns[i].test(url)) return true;
+        }
+        return false;
+    }
+
+    function looksLikeJson(contentType, body) {
+        if (contentType && contentType.toLowerCase().indexOf('json') !== -1) return true;
+        var head = body.replace(/^\\s+/, '').charAt(0);
+        return head === '{' || head === '[';
+    }
+
+    function record(url, status, contentType, body) {
+        if (typeof body !== 'string' || !body || body.length > config.maxBodyLength) return;
+        if (!looksLikeJson(contentType, body)) return;
+        if (collector.buffer.length >= config.maxEntries) {
+            collector.buffer.shift();
+            collector.dropped++;
+        }
+        collector.buffer.push({id: 'collector-' + (++collector.seq), url: url, status: status, body: body});
+    }
+
+    var originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function() {
+            var promise = originalFetch.apply(this, arguments);
+            promise.then(function(response) {
+                try {
+                    var url = response.url || '';
+                    if (!wanted(url)) return;
+                    response.clone().text().then(function(body) {
+                        record(url, response.status, response.headers.get('content-type'), body);
+                    }, function() {});
+                } catch (e) {}
+            }, function() {});
+            return promise;
+        };
+    }
+
+    var XHR = window.XMLHttpRequest;
+    if (XHR) {
+        var originalOpen = XHR.prototype.open;
+        var originalSend = XHR.prototype.send;
+        XHR.prototype.open = function(method, url) {
+            this.__polyparseUrl = url;
+            return originalOpen.apply(this, arguments);
+        };
+        XHR.prototype.send = function() {
+            var xhr = this;
+            xhr.addEventListener('load', function() {
+                try {
+                    var url = xhr.responseURL || String(xhr.__polyparseUrl || '');
+                    if (!wanted(url)) return;
+                    var body = null;
+                    if (xhr.responseType === '' || xhr.responseType === 'text') {
+                        body = xhr.responseText;
+                    } else if (xhr.responseType === 'json') {
+                        body = JSON.stringify(xhr.response);
+                    }
+                    record(url, xhr.status, xhr.getResponseHeader('content-type'), body);
+                } catch (e) {}
+            });
+            return originalSend.apply(this, arguments);
+        };
+    }
+})(__CONFIG__);
+"""
+
+DRAIN_COLLECTOR_SCRIPT = """
+var collector = window.__polyparseCollector;
+if (!collector) return null;
+var entries = collector.buffer;
+collector.buffer = [];
+return JSON.stringify(entries);
+"""
+
 
 class NetworkMonitor:
-    def __init__(self, driver, capture_all=False, url_patterns=None):
+    def __init__(self, driver, capture_all=False, url_patterns=None, use_collector=False,
+                 collector_size=500, collector_max_body=5_000_000, sufficient=None, probe=None):
         self.driver = driver
         self.responses = []
         self.enabled = False
@@ -21,6 +115,19 @@ class NetworkMonitor:
         ]
         self.captured_requests = []
         self.payloads = {}
+        self.use_collector = use_collector
+        self.collector_size = collector_size
+        self.collector_max_body = collector_max_body
+        self._collector_script_id = None
+        self._request_urls = {}
+        self._emitted = set()
+        # Called with the incrementally parsed capture (the shape ``extract_market_data``
+        # returns, plus ``history_tokens``); capture stops as soon as it returns True.
+        self.sufficient = sufficient
+        # Called without arguments on the capturing thread between polls, so it may use the
+        # driver; capture stops as soon as it returns True.
+        self.probe = probe
+        self.progress = {"event": None, "markets": [], "price_history": [], "history_tokens": set()}
     
     def _want_url(self, url: str) -> bool:
         if self.capture_all:
@@ -29,110 +136,235 @@ class NetworkMonitor:
     
     def start(self):
         self.driver.execute_cdp_cmd("Network.enable", {})
+        if self.use_collector and self._collector_script_id is None:
+            self.install_collector()
         self.enabled = True
     
     def stop(self):
         if self.enabled:
             self.driver.execute_cdp_cmd("Network.disable", {})
             self.enabled = False
+        if self._collector_script_id is not None:
+            try:
+                self.driver.execute_cdp_cmd(
+                    "Page.removeScriptToEvaluateOnNewDocument",
+                    {"identifier": self._collector_script_id}
+                )
+            except Exception:
+                pass
+            self._collector_script_id = None
     
-    def capture_all_responses(self, wait_time=3, scroll_attempts=8):
-        if not self.enabled:
-            self.start()
+    def install_collector(self):
+        """Inject the fetch/XHR collector so it runs before any page script on the next navigation."""
+        config = {
+            "patterns": [] if self.capture_all else self.url_patterns,
+            "captureAll": self.capture_all,
+            "maxEntries": self.collector_size,
+            "maxBodyLength": self.collector_max_body,
+        }
+        source = COLLECTOR_SCRIPT.replace("__CONFIG__", json.dumps(config))
+        try:
+            result = self.driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": source}
+            )
+        except Exception:
+            self.use_collector = False
+            return False
+        self._collector_script_id = (result or {}).get("identifier", "")
+        return True
+    
+    def drain_collector(self) -> Optional[List[Dict[str, Any]]]:
+        """Fetch and clear the in-page buffer in one round trip; None if the collector is absent."""
+        try:
+            raw = self.driver.execute_script(DRAIN_COLLECTOR_SCRIPT)
+        except Exception:
+            return None
+        if not isinstance(raw, str):
+            return None
+        try:
+            entries = json.loads(raw)
+        except ValueError:
+            return None
         
-        time.sleep(1.5)
+        drained = []
+        for entry in entries:
+            if not isinstance(entry, dict) or not entry.get("body"):
+                continue
+            drained.append({
+                "url": entry.get("url", ""),
+                "body": entry["body"],
+                "requestId": entry.get("id", ""),
+            })
+        return drained
+    
+    def discard_pending(self):
+        """Drop responses buffered so far (performance log and collector), e.g. from the previous page.
         
+        Needed before client-side navigation, where nothing resets the log or the in-page
+        collector between events.
+        """
         try:
-            logs = self.driver.get_log("performance")
+            self.driver.get_log("performance")
+        except Exception:
+            pass
+        if self.use_collector:
+            self.drain_collector()
+    
+    @staticmethod
+    def _pause(seconds, stop_event=None):
+        """Sleep for ``seconds``; returns True as soon as ``stop_event`` is set."""
+        if stop_event is None:
+            time.sleep(seconds)
+            return False
+        return stop_event.wait(seconds)
+    
+    def _absorb(self, url, body):
+        """Fold a newly captured body into ``progress`` for the sufficiency predicate."""
+        if self.sufficient is None or not body:
+            return
+        try:
+            data = json.loads(body)
+        except (TypeError, ValueError):
+            return
+        history_before = len(self.progress["price_history"])
+        self.progress = self._parse_json_response(data, self.progress)
+        if len(self.progress["price_history"]) > history_before:
+            match = HISTORY_TOKEN_RE.search(url or "")
+            if match:
+                self.progress["history_tokens"].add(match.group(1))
+    
+    def is_sufficient(self) -> bool:
+        """True once the sufficiency predicate holds for what has been captured so far."""
+        if self.sufficient is None:
+            return False
+        try:
+            return bool(self.sufficient(self.progress))
         except Exception:
-            logs = []
+            return False
+    
+    def _should_stop(self) -> bool:
+        if self.is_sufficient():
+            return True
+        if self.probe is None:
+            return False
+        try:
+            return bool(self.probe())
+        except Exception:
+            return False
+    
+    def _poll(self):
+        if self.use_collector:
+            drained = self.drain_collector()
+            if drained:
+                self.responses.extend(drained)
+                for entry in drained:
+                    self._absorb(entry["url"], entry["body"])
+        else:
+            self._read_logs()
+    
+    def _wait(self, seconds, stop_event=None, poll_interval=0.5):
+        """Pause for ``seconds``, returning True early when capture should stop.
         
-        seen_request_ids = set()
+        Without a sufficiency predicate or probe this is a plain ``_pause``; with either,
+        arriving responses are read every ``poll_interval`` and both checked after each read.
+        """
+        if self.sufficient is None and self.probe is None:
+            return self._pause(seconds, stop_event)
+        
+        deadline = time.time() + seconds
+        while True:
+            self._poll()
+            if self._should_stop():
+                return True
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            if self._pause(min(poll_interval, remaining), stop_event):
+                return True
+    
+    def _read_logs(self):
+        """Consume pending performance-log entries, fetching bodies of finished wanted requests."""
+        try:
+            logs = self.driver.get_log("performance")
+        except Exception:
+            return
         
         for log in logs:
             try:
                 message = json.loads(log["message"])
                 method = message.get("message", {}).get("method", "")
+                params = message.get("message", {}).get("params", {})
                 
-                if method == "Network.requestWillBeSent":
-                    params = message.get("message", {}).get("params", {})
-                    request = params.get("request", {})
-                    url = request.get("url", "")
+                if method in ("Network.requestWillBeSent", "Network.responseReceived"):
+                    url = (params.get("request") or params.get("response") or {}).get("url", "")
                     request_id = params.get("requestId", "")
                     
-                    if self._want_url(url) and request_id not in seen_request_ids:
+                    if self._want_url(url) and request_id not in self._request_urls:
                         self.captured_requests.append((request_id, url))
-                        seen_request_ids.add(request_id)
-                
-                elif method == "Network.responseReceived":
-                    params = message.get("message", {}).get("params", {})
-                    response = params.get("response", {})
-                    url = response.get("url", "")
-                    request_id = params.get("requestId", "")
-                    
-                    if self._want_url(url) and request_id not in seen_request_ids:
-                        self.captured_requests.append((request_id, url))
-                        seen_request_ids.add(request_id)
+                        self._request_urls[request_id] = url
                 
                 elif method == "Network.loadingFinished":
-                    params = message.get("message", {}).get("params", {})
                     request_id = params.get("requestId", "")
                     
-                    if request_id in [r[0] for r in self.captured_requests]:
+                    if request_id in self._request_urls and request_id not in self.payloads:
                         try:
                             response_body_cmd = self.driver.execute_cdp_cmd(
                                 "Network.getResponseBody",
                                 {"requestId": request_id}
                             )
                             self.payloads[request_id] = response_body_cmd
+                            self._absorb(self._request_urls[request_id], response_body_cmd.get("body", ""))
                         except Exception:
                             pass
             except Exception:
                 continue
+    
+    def _scroll_for_more(self, scroll_attempts, stop_event=None):
+        def after_scroll():
+            if not self.use_collector or self.sufficient is not None:
+                self._poll()
+            return self._should_stop() or (stop_event is not None and stop_event.is_set())
         
-        time.sleep(wait_time)
+        scroll_until_settled(self.driver, max_rounds=scroll_attempts, fallback_pause=1.0,
+                             pause=lambda seconds: self._wait(seconds, stop_event),
+                             after_scroll=after_scroll)
+    
+    def _capture_from_collector(self, wait_time, scroll_attempts, stop_event=None):
+        if not self._wait(wait_time, stop_event):
+            self._scroll_for_more(scroll_attempts, stop_event)
         
-        for _ in range(scroll_attempts):
-            try:
-                last_height = self.driver.execute_script("return document.body.scrollHeight")
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1.0)
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                
-                if new_height == last_height:
-                    break
-                
-                try:
-                    logs = self.driver.get_log("performance")
-                    for log in logs:
-                        try:
-                            message = json.loads(log["message"])
-                            method = message.get("message", {}).get("method", "")
-                            
-                            if method == "Network.loadingFinished":
-                                params = message.get("message", {}).get("params", {})
-                                request_id = params.get("requestId", "")
-                                
-                                if request_id not in self.payloads:
-                                    try:
-                                        response_body_cmd = self.driver.execute_cdp_cmd(
-                                            "Network.getResponseBody",
-                                            {"requestId": request_id}
-                                        )
-                                        url = next((r[1] for r in self.captured_requests if r[0] == request_id), "")
-                                        if self._want_url(url):
-                                            self.payloads[request_id] = response_body_cmd
-                                    except Exception:
-                                        pass
-                        except Exception:
-                            continue
-                except Exception:
-                    pass
-            except Exception:
-                break
+        drained = self.drain_collector()
+        if drained is None:
+            return None
+        self.responses.extend(drained)
+        for entry in drained:
+            self._absorb(entry["url"], entry["body"])
+        return self.responses
+    
+    def capture_all_responses(self, wait_time=3, scroll_attempts=8, stop_event=None):
+        """Collect matching responses, waiting and scrolling to trigger lazy requests.
+        
+        Setting ``stop_event`` (a ``threading.Event``) cuts the waits and scrolling short
+        and returns what has been captured so far. So do the monitor's ``sufficient``
+        predicate, which is checked as responses arrive, and its ``probe``.
+        """
+        if not self.enabled:
+            self.start()
+        
+        if self.use_collector:
+            responses = self._capture_from_collector(wait_time, scroll_attempts, stop_event)
+            if responses is not None:
+                return responses
+        
+        stopped = self._wait(1.5, stop_event)
+        self._read_logs()
+        
+        if not stopped and not self._should_stop() and not self._wait(wait_time, stop_event):
+            self._scroll_for_more(scroll_attempts, stop_event)
+            self._read_logs()
         
         for request_id, url in self.captured_requests:
-            if request_id in self.payloads:
+            if request_id in self.payloads and request_id not in self._emitted:
                 body_data = self.payloads[request_id]
                 body = body_data.get("body", "")
                 
@@ -141,6 +373,7 @@ class NetworkMonitor:
                     "body": body,
                     "requestId": request_id,
                 })
+                self._emitted.add(request_id)
         
         return self.responses
     
@@ -314,4 +547,20 @@ class NetworkMonitor:
                 except Exception:
                     pass
         return graphql_responses
-
+    
+    def histories_by_token(self) -> Dict[str, List[Any]]:
+        """Captured history points per CLOB token id, from ``market=`` history requests."""
+        histories = {}
+        for response in self.responses:
+            match = HISTORY_TOKEN_RE.search(response.get("url", "") or "")
+            body = response.get("body", "")
+            if not match or not body:
+                continue
+            try:
+                data = json.loads(body)
+            except (TypeError, ValueError):
+                continue
+            parsed = self._parse_json_response(data, {"event": None, "markets": [], "price_history": []})
+            if parsed["price_history"]:
+                histories.setdefault(match.group(1), []).extend(parsed["price_history"])
+        return histories
@@ -0,0 +1,163 @@
+import re
+import time
+import weakref
+from functools import lru_cache
+from typing import Callable, Iterable, Optional
+
+
+_snapshots = weakref.WeakKeyDictionary()
+
+
+# Scrolls to the bottom, then resolves once the page has been quiet (no new resource
+# timing entries, no DOM mutations) for quietMs, or at maxMs. Reports whether the scroll
+# triggered anything: document growth or finished requests.
+SCROLL_SETTLE_SCRIPT = """
+    var quietMs = arguments[0];
+    var maxMs = arguments[1];
+    var done = arguments[arguments.length - 1];
+    var root = document.scrollingElement || document.documentElement || document.body;
+    var startHeight = root.scrollHeight;
+    var started = Date.now();
+    var lastChange = started;
+    var requests = 0;
+
+    var perfObserver = null;
+    try {
+        perfObserver = new PerformanceObserver(function(list) {
+            requests += list.getEntries().length;
+            lastChange = Date.now();
+        });
+        perfObserver.observe({entryTypes: ['resource']});
+    } catch (e) {
+        perfObserver = null;
+    }
+    var domObserver = null;
+    try {
+        domObserver = new MutationObserver(function() { lastChange = Date.now(); });
+        domObserver.observe(document.body || document.documentElement, {childList: true, subtree: true});
+    } catch (e) {
+        domObserver = null;
+    }
+
+    window.scrollTo(0, root.scrollHeight);
+
+    function check() {
+        var now = Date.now();
+        if (now - lastChange < quietMs && now - started < maxMs) {
+            setTimeout(check, 50);
+            return;
+        }
+        if (perfObserver) perfObserver.disconnect();
+        if (domObserver) domObserver.disconnect();
+        done({grew: root.scrollHeight > startHeight, requests: requests, height: root.scrollHeight});
+    }
+    setTimeout(check, 50);
+"""
+
+
+@lru_cache(maxsize=64)
+def _keyword_pattern(keywords):
+    return re.compile("|".join(re.escape(keyword.lower()) for keyword in keywords))
+
+
+class PageSnapshot:
+    """Lower-cased ``page_source`` of one document state, downloaded once and reused.
+
+    Keyword checks run as a single alternation regex over the cached buffer instead of
+    one ``in`` scan per keyword.
+    """
+
+    __slots__ = ("url", "text")
+
+    def __init__(self, url: str, source: Optional[str]):
+        self.url = url
+        self.text = source.lower() if isinstance(source, str) else ""
+
+    def find_any(self, keywords: Iterable[str]) -> Optional[str]:
+        """The keyword (lower-cased) occurring earliest in the page, or None if none occur."""
+        keywords = tuple(keywords)
+        if not keywords:
+            return None
+        match = _keyword_pattern(keywords).search(self.text)
+        return match.group(0) if match else None
+
+    def contains_any(self, keywords: Iterable[str]) -> bool:
+        return self.find_any(keywords) is not None
+
+
+def page_snapshot(driver) -> PageSnapshot:
+    """Snapshot of the driver's current page, refetched only after navigation or invalidation."""
+    try:
+        url = driver.current_url
+    except Exception:
+        url = None
+
+    try:
+        snapshot = _snapshots.get(driver)
+    except TypeError:
+        snapshot = None
+    if snapshot is not None and snapshot.url == url:
+        return snapshot
+
+    snapshot = PageSnapshot(url, driver.page_source)
+    try:
+        _snapshots[driver] = snapshot
+    except TypeError:
+        pass
+    return snapshot
+
+
+def invalidate_page_snapshot(driver):
+    """Drop the cached snapshot; call after anything that changes the DOM (navigation, scrolling)."""
+    try:
+        _snapshots.pop(driver, None)
+    except TypeError:
+        pass
+
+
+def _scroll_and_settle(driver, quiet, max_wait):
+    try:
+        result = driver.execute_async_script(SCROLL_SETTLE_SCRIPT, int(quiet * 1000), int(max_wait * 1000))
+    except Exception:
+        return None
+    if not isinstance(result, dict):
+        return None
+    return bool(result.get("grew")) or bool(result.get("requests"))
+
+
+def scroll_until_settled(driver, max_rounds=8, quiet=0.6, max_wait=3.0, fallback_pause=1.5,
+                         pause: Optional[Callable[[float], bool]] = None,
+                         after_scroll: Optional[Callable[[], bool]] = None) -> int:
+    """Scroll to the bottom repeatedly until a scroll triggers nothing new; returns the productive rounds.
+
+    Each round waits in the page only until the requests and DOM updates it set off have
+    been quiet for ``quiet`` seconds (at most ``max_wait``). Without async script support
+    it scrolls, pauses ``fallback_pause`` seconds and compares the document height.
+    ``pause`` replaces ``time.sleep`` for that wait and ``after_scroll`` runs after every
+    round; either returning True ends the scrolling.
+    """
+    pause = pause or time.sleep
+    productive = 0
+    for _ in range(max_rounds):
+        progressed = _scroll_and_settle(driver, quiet, max_wait)
+        stop = False
+        if progressed is None:
+            try:
+                last_height = driver.execute_script("return document.body.scrollHeight")
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            except Exception:
+                invalidate_page_snapshot(driver)
+                break
+            stop = bool(pause(fallback_pause))
+            try:
+                progressed = driver.execute_script("return document.body.scrollHeight") != last_height
+            except Exception:
+                progressed = False
+        invalidate_page_snapshot(driver)
+        
+        if stop or not progressed:
+            break
+        productive += 1
+        if after_scroll is not None and after_scroll():
+            break
+    return productive
@@ -1,12 +1,176 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from .driver import wait_for_element, wait_for_elements, safe_get_text
+from .driver import wait_for_elements, find_first
+from .page import page_snapshot, invalidate_page_snapshot, scroll_until_settled
 import time
+import json
 import re
 
 
-def navigate_to_event(driver, url, fast_mode=False):
+# Moves the already-loaded Next.js app to another event without a document load: clicks
+# a same-tab link to the target path if one is rendered, otherwise calls the router's
+# push. Resolves true once the router reports the route (and its data fetch) complete,
+# false if neither is possible or the route did not change in time.
+CLIENT_NAVIGATION_SCRIPT = """
+    var target = arguments[0];
+    var timeoutMs = arguments[1];
+    var done = arguments[arguments.length - 1];
+    var destination;
+    try {
+        destination = new URL(target, location.href);
+    } catch (e) {
+        done(false);
+        return;
+    }
+    if (destination.origin !== location.origin || destination.pathname === location.pathname) {
+        done(false);
+        return;
+    }
+    
+    var router = window.next && window.next.router;
+    var events = router && router.events && router.events.on ? router.events : null;
+    var finished = false;
+    var timer = null;
+    var poller = null;
+    function finish(ok) {
+        if (finished) return;
+        finished = true;
+        clearTimeout(timer);
+        clearInterval(poller);
+        if (events) {
+            events.off('routeChangeComplete', onComplete);
+            events.off('routeChangeError', onError);
+        }
+        done(ok);
+    }
+    function onComplete() {
+        if (location.pathname === destination.pathname) finish(true);
+    }
+    function onError() {
+        finish(false);
+    }
+    
+    var link = null;
+    var anchors = document.querySelectorAll('a[href]');
+    for (var i = 0; i < anchors.length; i++) {
+        var anchor = anchors[i];
+        if (anchor.pathname === destination.pathname && anchor.origin === location.origin &&
+                (!anchor.target || anchor.target === '_self')) {
+            link = anchor;
+            break;
+        }
+    }
+    if (!link && !(router && router.push)) {
+        done(false);
+        return;
+    }
+    
+    if (events) {
+        events.on('routeChangeComplete', onComplete);
+        events.on('routeChangeError', onError);
+    } else {
+        poller = setInterval(function() {
+            if (location.pathname === destination.pathname && document.readyState === 'complete') finish(true);
+        }, 100);
+    }
+    timer = setTimeout(function() { finish(location.pathname === destination.pathname); }, timeoutMs);
+    
+    try {
+        if (link) {
+            link.click();
+        } else {
+            var pushed = router.push(destination.pathname + destination.search);
+            if (pushed && pushed.then) pushed.then(null, onError);
+        }
+    } catch (e) {
+        finish(false);
+    }
+"""
+
+
+def navigate_in_app(driver, url, timeout=10):
+    """Client-side navigation to ``url`` inside the loaded app; False if it was not possible."""
+    try:
+        navigated = driver.execute_async_script(CLIENT_NAVIGATION_SCRIPT, url, int(timeout * 1000))
+    except Exception:
+        return False
+    invalidate_page_snapshot(driver)
+    return navigated is True
+
+
+# Warms the cache for upcoming events while the current one is processed, at most
+# `concurrency` requests at a time. Document mode injects <link rel=prefetch> tags, which
+# Chrome keeps usable for the next full load; route mode asks the Next.js router to
+# prefetch the route's data and code for client-side navigation.
+PREFETCH_SCRIPT = """
+    var urls = arguments[0];
+    var concurrency = Math.max(1, arguments[1]);
+    var useRouter = arguments[2];
+    var router = window.next && window.next.router;
+    if (!(useRouter && router && router.prefetch)) router = null;
+    var head = document.head || document.documentElement;
+    var queue = urls.slice();
+    var active = 0;
+    
+    function start(url, finished) {
+        if (router) {
+            var destination = new URL(url, location.href);
+            var pending = router.prefetch(destination.pathname + destination.search);
+            if (pending && pending.then) {
+                pending.then(finished, finished);
+            } else {
+                finished();
+            }
+            return;
+        }
+        var link = document.createElement('link');
+        link.rel = 'prefetch';
+        link.as = 'document';
+        link.href = url;
+        link.onload = finished;
+        link.onerror = finished;
+        head.appendChild(link);
+    }
+    function next() {
+        while (active < concurrency && queue.length) {
+            active++;
+            try {
+                start(queue.shift(), function() {
+                    active--;
+                    next();
+                });
+            } catch (e) {
+                active--;
+            }
+        }
+    }
+    next();
+    return urls.length;
+"""
+
+
+def prefetch_pages(driver, urls, concurrency=2, in_app=False):
+    """Start fetching ``urls`` in the background so navigating to them is served from cache.
+    
+    Returns False if the page could not be asked to prefetch.
+    """
+    urls = list(urls)
+    if not urls:
+        return True
+    try:
+        driver.execute_script(PREFETCH_SCRIPT, urls, int(concurrency), bool(in_app))
+    except Exception:
+        return False
+    return True
+
+
+def navigate_to_event(driver, url, fast_mode=False, in_app=False):
+    """Load ``url``; with ``in_app`` try client-side navigation first and fall back to a full load."""
+    if in_app and navigate_in_app(driver, url, timeout=10 if fast_mode else 15):
+        return
+    
+    invalidate_page_snapshot(driver)
     driver.get(url)
     if fast_mode:
         time.sleep(1.5)
@@ -20,89 +184,199 @@ def navigate_to_event(driver, url, fast_mode=False):
         time.sleep(2)
 
 
+TITLE_SELECTORS = [
+    "h1",
+    "[data-testid='event-title']",
+    ".event-title",
+    "h1[class*='title']",
+    "title",
+]
+
+DESCRIPTION_SELECTORS = [
+    "[data-testid='event-description']",
+    ".event-description",
+    "[class*='description']",
+    "meta[name='description']",
+]
+
+CATEGORY_SELECTOR = "[class*='category'], [data-testid='category'], [class*='tag']"
+
+DATE_SELECTORS = [
+    "[data-testid='end-date']",
+    "[class*='end-date']",
+    "[class*='end']",
+    "time",
+]
+
+DATE_FALLBACK_SELECTOR = "[class*='date'], time"
+
+RESOLVED_INDICATORS = [
+    "Resolved",
+    "Settled",
+    "Closed",
+    "Ended",
+]
+
+# Evaluates every selector chain of extract_event_metadata in one round trip.
+EVENT_METADATA_SCRIPT = """
+    var config = arguments[0];
+    var metadata = {};
+    
+    function text(el) {
+        if (!el) return '';
+        var value = el.tagName === 'TITLE' ? el.textContent : (el.innerText || el.textContent);
+        return (value || '').trim();
+    }
+    function isDate(value) {
+        return value && value.indexOf('$') === -1 && value.indexOf('Vol') === -1;
+    }
+    
+    for (var i = 0; i < config.title.length; i++) {
+        var title = text(document.querySelector(config.title[i]));
+        if (title.length > 0 && title.length < 500) {
+            metadata.title = title;
+            break;
+        }
+    }
+    if (!metadata.title && document.title) {
+        metadata.title = document.title.split('|')[0].trim();
+    }
+    
+    for (var i = 0; i < config.description.length; i++) {
+        var selector = config.description[i];
+        var el = document.querySelector(selector);
+        var desc = selector.indexOf('meta') === 0 ? (el ? el.getAttribute('content') || '' : '') : text(el);
+        if (desc.length > 20) {
+            metadata.description = desc;
+            break;
+        }
+    }
+    
+    var category = document.querySelector(config.category);
+    if (category) metadata.category = text(category);
+    
+    for (var i = 0; i < config.date.length; i++) {
+        var el = document.querySelector(config.date[i]);
+        if (!el) continue;
+        var value = text(el);
+        if (!value && config.date[i] === 'time') value = el.getAttribute('datetime') || '';
+        if (isDate(value)) {
+            metadata.end_date = value;
+            break;
+        }
+    }
+    if (!metadata.end_date) {
+        var dates = document.querySelectorAll(config.dateFallback);
+        for (var i = 0; i < dates.length; i++) {
+            var value = text(dates[i]) || dates[i].getAttribute('datetime') || '';
+            if (isDate(value) && value.length > 5) {
+                metadata.end_date = value;
+                break;
+            }
+        }
+    }
+    
+    var html = document.documentElement.outerHTML.toLowerCase();
+    metadata.resolved = config.resolved.some(function(indicator) {
+        return html.indexOf(indicator.toLowerCase()) !== -1;
+    });
+    return metadata;
+"""
+
+
 def extract_event_metadata(driver):
-    metadata = {}
+    """Title, description, category, end date and resolved flag, gathered in one script call."""
+    try:
+        metadata = driver.execute_script(EVENT_METADATA_SCRIPT, {
+            "title": TITLE_SELECTORS,
+            "description": DESCRIPTION_SELECTORS,
+            "category": CATEGORY_SELECTOR,
+            "date": DATE_SELECTORS,
+            "dateFallback": DATE_FALLBACK_SELECTOR,
+            "resolved": RESOLVED_INDICATORS,
+        })
+    except Exception:
+        metadata = None
     
-    title_selectors = [
-        "h1",
-        "[data-testid='event-title']",
-        ".event-title",
-        "h1[class*='title']",
-        "title",
-    ]
+    if isinstance(metadata, dict):
+        metadata["resolved"] = bool(metadata.get("resolved"))
+        return metadata
     
-    for selector in title_selectors:
-        title = safe_get_text(driver, By.CSS_SELECTOR, selector, timeout=2)
-        if title and len(title) > 0 and len(title) < 500:
-            metadata["title"] = title
-            break
+    return _extract_event_metadata_by_selector(driver)
+
+
+def _first_text(driver, selectors, read, accept):
+    """Text of the first selector whose element yields an acceptable value."""
+    remaining = list(selectors)
+    while remaining:
+        index, element = find_first(driver, remaining)
+        if element is None:
+            return None
+        try:
+            text = read(remaining[index], element)
+        except Exception:
+            text = ""
+        if text and accept(text):
+            return text
+        remaining = remaining[index + 1:]
+    return None
+
+
+def _element_text(selector, element):
+    return element.text.strip()
+
+
+def _is_date_text(text):
+    return "$" not in text and "Vol" not in text
+
+
+def _extract_event_metadata_by_selector(driver):
+    metadata = {}
     
-    if "title" not in metadata:
+    title = _first_text(driver, TITLE_SELECTORS, _element_text, lambda text: len(text) < 500)
+    if title:
+        metadata["title"] = title
+    else:
         page_title = driver.title
         if page_title:
             metadata["title"] = page_title.split("|")[0].strip()
     
-    description_selectors = [
-        "[data-testid='event-description']",
-        ".event-description",
-        "[class*='description']",
-        "meta[name='description']",
-    ]
-    
-    for selector in description_selectors:
+    def read_description(selector, element):
         if selector.startswith("meta"):
-            desc_elem = wait_for_element(driver, By.CSS_SELECTOR, selector, timeout=2)
-            if desc_elem:
-                desc = desc_elem.get_attribute("content")
-            else:
-                desc = ""
-        else:
-            desc = safe_get_text(driver, By.CSS_SELECTOR, selector, timeout=2)
-        
-        if desc and len(desc) > 20:
-            metadata["description"] = desc
-            break
+            return element.get_attribute("content") or ""
+        return element.text.strip()
     
-    category_elem = wait_for_element(driver, By.CSS_SELECTOR, "[class*='category'], [data-testid='category'], [class*='tag']", timeout=2)
-    if category_elem:
-        metadata["category"] = category_elem.text.strip()
+    description = _first_text(driver, DESCRIPTION_SELECTORS, read_description, lambda text: len(text) > 20)
+    if description:
+        metadata["description"] = description
     
-    date_selectors = [
-        "[data-testid='end-date']",
-        "[class*='end-date']",
-        "[class*='end']",
-        "time",
-    ]
+    _, category_elem = find_first(driver, [CATEGORY_SELECTOR])
+    if category_elem is not None:
+        metadata["category"] = category_elem.text.strip()
     
-    for selector in date_selectors:
-        date_elem = wait_for_element(driver, By.CSS_SELECTOR, selector, timeout=2)
-        if date_elem:
-            date_text = date_elem.text.strip()
-            if not date_text and selector == "time":
-                date_text = date_elem.get_attribute("datetime") or ""
-            if date_text and "$" not in date_text and "Vol" not in date_text:
-                metadata["end_date"] = date_text
-                break
+    def read_date(selector, element):
+        date_text = element.text.strip()
+        if not date_text and selector == "time":
+            date_text = element.get_attribute("datetime") or ""
+        return date_text
     
-    if "end_date" not in metadata:
-        date_elems = wait_for_elements(driver, By.CSS_SELECTOR, "[class*='date'], time", timeout=2)
+    end_date = _first_text(driver, DATE_SELECTORS, read_date, _is_date_text)
+    if end_date:
+        metadata["end_date"] = end_date
+    else:
+        try:
+            date_elems = driver.find_elements(By.CSS_SELECTOR, DATE_FALLBACK_SELECTOR)
+        except Exception:
+            date_elems = []
         for date_elem in date_elems:
             date_text = date_elem.text.strip()
             if not date_text:
                 date_text = date_elem.get_attribute("datetime") or ""
-            if date_text and "$" not in date_text and "Vol" not in date_text and len(date_text) > 5:
+            if date_text and _is_date_text(date_text) and len(date_text) > 5:
                 metadata["end_date"] = date_text
                 break
     
-    resolved_indicators = [
-        "Resolved",
-        "Settled",
-        "Closed",
-        "Ended",
-    ]
-    
-    page_text = driver.page_source.lower()
-    metadata["resolved"] = any(indicator.lower() in page_text for indicator in resolved_indicators)
+    metadata["resolved"] = page_snapshot(driver).contains_any(RESOLVED_INDICATORS)
     
     return metadata
 
@@ -130,11 +404,53 @@ def extract_market_data_from_network(network_monitor):
     return markets, market_data.get("price_history", [])
 
 
+# Upper bounds for one in-page text scan; large pages return a partial result instead of stalling.
+SCAN_MAX_NODES = 20000
+SCAN_MAX_MS = 500
+
+# Walks leaf text nodes once instead of reading textContent of every element, which
+# re-reads each subtree for every ancestor. Prepended to the scripts that scan page text.
+TEXT_SCANNER_JS = """
+    function scanText(visit, maxNodes, maxMs) {
+        var root = document.body;
+        if (!root) return;
+        var skip = {SCRIPT: true, STYLE: true, NOSCRIPT: true, TEMPLATE: true};
+        var walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT, {
+            acceptNode: function(node) {
+                if (node.parentNode && skip[node.parentNode.nodeName]) return NodeFilter.FILTER_REJECT;
+                return /\\S/.test(node.nodeValue) ? NodeFilter.FILTER_ACCEPT : NodeFilter.FILTER_SKIP;
+            }
+        });
+        var deadline = Date.now() + maxMs;
+        var count = 0;
+        var node;
+        while ((node = walker.nextNode())) {
+            if (visit(node.nodeValue.trim(), node) === true) return;
+            count++;
+            if (count >= maxNodes || (count % 256 === 0 && Date.now() > deadline)) return;
+        }
+    }
+
+    // Text of the closest short ancestor that also holds a number, e.g. a whole outcome
+    // button whose name and price sit in separate text nodes.
+    function labelText(node, maxLength) {
+        var el = node.parentElement;
+        for (var depth = 0; el && depth < 3; depth++) {
+            var text = (el.textContent || '').trim();
+            if (text.length > maxLength) break;
+            if (/\\d/.test(text)) return text;
+            el = el.parentElement;
+        }
+        return (node.nodeValue || '').trim();
+    }
+"""
+
+
 def extract_resolved_outcome(driver):
     """Extract the winning outcome from a resolved market."""
     try:
         # Look for resolution text patterns
-        resolution_data = driver.execute_script("""
+        resolution_data = driver.execute_script(TEXT_SCANNER_JS + """
             var result = {winning_outcome: null, markets: []};
             var pageText = document.body.innerText || document.body.textContent;
 
@@ -172,30 +488,29 @@ def extract_resolved_outcome(driver):
             }
 
             // Look for all possible outcomes to return both winner and loser
-            var allElements = document.querySelectorAll('button, [role="button"], div, span, p');
             var seenOutcomes = {};
+            var seenCount = 0;
 
-            for (var i = 0; i < allElements.length; i++) {
-                var elem = allElements[i];
-                var text = elem.textContent || elem.innerText;
-                if (!text || text.length > 200) continue;
-
+            scanText(function(text) {
+                if (text.length > 200) return;
                 var outcomeMatch = text.match(/\\b(Yes|No|Up|Down)\\b/i);
                 if (outcomeMatch) {
                     var outcome = outcomeMatch[1];
                     var key = outcome.toLowerCase();
                     if (!seenOutcomes[key]) {
                         seenOutcomes[key] = outcome;
+                        seenCount++;
                     }
                 }
-            }
+                return seenCount === 4;
+            }, arguments[0], arguments[1]);
 
             for (var key in seenOutcomes) {
                 result.markets.push(seenOutcomes[key]);
             }
 
             return result;
-        """)
+        """, SCAN_MAX_NODES, SCAN_MAX_MS)
 
         if resolution_data and isinstance(resolution_data, dict):
             winning_outcome = resolution_data.get("winning_outcome")
@@ -216,21 +531,17 @@ def extract_market_data(driver):
     markets = []
 
     try:
-        market_data = driver.execute_script("""
+        market_data = driver.execute_script(TEXT_SCANNER_JS + """
             var markets = [];
             var seenOutcomes = {};
 
-            var allElements = document.querySelectorAll('button, [role="button"], div, span');
-
-            allElements.forEach(function(elem) {
-                var text = elem.textContent || elem.innerText;
-                if (!text || text.length < 3 || text.length > 100) return;
-
-                text = text.trim();
-
-                var outcomeMatch = text.match(/\\b(Up|Down|Yes|No)\\b/i);
+            scanText(function(nodeText, node) {
+                var outcomeMatch = nodeText.match(/\\b(Up|Down|Yes|No)\\b/i);
                 if (!outcomeMatch) return;
 
+                var text = /[\\d.]+/.test(nodeText) ? nodeText : labelText(node, 100);
+                if (text.length < 3 || text.length > 100) return;
+
                 var outcome = outcomeMatch[1];
 
                 var hasPrice = false;
@@ -268,14 +579,14 @@ def extract_market_data(driver):
                         }
                     }
                 }
-            });
+            }, arguments[0], arguments[1]);
 
             for (var key in seenOutcomes) {
                 markets.push(seenOutcomes[key]);
             }
 
             return markets;
-        """)
+        """, SCAN_MAX_NODES, SCAN_MAX_MS)
         
         if market_data and isinstance(market_data, list):
             seen_outcomes = set()
@@ -423,6 +734,44 @@ def extract_market_data(driver):
     return markets
 
 
+def extract_next_data(driver):
+    """Read the Next.js ``pageProps`` blob from the loaded page in a single script call."""
+    try:
+        raw = driver.execute_script("""
+            // After client-side navigation __NEXT_DATA__ still describes the first page;
+            // the router keeps the props of the route currently shown.
+            var router = window.next && window.next.router;
+            var current = router && router.components && router.components[router.route];
+            if (current && current.props && current.props.pageProps) {
+                try {
+                    return JSON.stringify(current.props.pageProps);
+                } catch (e) {}
+            }
+            var data = window.__NEXT_DATA__;
+            if (!data) {
+                var tag = document.getElementById('__NEXT_DATA__');
+                if (!tag) return null;
+                try {
+                    data = JSON.parse(tag.textContent);
+                } catch (e) {
+                    return null;
+                }
+            }
+            if (!data.props || !data.props.pageProps) return null;
+            return JSON.stringify(data.props.pageProps);
+        """)
+    except Exception:
+        return None
+    
+    if not isinstance(raw, str):
+        return None
+    try:
+        page_props = json.loads(raw)
+    except ValueError:
+        return None
+    return page_props if isinstance(page_props, dict) else None
+
+
 def extract_price_history(driver):
     price_history = []
     
@@ -466,8 +815,8 @@ def extract_price_history(driver):
         pass
     
     try:
-        chart_elem = wait_for_element(driver, By.CSS_SELECTOR, "[class*='chart'], svg, canvas", timeout=3)
-        if chart_elem:
+        _, chart_elem = find_first(driver, ["[class*='chart'], svg, canvas"], timeout=3)
+        if chart_elem is not None:
             tooltip_data = driver.execute_script("""
                 var tooltips = document.querySelectorAll('[class*="tooltip"], [class*="hover"]');
                 var data = [];
@@ -506,19 +855,14 @@ def detect_recurring_event(driver):
         "previous events",
     ]
     
-    page_text = driver.page_source.lower()
-    for indicator in past_events_indicators:
-        if indicator.lower() in page_text:
-            return True
-    
-    past_events_link = wait_for_element(driver, By.XPATH, 
-        "//a[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'past') or contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'previous')]", timeout=2)
-    if past_events_link:
+    if page_snapshot(driver).contains_any(past_events_indicators):
         return True
     
-    past_events_section = wait_for_element(driver, By.CSS_SELECTOR, 
-        "[class*='past'], [class*='previous'], [class*='history'], [data-testid*='past']", timeout=2)
-    return past_events_section is not None
+    _, past_events_element = find_first(driver, [
+        (By.XPATH, "//a[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'past') or contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'previous')]"),
+        "[class*='past'], [class*='previous'], [class*='history'], [data-testid*='past']",
+    ], timeout=2)
+    return past_events_element is not None
 
 
 def get_past_event_urls(driver, max_events):
@@ -531,9 +875,10 @@ def get_past_event_urls(driver, max_events):
         if len(parts) > 1:
             current_event_id = parts[1].split("?")[0].split("/")[0]
     
-    past_events_link = wait_for_element(driver, By.XPATH, 
-        "//a[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'past') or contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'previous') or contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'history')]", timeout=5)
-    if past_events_link:
+    _, past_events_link = find_first(driver, [
+        (By.XPATH, "//a[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'past') or contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'previous') or contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'history')]"),
+    ], timeout=5)
+    if past_events_link is not None:
         try:
             driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", past_events_link)
             time.sleep(1)
@@ -546,12 +891,7 @@ def get_past_event_urls(driver, max_events):
             except Exception:
                 pass
     
-    for scroll_round in range(3):
-        try:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1.5)
-        except Exception:
-            break
+    scroll_until_settled(driver, max_rounds=3)
     
     event_links = wait_for_elements(driver, By.CSS_SELECTOR, "a[href*='/event/']", timeout=10)
     
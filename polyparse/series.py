@@ -0,0 +1,349 @@
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+from .utils import format_epoch_ms, to_epoch_ms
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+
+TIMESTAMP_KEYS = ("timestamp", "time", "date", "t")
+PRICE_KEYS = ("price", "value", "close", "p")
+
+# Below this many points the pure-Python path is faster than converting to NumPy.
+NUMPY_MIN_POINTS = 256
+
+INTERVAL_PATTERN = re.compile(r"^\s*(\d+)\s*(ms|s|m|min|h|d|w)\s*$", re.IGNORECASE)
+INTERVAL_UNITS_MS = {
+    "ms": 1,
+    "s": 1000,
+    "m": 60_000,
+    "min": 60_000,
+    "h": 3_600_000,
+    "d": 86_400_000,
+    "w": 604_800_000,
+}
+RESAMPLE_METHODS = ("ohlc", "last")
+
+
+def parse_interval(interval: Union[str, int]) -> int:
+    """Bar width in milliseconds from ``"15m"``, ``"1h"``, ``"1d"``... or an integer of milliseconds."""
+    if isinstance(interval, int) and not isinstance(interval, bool):
+        width = interval
+    else:
+        match = INTERVAL_PATTERN.match(str(interval))
+        if not match:
+            raise ValueError(f"Invalid interval: {interval!r} (expected e.g. 30s, 15m, 1h, 1d)")
+        width = int(match.group(1)) * INTERVAL_UNITS_MS[match.group(2).lower()]
+    if width <= 0:
+        raise ValueError(f"Interval must be positive: {interval!r}")
+    return width
+
+
+def _point_fields(point):
+    if isinstance(point, dict):
+        timestamp = None
+        for key in TIMESTAMP_KEYS:
+            timestamp = point.get(key)
+            if timestamp:
+                break
+        price = 0
+        for key in PRICE_KEYS:
+            price = point.get(key)
+            if price:
+                break
+        return timestamp, price or 0
+    if isinstance(point, (list, tuple)) and len(point) == 2:
+        return point[0], point[1]
+    return None, None
+
+
+def _sorted_unique(timestamps, prices):
+    """Sort by timestamp and drop duplicate timestamps, keeping the last value seen."""
+    if np is not None and len(timestamps) >= NUMPY_MIN_POINTS:
+        ts = np.asarray(timestamps, dtype=np.int64)
+        ps = np.asarray(prices, dtype=np.float64)
+        # Reverse first so the stable sort puts the last occurrence of each timestamp first.
+        ts, ps = ts[::-1], ps[::-1]
+        order = np.argsort(ts, kind="stable")
+        ts, ps = ts[order], ps[order]
+        keep = np.ones(len(ts), dtype=bool)
+        keep[1:] = ts[1:] != ts[:-1]
+        out_ts, out_ps = array("q"), array("d")
+        out_ts.frombytes(ts[keep].tobytes())
+        out_ps.frombytes(ps[keep].tobytes())
+        return out_ts, out_ps
+
+    latest = dict(zip(timestamps, prices))
+    ordered = sorted(latest)
+    return array("q", ordered), array("d", [latest[t] for t in ordered])
+
+
+class PriceSeries:
+    """Sorted, de-duplicated price history stored as parallel ``array('q')``/``array('d')`` columns.
+
+    Timestamps are epoch milliseconds. Iterating, indexing and ``to_list`` yield the
+    ``{"timestamp": str, "price": float}`` points used in the JSON output.
+    """
+
+    __slots__ = ("timestamps", "prices")
+
+    def __init__(self, timestamps=None, prices=None):
+        self.timestamps = timestamps if isinstance(timestamps, array) else array("q", timestamps or [])
+        self.prices = prices if isinstance(prices, array) else array("d", prices or [])
+
+    @classmethod
+    def from_points(cls, points: Iterable[Any]) -> "PriceSeries":
+        """Normalize raw history points in bulk; points without a usable timestamp or price are dropped."""
+        if isinstance(points, PriceSeries):
+            return points
+        timestamps, prices = [], []
+        for point in points or []:
+            raw_ts, raw_price = _point_fields(point)
+            ts = to_epoch_ms(raw_ts)
+            if ts is None:
+                continue
+            try:
+                price = float(raw_price)
+            except (TypeError, ValueError):
+                continue
+            timestamps.append(ts)
+            prices.append(price)
+        return cls(*_sorted_unique(timestamps, prices))
+
+    def merge(self, other: "PriceSeries") -> "PriceSeries":
+        """Union of both series in one linear pass; on equal timestamps ``other`` wins."""
+        if not other:
+            return self
+        if not self:
+            return other
+
+        a_ts, a_ps, b_ts, b_ps = self.timestamps, self.prices, other.timestamps, other.prices
+        if a_ts[-1] < b_ts[0]:
+            return PriceSeries(a_ts + b_ts, a_ps + b_ps)
+        if b_ts[-1] < a_ts[0]:
+            return PriceSeries(b_ts + a_ts, b_ps + a_ps)
+
+        out_ts, out_ps = array("q"), array("d")
+        i = j = 0
+        while i < len(a_ts) and j < len(b_ts):
+            if a_ts[i] < b_ts[j]:
+                out_ts.append(a_ts[i])
+                out_ps.append(a_ps[i])
+                i += 1
+            else:
+                if a_ts[i] == b_ts[j]:
+                    i += 1
+                out_ts.append(b_ts[j])
+                out_ps.append(b_ps[j])
+                j += 1
+        out_ts.extend(a_ts[i:])
+        out_ps.extend(a_ps[i:])
+        out_ts.extend(b_ts[j:])
+        out_ps.extend(b_ps[j:])
+        return PriceSeries(out_ts, out_ps)
+
+    def between(self, start=None, end=None) -> "PriceSeries":
+        """Points with ``start <= timestamp <= end``; bounds take anything ``to_epoch_ms`` accepts."""
+        lo = 0 if start is None else bisect_left(self.timestamps, to_epoch_ms(start))
+        hi = len(self.timestamps) if end is None else bisect_right(self.timestamps, to_epoch_ms(end))
+        return PriceSeries(self.timestamps[lo:hi], self.prices[lo:hi])
+
+    def after(self, timestamp) -> "PriceSeries":
+        """Points strictly newer than ``timestamp``."""
+        lo = bisect_right(self.timestamps, to_epoch_ms(timestamp))
+        return PriceSeries(self.timestamps[lo:], self.prices[lo:])
+
+    def _bin_bounds(self, width):
+        """Start/end offsets of each non-empty ``width``-ms bin, plus the bin start times."""
+        n = len(self.timestamps)
+        if np is not None and n >= NUMPY_MIN_POINTS:
+            bins = np.frombuffer(self.timestamps, dtype=np.int64) // width * width
+            edges = np.flatnonzero(bins[1:] != bins[:-1]) + 1
+            starts = np.concatenate(([0], edges))
+            ends = np.concatenate((edges, [n]))
+            return starts, ends, bins[starts]
+
+        starts, labels = [], []
+        previous = None
+        for i, ts in enumerate(self.timestamps):
+            label = ts // width * width
+            if label != previous:
+                starts.append(i)
+                labels.append(label)
+                previous = label
+        return starts, starts[1:] + [n], labels
+
+    def resample(self, interval, how: str = "ohlc") -> Union["OHLCSeries", "PriceSeries"]:
+        """Bucket the series into UTC-aligned bars of ``interval``; empty bars are skipped.
+
+        ``how="ohlc"`` returns an ``OHLCSeries``; ``how="last"`` returns a ``PriceSeries``
+        holding the closing price of each bar.
+        """
+        if how not in RESAMPLE_METHODS:
+            raise ValueError(f"Unknown resample method: {how!r} (expected one of {', '.join(RESAMPLE_METHODS)})")
+        width = parse_interval(interval)
+        if not self:
+            return OHLCSeries() if how == "ohlc" else PriceSeries()
+
+        starts, ends, labels = self._bin_bounds(width)
+        if isinstance(starts, list):
+            prices = self.prices
+            close = array("d", (prices[end - 1] for end in ends))
+            if how == "last":
+                return PriceSeries(array("q", labels), close)
+            windows = [prices[start:end] for start, end in zip(starts, ends)]
+            return OHLCSeries(
+                array("q", labels),
+                array("d", (prices[start] for start in starts)),
+                array("d", (max(w) for w in windows)),
+                array("d", (min(w) for w in windows)),
+                close,
+            )
+
+        prices = np.frombuffer(self.prices, dtype=np.float64)
+        close = _to_array("d", prices[ends - 1])
+        if how == "last":
+            return PriceSeries(_to_array("q", labels), close)
+        return OHLCSeries(
+            _to_array("q", labels),
+            _to_array("d", prices[starts]),
+            _to_array("d", np.maximum.reduceat(prices, starts)),
+            _to_array("d", np.minimum.reduceat(prices, starts)),
+            close,
+        )
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [
+            {"timestamp": format_epoch_ms(ts), "price": price}
+            for ts, price in zip(self.timestamps, self.prices)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __bool__(self) -> bool:
+        return len(self.timestamps) > 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for ts, price in zip(self.timestamps, self.prices):
+            yield {"timestamp": format_epoch_ms(ts), "price": price}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PriceSeries(self.timestamps[index], self.prices[index])
+        return {"timestamp": format_epoch_ms(self.timestamps[index]), "price": self.prices[index]}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PriceSeries):
+            return self.timestamps == other.timestamps and self.prices == other.prices
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"PriceSeries(points={len(self)})"
+
+
+def _to_array(typecode, values):
+    out = array(typecode)
+    out.frombytes(values.astype(np.int64 if typecode == "q" else np.float64).tobytes())
+    return out
+
+
+class OHLCSeries:
+    """Open/high/low/close bars stored column-wise; ``timestamps`` are bar start times in epoch ms."""
+
+    __slots__ = ("timestamps", "open", "high", "low", "close")
+    FIELDS = ("open", "high", "low", "close")
+
+    def __init__(self, timestamps=None, open=None, high=None, low=None, close=None):
+        self.timestamps = timestamps if isinstance(timestamps, array) else array("q", timestamps or [])
+        for name, values in zip(self.FIELDS, (open, high, low, close)):
+            setattr(self, name, values if isinstance(values, array) else array("d", values or []))
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __bool__(self) -> bool:
+        return len(self.timestamps) > 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for ts, o, h, l, c in zip(self.timestamps, self.open, self.high, self.low, self.close):
+            yield {"timestamp": format_epoch_ms(ts), "open": o, "high": h, "low": l, "close": c}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, OHLCSeries):
+            return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"OHLCSeries(bars={len(self)})"
+
+
+def resample_event(event_data: Dict[str, Any], interval, how: str = "ohlc") -> Dict[str, Any]:
+    """Replace every market's ``price_history`` (past events included) with resampled bars, in place.
+
+    Markets sharing one history object share the resampled result as well.
+    """
+    parse_interval(interval)
+    done = {}
+    events = [event_data] + [e for e in event_data.get("past_events", []) if isinstance(e, dict)]
+    for event in events:
+        for market in event.get("markets", []):
+            history = market.get("price_history")
+            if history is None:
+                continue
+            key = id(history)
+            if key not in done:
+                done[key] = (history, PriceSeries.from_points(history).resample(interval, how))
+            market["price_history"] = done[key][1]
+    return event_data
+
+
+def copy_event(event_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of ``event_data`` whose market dicts and past events can be changed without touching it.
+
+    Price series are shared: nothing in polyparse modifies one in place (``resample_event``
+    replaces a market's series rather than changing it).
+    """
+    copied = dict(event_data)
+    if isinstance(event_data.get("markets"), list):
+        copied["markets"] = [dict(m) if isinstance(m, dict) else m for m in event_data["markets"]]
+    if isinstance(event_data.get("past_events"), list):
+        copied["past_events"] = [copy_event(e) if isinstance(e, dict) else e for e in event_data["past_events"]]
+    return copied
+
+
+def plain_histories(event_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace every market's series (past events included) with its list of points, in place.
+
+    The result holds only JSON-native values, so ``json.dumps`` needs no ``default``.
+    """
+    events = [event_data] + [e for e in event_data.get("past_events", []) if isinstance(e, dict)]
+    for event in events:
+        for market in event.get("markets", []):
+            history = market.get("price_history") if isinstance(market, dict) else None
+            if isinstance(history, (PriceSeries, OHLCSeries)):
+                market["price_history"] = history.to_list()
+    return event_data
+
+
+def json_default(obj):
+    """``json.dump`` hook that writes price series in the list-of-points shape."""
+    if isinstance(obj, (PriceSeries, OHLCSeries)):
+        return obj.to_list()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
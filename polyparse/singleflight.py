@@ -0,0 +1,68 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+from .utils import extract_slug_from_url, normalize_to_url
+
+
+def flight_key(url_or_slug: str) -> str:
+    """Identity of an event request: its slug, whichever URL form or bare id was given."""
+    if "/" not in url_or_slug:
+        return url_or_slug
+    slug = extract_slug_from_url(url_or_slug)
+    if slug:
+        return slug
+    try:
+        return normalize_to_url(url_or_slug, "url")
+    except ValueError:
+        return url_or_slug
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same event into one in-flight call.
+
+    The first caller for a key runs the function; callers arriving while it runs wait
+    and receive the same result object (or exception). With ``copy`` each caller
+    instead gets ``copy(result)`` of a non-None result, so no caller sees another's
+    changes. Nothing is kept once the call finishes, so later callers start a new one.
+    """
+
+    def __init__(self, key: Callable[[str], str] = flight_key,
+                 copy: Optional[Callable[[Any], Any]] = None):
+        self._key = key
+        self._copy = copy
+        self._lock = threading.Lock()
+        self._flights: Dict[str, Future] = {}
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def do(self, url: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """``fn(*args, **kwargs)``, shared with every concurrent call for the same ``url``."""
+        key = self._key(url)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = Future()
+                self._flights[key] = flight
+        if not leader:
+            return self._handout(flight.result())
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(result)
+            return self._handout(result)
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+    def _handout(self, result: Any) -> Any:
+        if self._copy is None or result is None:
+            return result
+        return self._copy(result)
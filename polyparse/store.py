@@ -0,0 +1,317 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Union
+
+from .markets import MarketSet
+from .series import PriceSeries, copy_event, json_default
+from .singleflight import SingleFlight
+from .utils import extract_slug_from_url, format_epoch_ms, to_epoch_ms
+
+
+def market_key(market: Dict[str, Any]) -> str:
+    """Stable string form of ``MarketSet.key_for`` used to tag stored points."""
+    return "/".join(MarketSet.key_for(market))
+
+
+class HistoryStore:
+    """Incrementally refreshed copy of one event under ``directory``.
+
+    ``{slug}.json`` holds the latest event metadata and markets without their
+    histories, ``{slug}.history.jsonl`` is an append-only log of
+    ``{"market", "timestamp", "price"}`` points, and ``{slug}.index.json`` keeps the
+    last stored timestamp (epoch ms) per market. A refresh reads only the index and
+    appends only points newer than it, so its cost follows the new data rather than
+    the market's lifetime.
+    """
+
+    def __init__(self, directory: str, slug: str):
+        self.directory = directory
+        self.slug = slug
+        self.snapshot_path = os.path.join(directory, f"{slug}.json")
+        self.history_path = os.path.join(directory, f"{slug}.history.jsonl")
+        self.index_path = os.path.join(directory, f"{slug}.index.json")
+
+    def exists(self) -> bool:
+        return os.path.exists(self.snapshot_path)
+
+    def last_timestamps(self) -> Dict[str, int]:
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def append(self, event_data: Dict[str, Any]) -> int:
+        """Store the points of ``event_data`` newer than what is already stored; returns how many."""
+        os.makedirs(self.directory, exist_ok=True)
+        last = self.last_timestamps()
+        lines = []
+        markets = []
+        for market in event_data.get("markets", []):
+            key = market_key(market)
+            series = PriceSeries.from_points(market.get("price_history"))
+            if key in last:
+                series = series.after(last[key])
+            for point in series:
+                lines.append(json.dumps({"market": key, **point}))
+            if series:
+                last[key] = series.timestamps[-1]
+            markets.append({k: v for k, v in market.items() if k != "price_history"})
+
+        # The log is written before the index: a crash in between only repeats points,
+        # which load() de-duplicates.
+        if lines:
+            with open(self.history_path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        snapshot = {k: v for k, v in event_data.items() if k not in ("markets", "past_events")}
+        snapshot["markets"] = markets
+        _write_json(self.index_path, last)
+        _write_json(self.snapshot_path, snapshot)
+        return len(lines)
+
+    def load(self) -> Dict[str, Any]:
+        """The stored event with each market's full ``price_history`` rebuilt from the log."""
+        with open(self.snapshot_path, encoding="utf-8") as f:
+            event_data = json.load(f)
+
+        points: Dict[str, list] = {}
+        if os.path.exists(self.history_path):
+            with open(self.history_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        point = json.loads(line)
+                    except ValueError:
+                        continue
+                    points.setdefault(point.get("market"), []).append(point)
+
+        for market in event_data.get("markets", []):
+            market["price_history"] = PriceSeries.from_points(points.get(market_key(market), []))
+        return event_data
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=json_default)
+    os.replace(tmp_path, path)
+
+
+def _revive_histories(event_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn the stored point lists of ``event_data`` (and its past events) back into PriceSeries."""
+    for market in event_data.get("markets", []):
+        market["price_history"] = PriceSeries.from_points(market.get("price_history"))
+    for past_event in event_data.get("past_events", []):
+        if isinstance(past_event, dict):
+            _revive_histories(past_event)
+    return event_data
+
+
+def event_slug(event_data: Dict[str, Any]) -> Optional[str]:
+    return extract_slug_from_url(event_data.get("url") or "") or event_data.get("event_id")
+
+
+class ResolvedEventCache:
+    """Write-once cache of fully extracted resolved events, one ``{slug}.json`` under ``directory``.
+
+    A resolved event never changes, so entries never expire and are never rewritten.
+    Only events flagged ``resolved`` are admitted, and only when that is trustworthy:
+    the flag came from the event's own data (API or Next.js props, ``resolved_source``
+    ``"event"``) or its ``end_date`` has passed. The page's keyword-based flag alone
+    is not enough. Entries record which of the two admitted them as ``resolved_source``.
+    Since an entry is never revisited, events without priced markets or price history
+    (a failed or partial scrape) are not admitted either.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path_for(self, slug: str) -> str:
+        return os.path.join(self.directory, f"{slug}.json")
+
+    def get(self, slug: str, columnar: bool = False) -> Optional[Dict[str, Any]]:
+        """The cached event, or None on a miss; with ``columnar`` its histories are rebuilt as PriceSeries."""
+        try:
+            with open(self.path_for(slug), encoding="utf-8") as f:
+                event_data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(event_data, dict):
+            return None
+        return _revive_histories(event_data) if columnar else event_data
+
+    @staticmethod
+    def resolution_source(event_data: Dict[str, Any], now: Optional[float] = None) -> Optional[str]:
+        """``"event"`` or ``"end_date"`` when ``event_data`` is known to be resolved, else None."""
+        if event_data.get("resolved") is not True:
+            return None
+        if event_data.get("resolved_source") == "event":
+            return "event"
+        try:
+            end_ms = to_epoch_ms(event_data.get("end_date"))
+        except (TypeError, ValueError, OverflowError):
+            end_ms = None
+        now = time.time() if now is None else now
+        if end_ms is not None and end_ms < now * 1000:
+            return "end_date"
+        return None
+
+    @staticmethod
+    def is_complete(event_data: Dict[str, Any]) -> bool:
+        """True when ``event_data`` has priced markets and price history, i.e. the scrape did not come up short."""
+        markets = [m for m in event_data.get("markets") or [] if isinstance(m, dict)]
+        return (any(m.get("current_price") is not None for m in markets)
+                and any(m.get("price_history") for m in markets))
+
+    def put(self, event_data: Dict[str, Any]) -> bool:
+        """Cache ``event_data`` if it is known to be resolved, complete and not cached yet; returns whether it was written."""
+        slug = event_slug(event_data) if isinstance(event_data, dict) else None
+        source = self.resolution_source(event_data) if slug else None
+        if source is None or not self.is_complete(event_data):
+            return False
+        path = self.path_for(slug)
+        if os.path.exists(path):
+            return False
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {k: v for k, v in event_data.items() if k != "past_events"}
+        entry["resolved_source"] = source
+        _write_json(path, entry)
+        return True
+
+
+class EventCache:
+    """TTL cache of extraction results for live events, in memory and optionally under ``directory``.
+
+    A result younger than its TTL is served as is. For ``stale_ttl`` seconds after that
+    it is still served immediately while a single background refresh replaces it; older
+    results and misses are extracted in the caller's thread. ``ttl`` is seconds, or a
+    callable taking the event dict for per-event TTLs. Served events are copies carrying
+    a ``cache`` entry with the status (``fresh``, ``stale`` or ``miss``) and age.
+    Concurrent misses for the same event share one extraction.
+
+    Stale refreshes call the extraction function from a worker thread, so it must not
+    share a browser with the caller (use the API engine or a driver of its own).
+    """
+
+    def __init__(self, directory: Optional[str] = None,
+                 ttl: Union[float, Callable[[Dict[str, Any]], float]] = 60, stale_ttl: float = 300,
+                 max_entries: int = 256, refresh_workers: int = 1):
+        self.directory = directory
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._refresh_pool = ThreadPoolExecutor(max_workers=max(1, refresh_workers))
+        self._flights = SingleFlight(key=self.key_for)
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return extract_slug_from_url(url) or re.sub(r"[^a-zA-Z0-9._-]+", "_", url)[-100:]
+
+    def ttl_for(self, event_data: Dict[str, Any]) -> float:
+        return self.ttl(event_data) if callable(self.ttl) else self.ttl
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def lookup(self, key: str):
+        """``(stored_at, event)`` from memory, then disk; None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        if not self.directory:
+            return None
+
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                stored = json.load(f)
+            entry = (float(stored["cached_at"]), stored["event"])
+            if not isinstance(entry[1], dict):
+                return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def store(self, key: str, event_data: Dict[str, Any], stored_at: Optional[float] = None):
+        entry = (time.time() if stored_at is None else stored_at, event_data)
+        self._remember(key, entry)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            _write_json(self._path(key), {"cached_at": entry[0], "event": event_data})
+        return entry
+
+    def fetch(self, url: str, extract: Callable[..., Optional[Dict[str, Any]]], *args, **kwargs):
+        """The event for ``url``, served from cache when possible; ``extract(*args, **kwargs)`` scrapes it."""
+        key = self.key_for(url)
+        entry = self.lookup(key)
+        if entry is not None:
+            stored_at, event_data = entry
+            age = time.time() - stored_at
+            ttl = self.ttl_for(event_data)
+            if age <= ttl:
+                return self._served(entry, "fresh")
+            if age <= ttl + self.stale_ttl:
+                self._refresh_in_background(key, extract, args, kwargs)
+                return self._served(entry, "stale")
+
+        def load():
+            event_data = extract(*args, **kwargs)
+            return self.store(key, event_data) if event_data else event_data
+
+        entry = self._flights.do(url, load)
+        if not entry:
+            return entry
+        return self._served(entry, "miss")
+
+    def _refresh_in_background(self, key, extract, args, kwargs):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                event_data = extract(*args, **kwargs)
+                if event_data:
+                    self.store(key, event_data)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._refresh_pool.submit(refresh)
+
+    @staticmethod
+    def _served(entry, status):
+        stored_at, event_data = entry
+        served = copy_event(event_data)
+        served["cache"] = {
+            "status": status,
+            "age_seconds": round(max(0.0, time.time() - stored_at), 3),
+            "cached_at": format_epoch_ms(int(stored_at * 1000)),
+        }
+        return served
+
+    def close(self, wait: bool = True):
+        self._refresh_pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
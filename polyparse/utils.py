@@ -1,9 +1,26 @@
+import calendar
+import math
 import re
+from datetime import datetime, timezone
+from functools import lru_cache
 from urllib.parse import urlparse, urljoin
 
+from dateutil import parser as date_parser
+
 
 POLYMARKET_BASE_URL = "https://polymarket.com"
 
+# Epoch ms of 0001-01-01T00:00:00Z and 9999-12-31T23:59:59.999Z, the range datetime covers.
+MIN_EPOCH_MS = -62135596800000
+MAX_EPOCH_MS = 253402300799999
+
+ISO_TIMESTAMP_PATTERN = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})"
+    r"(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d{1,9}))?)?)?"
+    r"\s*(Z|[+-]\d{2}(?::?\d{2})?)?$",
+    re.IGNORECASE,
+)
+
 
 def normalize_to_url(input_value, input_type):
     if input_type == "url":
@@ -42,3 +59,94 @@ def is_polymarket_url(url):
     return "polymarket.com" in url and "/event/" in url
 
 
+@lru_cache(maxsize=4096)
+def _day_start_ms(year, month, day):
+    if not 1 <= month <= 12 or not 1 <= day <= calendar.monthrange(year, month)[1]:
+        raise ValueError(f"invalid date {year}-{month}-{day}")
+    return calendar.timegm((year, month, day, 0, 0, 0)) * 1000
+
+
+@lru_cache(maxsize=64)
+def _utc_offset_ms(designator):
+    if not designator or designator.upper() == "Z":
+        return 0
+    sign = -1 if designator[0] == "-" else 1
+    digits = designator[1:].replace(":", "")
+    hours, minutes = int(digits[:2]), int(digits[2:4] or 0)
+    return sign * (hours * 3600 + minutes * 60) * 1000
+
+
+def _parse_iso_ms(text):
+    match = ISO_TIMESTAMP_PATTERN.match(text)
+    if not match:
+        return None
+    year, month, day, hour, minute, second, fraction, designator = match.groups()
+    try:
+        ms = _day_start_ms(int(year), int(month), int(day))
+    except ValueError:
+        return None
+    if hour:
+        ms += (int(hour) * 3600 + int(minute) * 60 + int(second or 0)) * 1000
+    if fraction:
+        ms += int(fraction[:3].ljust(3, "0"))
+    return ms - _utc_offset_ms(designator)
+
+
+def to_epoch_ms(value):
+    """Normalize an epoch (s, ms, us or ns, number or digit string) or date string to integer epoch ms.
+
+    ISO-8601 strings are parsed arithmetically with the per-day epoch cached, so long
+    histories sharing a handful of dates cost one regex match per point; other date
+    formats fall back to dateutil. Epochs outside the years 1-9999 give None.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        number = value
+    elif isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        number = value
+    else:
+        text = str(value).strip()
+        if not text:
+            return None
+        if text.isdigit():
+            number = int(text)
+        else:
+            parsed_ms = _parse_iso_ms(text)
+            if parsed_ms is not None:
+                return parsed_ms
+            try:
+                number = float(text)
+            except ValueError:
+                try:
+                    parsed = date_parser.parse(text)
+                except (ValueError, OverflowError):
+                    return None
+                if parsed.tzinfo is None:
+                    parsed = parsed.replace(tzinfo=timezone.utc)
+                return int(parsed.timestamp() * 1000)
+            if not math.isfinite(number):
+                return None
+    # Anything below 1e11 is taken as seconds (1e11 s is the year 5138, 1e11 ms is 1973);
+    # from 1e14 (ms in the year 5138) up it is microseconds, from 1e17 nanoseconds.
+    if abs(number) < 1e11:
+        number *= 1000
+    elif abs(number) >= 1e17:
+        number //= 1_000_000
+    elif abs(number) >= 1e14:
+        number //= 1000
+    number = int(number)
+    # Outside what a datetime can hold the point could not be written out again.
+    if not MIN_EPOCH_MS <= number <= MAX_EPOCH_MS:
+        return None
+    return number
+
+
+def format_epoch_ms(ms):
+    """Render epoch ms as an ISO-8601 UTC string, with milliseconds only when non-zero."""
+    moment = datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+    if ms % 1000:
+        return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{ms % 1000:03d}Z"
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -11,6 +11,7 @@ setup(
         "webdriver-manager>=4.0.0",
         "click>=8.1.0",
         "python-dateutil>=2.8.2",
+        "urllib3>=1.26.0",
     ],
     entry_points={
         "console_scripts": [
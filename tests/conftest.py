@@ -2,6 +2,8 @@
 import json
 import os
 import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Dict, Any
 from unittest.mock import Mock, MagicMock
@@ -67,6 +69,44 @@ def headless_driver():
     driver.quit()
 
 
+@pytest.fixture
+def fixture_server():
+    """Local HTTP server answering from ``server.routes`` (path with query -> (status, content type, body))."""
+    routes = {}
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            hits.append(self.path)
+            status, content_type, body = routes.get(self.path, (404, "text/plain", "not found"))
+            if not isinstance(body, (str, bytes)):
+                body = json.dumps(body)
+            payload = body.encode("utf-8") if isinstance(body, str) else body
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    server.routes = routes
+    server.hits = hits
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
 @pytest.fixture
 def sample_event_html():
     """Sample HTML structure of a Polymarket event page."""
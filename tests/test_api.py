@@ -0,0 +1,112 @@
+"""Tests for the direct JSON API engine."""
+import json
+import pytest
+
+from polyparse.api import ApiEngine
+from polyparse.series import resample_event
+from tests.conftest import validate_event_data, validate_market_data
+
+
+def gamma_event(slug, title, yes_price, token_prefix):
+    """A Gamma API event with one binary market."""
+    return {
+        "id": "1",
+        "slug": slug,
+        "title": title,
+        "description": "Resolves Yes if the condition is met before the end date.",
+        "endDate": "2024-11-05T00:00:00Z",
+        "closed": True,
+        "markets": [{
+            "conditionId": f"0x{token_prefix}",
+            "question": title,
+            "outcomes": "[\"Yes\", \"No\"]",
+            "outcomePrices": f"[\"{yes_price}\", \"{round(1 - yes_price, 2)}\"]",
+            "clobTokenIds": f"[\"{token_prefix}1\", \"{token_prefix}2\"]",
+            "volume": "50000",
+            "liquidity": "1200",
+        }],
+    }
+
+
+@pytest.fixture
+def api_server(fixture_server):
+    """Fixture server preloaded with two events and their price histories."""
+    events = {
+        "btc-above-100k": gamma_event("btc-above-100k", "BTC above 100k?", 0.7, "11"),
+        "eth-above-5k": gamma_event("eth-above-5k", "ETH above 5k?", 0.2, "22"),
+    }
+    for slug, event in events.items():
+        fixture_server.routes[f"/events?slug={slug}"] = (200, "application/json", [event])
+    fixture_server.routes["/events?slug=unknown"] = (200, "application/json", [])
+
+    for token, points in {
+        "111": [{"t": 1700000600, "p": 0.65}, {"t": 1700000000, "p": 0.6}],
+        "112": [{"t": 1700000000, "p": 0.4}, {"t": 1700000600, "p": 0.35}],
+        "221": [{"t": 1700000000, "p": 0.25}],
+        "222": [{"t": 1700000000, "p": 0.75}],
+    }.items():
+        fixture_server.routes[f"/prices-history?market={token}&interval=max&fidelity=60"] = (
+            200, "application/json", {"history": points}
+        )
+    return fixture_server
+
+
+class TestApiEngine:
+    """Tests for ApiEngine against a local mock API."""
+
+    @pytest.mark.integration
+    def test_extract_event_schema(self, api_server):
+        """Test that API results map onto the extract_event_data schema."""
+        with ApiEngine(gamma_url=api_server.url, clob_url=api_server.url) as api:
+            result = api.extract_event("https://polymarket.com/event/btc-above-100k")
+
+        assert validate_event_data(result)
+        assert result["event_id"] == "btc-above-100k"
+        assert result["resolved"] is True
+        assert result["resolved_source"] == "event"
+        assert result["end_date"] == "2024-11-05T00:00:00Z"
+
+        markets = {m["outcome"]: m for m in result["markets"]}
+        assert set(markets) == {"Yes", "No"}
+        for market in markets.values():
+            assert validate_market_data(market)
+        assert markets["Yes"]["current_price"] == 0.7
+        assert markets["Yes"]["volume"] == 50000.0
+        assert [p["price"] for p in markets["Yes"]["price_history"]] == [0.6, 0.65]
+        assert [p["price"] for p in markets["No"]["price_history"]] == [0.4, 0.35]
+        assert json.loads(json.dumps(result)) == result
+
+    @pytest.mark.integration
+    def test_extract_events_concurrently_in_order(self, api_server):
+        """Test that batch extraction preserves input order and reports misses as None."""
+        with ApiEngine(gamma_url=api_server.url, clob_url=api_server.url,
+                       concurrency=4, per_host=2) as api:
+            results = api.extract_events(["eth-above-5k", "unknown", "btc-above-100k"])
+
+        assert results[0]["title"] == "ETH above 5k?"
+        assert results[1] is None
+        assert results[2]["title"] == "BTC above 100k?"
+        assert results[0]["url"] == "https://polymarket.com/event/eth-above-5k"
+
+    @pytest.mark.integration
+    def test_history_can_be_skipped(self, api_server):
+        """Test that include_history=False makes only the event request."""
+        with ApiEngine(gamma_url=api_server.url, clob_url=api_server.url, include_history=False) as api:
+            result = api.extract_event("btc-above-100k")
+
+        assert all(m["price_history"] == [] for m in result["markets"])
+        assert not any(hit.startswith("/prices-history") for hit in api_server.hits)
+
+    @pytest.mark.integration
+    def test_concurrent_callers_get_independent_events(self, api_server):
+        """Test that resampling one caller's event leaves other callers' events untouched."""
+        with ApiEngine(gamma_url=api_server.url, clob_url=api_server.url, concurrency=4) as api:
+            results = api.extract_events(["btc-above-100k"] * 4)
+
+        resample_event(results[0], "1h")
+        results[0]["markets"][0]["current_price"] = 0.0
+
+        for result in results[1:]:
+            markets = {m["outcome"]: m for m in result["markets"]}
+            assert markets["Yes"]["current_price"] == 0.7
+            assert [p["price"] for p in markets["Yes"]["price_history"]] == [0.6, 0.65]
@@ -0,0 +1,37 @@
+"""Unit tests for polyparse.auth module."""
+from unittest.mock import MagicMock, patch
+import pytest
+
+from polyparse.auth import login
+
+
+class TestLogin:
+    """Tests for the email/password login flow."""
+
+    @pytest.mark.unit
+    def test_clicks_the_button_that_was_found(self, mock_driver):
+        """Test that the login button matched by text is the one clicked."""
+        email_input, password_input, login_button = MagicMock(), MagicMock(), MagicMock()
+        mock_driver.current_url = "https://polymarket.com/"
+
+        with patch('polyparse.auth.find_first', side_effect=[
+                 (0, email_input), (1, password_input), (1, login_button),
+             ]), \
+             patch('polyparse.auth.time.sleep'):
+            assert login(mock_driver, "user@example.com", "secret") is True
+
+        email_input.send_keys.assert_called_once_with("user@example.com")
+        password_input.send_keys.assert_called_once_with("secret")
+        login_button.click.assert_called_once()
+
+    @pytest.mark.unit
+    def test_failed_click_reports_failure(self, mock_driver):
+        """Test that a button that cannot be clicked fails the login."""
+        login_button = MagicMock()
+        login_button.click.side_effect = Exception("element not interactable")
+
+        with patch('polyparse.auth.find_first', side_effect=[
+                 (None, None), (None, None), (0, login_button),
+             ]), \
+             patch('polyparse.auth.time.sleep'):
+            assert login(mock_driver, "user@example.com", "secret") is False
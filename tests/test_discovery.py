@@ -0,0 +1,70 @@
+"""Unit tests for polyparse.discovery module."""
+import json
+import pytest
+
+from polyparse.discovery import SERIES_PAGE_SIZE, discover_past_events, past_events_from
+
+
+def _event(slug, end_date, closed=True):
+    return {"slug": slug, "endDate": end_date, "closed": closed}
+
+
+class FakeClient:
+    """Gamma API stand-in serving pages of a series' closed events."""
+
+    def __init__(self, events):
+        self.events = events
+        self.requests = []
+
+    def get_json(self, url, fields=None):
+        self.requests.append((url, fields))
+        offset, limit = fields["offset"], fields["limit"]
+        return self.events[offset:offset + limit]
+
+
+class TestPastEventDiscovery:
+    """Tests for series-based past-event discovery."""
+
+    @pytest.mark.unit
+    def test_ordered_past_events_from_page_props(self, mock_driver):
+        """Test discovery from the series listed in the page's Next.js props."""
+        page_props = {"event": {"slug": "btc-daily-3", "series": [{
+            "id": "7", "slug": "btc-daily", "recurrence": "daily",
+            "events": [
+                _event("btc-daily-1", "2024-01-01T00:00:00Z"),
+                _event("btc-daily-3", "2024-01-03T00:00:00Z", closed=False),
+                _event("btc-daily-2", "2024-01-02T00:00:00Z"),
+                _event("btc-daily-9", "2999-01-01T00:00:00Z", closed=False),
+            ],
+        }]}}
+        mock_driver.execute_script.return_value = json.dumps(page_props)
+
+        past = discover_past_events(mock_driver, 5, current_url="https://polymarket.com/event/btc-daily-3")
+
+        assert [e["slug"] for e in past] == ["btc-daily-2", "btc-daily-1"]
+        assert past[0]["url"] == "https://polymarket.com/event/btc-daily-2"
+        assert past[0]["end_date"] == "2024-01-02T00:00:00Z"
+
+    @pytest.mark.unit
+    def test_paginates_series_through_api(self):
+        """Test that missing events are paged from the API up to max_events."""
+        listed = [{"series": [{"id": 7, "slug": "btc-daily"}]}]
+        events = [_event(f"btc-daily-{n}", f"2024-01-01T00:00:{n % 60:02d}Z") for n in range(SERIES_PAGE_SIZE + 20)]
+        client = FakeClient(events)
+        responses = [{"url": "https://polymarket.com/api/event", "body": json.dumps(listed)}]
+
+        past = discover_past_events(None, SERIES_PAGE_SIZE + 5, responses=responses, client=client,
+                                    gamma_url="https://gamma.test")
+
+        assert len(past) == SERIES_PAGE_SIZE + 5
+        assert [fields["offset"] for _, fields in client.requests] == [0, SERIES_PAGE_SIZE]
+        assert client.requests[0][0] == "https://gamma.test/events"
+        assert client.requests[0][1]["series_id"] == "7"
+
+    @pytest.mark.unit
+    def test_no_series_means_no_discovery(self, mock_driver):
+        """Test that chart series and plain pages yield nothing."""
+        mock_driver.execute_script.return_value = json.dumps({"chart": {"series": [{"id": 1, "data": []}]}})
+
+        assert discover_past_events(mock_driver, 3) == []
+        assert past_events_from([_event("a", None, closed=False)]) == []
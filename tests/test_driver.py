@@ -0,0 +1,107 @@
+"""Unit tests for polyparse.driver module."""
+from unittest.mock import MagicMock
+import pytest
+from selenium.webdriver.common.by import By
+
+from polyparse.driver import (
+    FIND_FIRST_SCRIPT,
+    WAIT_FOR_FIRST_SCRIPT,
+    find_first,
+    to_locator,
+    wait_for_element,
+    wait_for_elements,
+)
+
+
+class TestFindFirst:
+    """Tests for the single-call selector engine."""
+
+    @pytest.mark.unit
+    def test_to_locator(self):
+        """Test conversion of selector strings and By pairs."""
+        assert to_locator("h1") == ("css", "h1")
+        assert to_locator((By.XPATH, "//a")) == ("xpath", "//a")
+        assert to_locator((By.NAME, "email")) == ("css", '[name="email"]')
+        assert to_locator((By.ID, 'a"b')) == ("css", '[id="a\\"b"]')
+        with pytest.raises(ValueError):
+            to_locator((By.LINK_TEXT, "Log in"))
+
+    @pytest.mark.unit
+    def test_all_candidates_resolved_in_one_call(self, mock_driver):
+        """Test that every candidate is sent in one script call and the hit is reported."""
+        element = MagicMock()
+        mock_driver.execute_script.return_value = [1, element]
+
+        index, found = find_first(mock_driver, ["h1", (By.XPATH, "//h2"), ".title"])
+
+        assert (index, found) == (1, element)
+        mock_driver.execute_script.assert_called_once_with(
+            FIND_FIRST_SCRIPT, [["css", "h1"], ["xpath", "//h2"], ["css", ".title"]]
+        )
+        mock_driver.find_elements.assert_not_called()
+
+    @pytest.mark.unit
+    def test_miss_without_timeout_is_immediate(self, mock_driver):
+        """Test that a miss returns after one call when no timeout is given."""
+        mock_driver.execute_script.return_value = [-1, None]
+
+        assert find_first(mock_driver, ["h1", "h2"]) == (None, None)
+        assert mock_driver.execute_script.call_count == 1
+
+    @pytest.mark.unit
+    def test_waits_until_a_candidate_appears(self, mock_driver):
+        """Test that a timeout repeats the lookup until something matches."""
+        element = MagicMock()
+        mock_driver.execute_async_script.side_effect = Exception("no async scripts")
+        mock_driver.execute_script.side_effect = [[-1, None], [-1, None], [0, element]]
+
+        assert find_first(mock_driver, ["h1"], timeout=5, poll_interval=0) == (0, element)
+
+    @pytest.mark.unit
+    def test_falls_back_to_webdriver_lookups(self, mock_driver):
+        """Test per-candidate lookups when scripts are unavailable."""
+        element = MagicMock()
+        mock_driver.execute_script.side_effect = Exception("no js")
+        mock_driver.find_elements.side_effect = [[], [element]]
+
+        assert find_first(mock_driver, [(By.NAME, "email"), 'input[type="email"]']) == (1, element)
+        mock_driver.find_elements.assert_called_with(By.CSS_SELECTOR, 'input[type="email"]')
+
+
+class TestWaitForFirst:
+    """Tests for the MutationObserver-based wait primitives."""
+
+    @pytest.mark.unit
+    def test_find_first_waits_in_page(self, mock_driver):
+        """Test that a timed lookup blocks in one async script call."""
+        element = MagicMock()
+        mock_driver.execute_async_script.return_value = [0, element]
+
+        assert find_first(mock_driver, ["h1", (By.XPATH, "//h2")], timeout=5) == (0, element)
+        script, locators, timeout_ms, all_matches = mock_driver.execute_async_script.call_args[0]
+        assert script == WAIT_FOR_FIRST_SCRIPT
+        assert locators == [["css", "h1"], ["xpath", "//h2"]]
+        assert 4000 < timeout_ms <= 5000
+        assert all_matches is False
+        mock_driver.execute_script.assert_not_called()
+
+    @pytest.mark.unit
+    def test_wait_for_element_and_elements(self, mock_driver):
+        """Test the single-element and all-matches wait helpers."""
+        first, second = MagicMock(), MagicMock()
+        mock_driver.execute_async_script.side_effect = [[0, first], [0, [first, second]], [-1, None]]
+
+        assert wait_for_element(mock_driver, By.NAME, "email", timeout=1) is first
+        assert wait_for_elements(mock_driver, By.CSS_SELECTOR, "a", timeout=1) == [first, second]
+        assert wait_for_element(mock_driver, By.CSS_SELECTOR, "a", timeout=0) is None
+        assert mock_driver.execute_async_script.call_args_list[0][0][1] == [["css", '[name="email"]']]
+        assert mock_driver.execute_async_script.call_args_list[1][0][3] is True
+
+    @pytest.mark.unit
+    def test_unsupported_async_falls_back(self, mock_driver):
+        """Test that drivers without async scripts still get a polled lookup."""
+        element = MagicMock()
+        mock_driver.execute_async_script.side_effect = Exception("unsupported")
+        mock_driver.execute_script.return_value = [0, element]
+
+        assert find_first(mock_driver, ["h1"], timeout=1) == (0, element)
@@ -362,6 +362,98 @@ class TestCLIOutputFormat:
             # Check for presence of key fields in output
             assert "test" in output or "Test Event" in output or output
 
+    @pytest.mark.e2e
+    def test_cli_resample_output(self):
+        """Test that --resample writes OHLC bars instead of raw points."""
+        runner = CliRunner()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('polyparse.cli.create_driver'), \
+                 patch('polyparse.cli.extract_event_data') as mock_extract:
+
+                mock_extract.return_value = {
+                    "event_id": "test-event",
+                    "title": "Test",
+                    "url": "https://polymarket.com/event/test-event",
+                    "scraped_at": "2024-01-01T12:00:00Z",
+                    "markets": [{"outcome": "Yes", "current_price": 0.6, "price_history": [
+                        {"timestamp": "2024-01-01T00:10:00Z", "price": 0.5},
+                        {"timestamp": "2024-01-01T00:50:00Z", "price": 0.7},
+                        {"timestamp": "2024-01-01T00:30:00Z", "price": 0.4},
+                        {"timestamp": "2024-01-01T01:05:00Z", "price": 0.6},
+                    ]}]
+                }
+
+                result = runner.invoke(main, [
+                    "--url", "https://polymarket.com/event/test-event",
+                    "--output-dir", tmpdir,
+                    "--resample", "1h",
+                    "--past-events", "0",
+                    "--headless"
+                ])
+
+            assert result.exit_code == 0
+            json_files = list(Path(tmpdir).glob("*.json"))
+            with open(json_files[0]) as f:
+                data = json.load(f)
+
+        assert data["markets"][0]["price_history"] == [
+            {"timestamp": "2024-01-01T00:00:00Z", "open": 0.5, "high": 0.7, "low": 0.4, "close": 0.7},
+            {"timestamp": "2024-01-01T01:00:00Z", "open": 0.6, "high": 0.6, "low": 0.6, "close": 0.6},
+        ]
+
+    @pytest.mark.e2e
+    def test_cli_rejects_invalid_resample_interval(self):
+        """Test that a malformed --resample value is a usage error."""
+        runner = CliRunner()
+        result = runner.invoke(main, [
+            "--url", "https://polymarket.com/event/test-event",
+            "--resample", "hourly"
+        ])
+
+        assert result.exit_code != 0
+        assert "Invalid interval" in result.output
+
+    @pytest.mark.e2e
+    def test_cli_incremental_refresh(self):
+        """Test that a second --incremental run appends only new points to the store."""
+        runner = CliRunner()
+
+        def scraped(points):
+            return {
+                "event_id": "test-event",
+                "title": "Test",
+                "url": "https://polymarket.com/event/test-event",
+                "scraped_at": "2024-01-01T12:00:00Z",
+                "markets": [{"outcome": "Yes", "current_price": 0.6, "price_history": [
+                    {"timestamp": t, "price": p} for t, p in points
+                ]}]
+            }
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('polyparse.cli.create_driver'), \
+                 patch('polyparse.cli.extract_event_data') as mock_extract:
+
+                mock_extract.side_effect = [
+                    scraped([(1700000000, 0.5), (1700000060, 0.55)]),
+                    scraped([(1700000000, 0.5), (1700000060, 0.55), (1700000120, 0.6)]),
+                ]
+                args = [
+                    "--url", "https://polymarket.com/event/test-event",
+                    "--output-dir", tmpdir,
+                    "--incremental",
+                    "--past-events", "0",
+                    "--headless"
+                ]
+                first = runner.invoke(main, args)
+                second = runner.invoke(main, args)
+
+            assert "+2 price points" in first.output
+            assert "+1 price points" in second.output
+            assert sorted(p.name for p in Path(tmpdir).iterdir()) == [
+                "test-event.history.jsonl", "test-event.index.json", "test-event.json"
+            ]
+
 
 class TestCLIErrorHandling:
     """E2E tests for CLI error handling."""
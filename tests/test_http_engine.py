@@ -0,0 +1,208 @@
+"""Tests for the browserless HTTP engine."""
+import json
+from unittest.mock import patch
+import pytest
+from click.testing import CliRunner
+
+from polyparse.cli import main
+from polyparse.http_engine import HttpClient, extract_event_data_http, extract_next_data_from_html
+from tests.conftest import validate_event_data, validate_market_data
+
+
+def render_event_page(page_props):
+    """Wrap pageProps in a minimal Next.js page."""
+    next_data = {"props": {"pageProps": page_props}, "page": "/event/[slug]"}
+    return (
+        "<!DOCTYPE html><html><head><title>Event | Polymarket</title></head><body>"
+        "<div id=\"__next\"></div>"
+        f"<script id=\"__NEXT_DATA__\" type=\"application/json\">{json.dumps(next_data)}</script>"
+        "</body></html>"
+    )
+
+
+@pytest.fixture
+def event_page_props():
+    """pageProps for a two-candidate event as served by the site."""
+    return {
+        "dehydratedState": {
+            "queries": [{
+                "queryKey": ["/api/event/slug", "presidential-election-winner-2028"],
+                "state": {
+                    "data": {
+                        "id": "903",
+                        "title": "Presidential Election Winner 2028",
+                        "description": "This market will resolve to the winner of the 2028 US presidential election.",
+                        "endDate": "2028-11-07T00:00:00Z",
+                        "closed": False,
+                        "markets": [
+                            {
+                                "question": "Will Alice win the 2028 election?",
+                                "groupItemTitle": "Alice",
+                                "outcomes": "[\"Yes\", \"No\"]",
+                                "outcomePrices": "[\"0.31\", \"0.69\"]",
+                                "clobTokenIds": "[\"111\", \"112\"]",
+                                "volume": "2500000",
+                                "liquidity": "150000",
+                            },
+                            {
+                                "question": "Will Bob win the 2028 election?",
+                                "groupItemTitle": "Bob",
+                                "outcomes": "[\"Yes\", \"No\"]",
+                                "outcomePrices": "[\"0.22\", \"0.78\"]",
+                                "clobTokenIds": "[\"221\", \"222\"]",
+                                "volume": "1800000",
+                                "liquidity": "90000",
+                            },
+                        ],
+                    }
+                },
+            }]
+        }
+    }
+
+
+def serve_histories(fixture_server, token_ids):
+    """Route a one-point CLOB price history for each token."""
+    for token_id in token_ids:
+        fixture_server.routes[f"/prices-history?market={token_id}&interval=max&fidelity=60"] = (
+            200, "application/json", json.dumps({"history": [{"t": 1704067200, "p": 0.3}]})
+        )
+
+
+class TestNextDataParsing:
+    """Tests for locating __NEXT_DATA__ in raw HTML."""
+
+    @pytest.mark.unit
+    def test_extracts_page_props(self, event_page_props):
+        """Test that pageProps are returned from the script tag."""
+        page_props = extract_next_data_from_html(render_event_page(event_page_props))
+        assert page_props == event_page_props
+
+    @pytest.mark.unit
+    def test_missing_or_malformed_blob(self):
+        """Test that pages without usable JSON yield None."""
+        assert extract_next_data_from_html("<html><body>No data</body></html>") is None
+        assert extract_next_data_from_html(
+            "<script id=\"__NEXT_DATA__\" type=\"application/json\">{not json</script>"
+        ) is None
+        assert extract_next_data_from_html("") is None
+
+
+class TestHttpEngine:
+    """Tests for extract_event_data_http against a local fixture server."""
+
+    @pytest.mark.integration
+    def test_extracts_event_from_html(self, fixture_server, event_page_props):
+        """Test end-to-end extraction from a served event page."""
+        fixture_server.routes["/event/presidential-election-winner-2028"] = (
+            200, "text/html; charset=utf-8", render_event_page(event_page_props)
+        )
+        serve_histories(fixture_server, ["111", "112", "221", "222"])
+        url = f"{fixture_server.url}/event/presidential-election-winner-2028"
+
+        with HttpClient(timeout=5) as client:
+            result = extract_event_data_http(url, client=client, clob_url=fixture_server.url)
+
+        assert validate_event_data(result)
+        assert result["event_id"] == "presidential-election-winner-2028"
+        assert result["title"] == "Presidential Election Winner 2028"
+        assert result["resolved"] is False
+        for market in result["markets"]:
+            assert validate_market_data(market)
+        assert json.loads(json.dumps(result)) == result
+        assert all(market["price_history"] == [{"timestamp": "2024-01-01T00:00:00Z", "price": 0.3}]
+                   for market in result["markets"])
+        prices = {(m["outcome"], m["current_price"]) for m in result["markets"]}
+        assert ("Will Alice win the 2028 election?", 0.31) in prices
+        assert ("Will Bob win the 2028 election?", 0.22) in prices
+
+    @pytest.mark.integration
+    def test_returns_none_without_embedded_data(self, fixture_server):
+        """Test that pages without event data signal a browser fallback."""
+        fixture_server.routes["/event/empty"] = (200, "text/html", "<html><body></body></html>")
+
+        assert extract_event_data_http(f"{fixture_server.url}/event/empty") is None
+        assert extract_event_data_http(f"{fixture_server.url}/event/missing") is None
+
+    @pytest.mark.integration
+    def test_returns_none_without_history(self, fixture_server, event_page_props):
+        """Test that an event whose history cannot be fetched signals a browser fallback."""
+        fixture_server.routes["/event/a"] = (200, "text/html", render_event_page(event_page_props))
+
+        result = extract_event_data_http(f"{fixture_server.url}/event/a", clob_url=fixture_server.url)
+
+        assert result is None
+        assert any(hit.startswith("/prices-history?market=111") for hit in fixture_server.hits)
+
+    @pytest.mark.integration
+    def test_client_reuses_connection(self, fixture_server, event_page_props):
+        """Test that repeated fetches reuse the pooled connections instead of opening new ones."""
+        fixture_server.routes["/event/a"] = (200, "text/html", render_event_page(event_page_props))
+        serve_histories(fixture_server, ["111", "112", "221", "222"])
+
+        with HttpClient(timeout=5) as client:
+            pool = client.pool.connection_from_url(fixture_server.url)
+            assert extract_event_data_http(f"{fixture_server.url}/event/a", client=client,
+                                           clob_url=fixture_server.url)
+            opened = pool.num_connections
+            for _ in range(2):
+                assert extract_event_data_http(f"{fixture_server.url}/event/a", client=client,
+                                               clob_url=fixture_server.url)
+            assert pool.num_connections == opened
+
+
+class TestHttpEngineCLI:
+    """Tests for --engine http in the CLI."""
+
+    @pytest.mark.e2e
+    def test_http_engine_skips_browser(self, temp_output_dir):
+        """Test that a successful HTTP scrape never starts Chrome."""
+        runner = CliRunner()
+        event = {"event_id": "test-event", "title": "Test Event", "markets": []}
+
+        with patch('polyparse.cli.create_driver') as mock_create, \
+             patch('polyparse.cli.extract_event_data_http', return_value=event):
+            result = runner.invoke(main, [
+                "--id", "test-event", "--engine", "http",
+                "--past-events", "0", "--output-dir", temp_output_dir,
+            ])
+
+        assert result.exit_code == 0
+        assert not mock_create.called
+        assert "Data saved to" in result.output
+
+    @pytest.mark.e2e
+    def test_http_engine_falls_back_to_browser(self, temp_output_dir):
+        """Test that missing HTML data falls back to the Selenium path."""
+        runner = CliRunner()
+        event = {"event_id": "test-event", "title": "Test Event", "markets": []}
+
+        with patch('polyparse.cli.create_driver') as mock_create, \
+             patch('polyparse.cli.extract_event_data_http', return_value=None), \
+             patch('polyparse.cli.extract_event_data', return_value=event) as mock_extract:
+            result = runner.invoke(main, [
+                "--id", "test-event", "--engine", "http",
+                "--past-events", "0", "--output-dir", temp_output_dir,
+            ])
+
+        assert result.exit_code == 0
+        assert mock_create.called
+        assert mock_extract.called
+
+    @pytest.mark.e2e
+    def test_http_engine_reports_browser_for_past_events(self, temp_output_dir):
+        """Test that asking for past events says the browser is used instead of the HTTP engine."""
+        runner = CliRunner()
+        event = {"event_id": "test-event", "title": "Test Event", "markets": [], "past_events": []}
+
+        with patch('polyparse.cli.create_driver'), \
+             patch('polyparse.cli.extract_event_data_http') as mock_http, \
+             patch('polyparse.cli.extract_recurring_events', return_value=event):
+            result = runner.invoke(main, [
+                "--id", "test-event", "--engine", "http",
+                "--past-events", "2", "--output-dir", temp_output_dir,
+            ])
+
+        assert result.exit_code == 0
+        assert not mock_http.called
+        assert "--engine http does not scrape past events, using the browser" in result.output
@@ -1,10 +1,19 @@
 """Integration tests for polyparse event extraction."""
 import json
 import os
+import threading
 from unittest.mock import Mock, MagicMock, patch
 import pytest
 
-from polyparse.extractor import extract_event_data, extract_recurring_events
+from polyparse.extractor import (
+    EventCapture,
+    build_event,
+    capture_event,
+    capture_is_sufficient,
+    extract_event_data,
+    extract_past_events_pipelined,
+    extract_recurring_events,
+)
 from polyparse.network import NetworkMonitor
 from tests.conftest import validate_event_data, validate_market_data
 
@@ -71,6 +80,134 @@ class TestNetworkMonitor:
 
         assert isinstance(market_data, dict)
 
+    @pytest.mark.integration
+    def test_collector_installed_before_navigation(self, mock_driver):
+        """Test that the in-page collector is registered when monitoring starts."""
+        mock_driver.execute_cdp_cmd.return_value = {"identifier": "7"}
+
+        monitor = NetworkMonitor(mock_driver, use_collector=True)
+        monitor.start()
+
+        commands = [c[0][0] for c in mock_driver.execute_cdp_cmd.call_args_list]
+        assert "Page.addScriptToEvaluateOnNewDocument" in commands
+
+        monitor.stop()
+        commands = [c[0][0] for c in mock_driver.execute_cdp_cmd.call_args_list]
+        assert "Page.removeScriptToEvaluateOnNewDocument" in commands
+
+    @pytest.mark.integration
+    def test_collector_drained_in_one_call(self, mock_driver, sample_network_response):
+        """Test that buffered responses are retrieved without per-request CDP calls."""
+        entries = [
+            {"id": "collector-1", "url": "https://polymarket.com/api/events/test",
+             "status": 200, "body": json.dumps(sample_network_response)},
+            {"id": "collector-2", "url": "https://polymarket.com/api/empty", "status": 204, "body": ""},
+        ]
+        mock_driver.execute_cdp_cmd.return_value = {"identifier": "7"}
+        mock_driver.execute_script.side_effect = lambda script, *args: (
+            json.dumps(entries) if "__polyparseCollector" in script else 1000
+        )
+
+        monitor = NetworkMonitor(mock_driver, capture_all=True, use_collector=True)
+        monitor.start()
+        with patch("polyparse.network.time.sleep"):
+            responses = monitor.capture_all_responses(wait_time=0, scroll_attempts=2)
+
+        assert [r["requestId"] for r in responses] == ["collector-1"]
+        assert not mock_driver.get_log.called
+        assert monitor.extract_market_data()["event"]["title"] == "Will Bitcoin hit $100k in 2024?"
+
+
+    @pytest.mark.integration
+    def test_capture_stops_once_sufficient(self, mock_driver, sample_network_response, sample_performance_log):
+        """Test that capture returns as soon as the sufficiency predicate holds."""
+        mock_driver.get_log.side_effect = [sample_performance_log] + [[]] * 20
+        mock_driver.execute_cdp_cmd.return_value = {"body": json.dumps(sample_network_response)}
+
+        monitor = NetworkMonitor(mock_driver, sufficient=capture_is_sufficient())
+        with patch("polyparse.network.time.sleep") as mock_sleep:
+            responses = monitor.capture_all_responses(wait_time=3, scroll_attempts=8)
+
+        assert [r["requestId"] for r in responses] == ["1234"]
+        assert monitor.is_sufficient() is True
+        assert not mock_sleep.called
+        assert not mock_driver.execute_script.called
+
+    @pytest.mark.integration
+    def test_probe_runs_between_polls_on_capture_thread(self, mock_driver):
+        """Test that the probe is called on the capturing thread and stops capture once it succeeds."""
+        mock_driver.get_log.return_value = []
+        calls = []
+
+        def probe():
+            calls.append(threading.current_thread())
+            return len(calls) == 3
+
+        monitor = NetworkMonitor(mock_driver, probe=probe)
+        with patch("polyparse.network.time.sleep"):
+            monitor.capture_all_responses(wait_time=3, scroll_attempts=8)
+
+        assert len(calls) == 3
+        assert set(calls) == {threading.current_thread()}
+        assert mock_driver.get_log.call_count >= 3
+        assert not mock_driver.execute_script.called
+
+    @pytest.mark.integration
+    def test_history_required_per_token(self):
+        """Test that the history requirement waits for every token of the priced markets."""
+        sufficient = capture_is_sufficient(require_history=True)
+        progress = {
+            "event": {"title": "Test"},
+            "markets": [{"outcomes": '["Yes", "No"]', "outcomePrices": "[0.6, 0.4]",
+                         "clobTokenIds": '["111", "222"]'}],
+            "price_history": [{"t": 1, "p": 0.5}],
+            "history_tokens": {"111"},
+        }
+
+        assert sufficient(progress) is False
+        progress["history_tokens"].add("222")
+        assert sufficient(progress) is True
+        assert capture_is_sufficient()({"event": {}, "markets": progress["markets"]}) is False
+
+    @pytest.mark.integration
+    def test_sufficiency_matches_what_build_event_builds(self, mock_driver):
+        """Test that the predicate accepts a payload exactly when build_event gets markets from it."""
+        def gamma_payload(market):
+            return json.dumps({"data": {"event": {"title": "BTC Up or Down", "markets": [market]}}})
+
+        buildable = {"outcomes": '["Up", "Down"]', "outcomePrices": '["0.55", "0.45"]',
+                     "clobTokenIds": '["111", "222"]'}
+        unbuildable = {"outcomePrices": '["0.55", "0.45"]', "clobTokenIds": '["111", "222"]'}
+
+        for market, expected in ((buildable, ["Up", "Down"]), (unbuildable, [])):
+            monitor = NetworkMonitor(mock_driver, sufficient=capture_is_sufficient())
+            body = gamma_payload(market)
+            monitor._absorb("https://gamma-api.polymarket.com/events?slug=btc", body)
+            monitor.responses = [{"url": "https://gamma-api.polymarket.com/events?slug=btc", "body": body}]
+            capture = EventCapture("https://polymarket.com/event/btc", event_data={}, monitor=monitor)
+
+            markets = build_event(capture)["markets"]
+
+            assert [m["outcome"] for m in markets] == expected
+            assert monitor.is_sufficient() is bool(expected)
+
+    @pytest.mark.integration
+    def test_histories_by_token(self, mock_driver):
+        """Test that history responses are grouped by the token in their market= parameter."""
+        monitor = NetworkMonitor(mock_driver)
+        monitor.responses = [
+            {"url": "https://clob.polymarket.com/prices-history?market=111&interval=1d",
+             "body": json.dumps({"history": [{"t": 1, "p": 0.6}]})},
+            {"url": "https://clob.polymarket.com/prices-history?market=222",
+             "body": json.dumps({"history": [{"t": 1, "p": 0.4}]})},
+            {"url": "https://gamma-api.polymarket.com/events?slug=test", "body": json.dumps({"title": "Test"})},
+        ]
+
+        assert monitor.histories_by_token() == {
+            "111": [{"t": 1, "p": 0.6}],
+            "222": [{"t": 1, "p": 0.4}],
+        }
+
 
 class TestEventDataExtraction:
     """Integration tests for event data extraction."""
@@ -130,6 +267,188 @@ class TestEventDataExtraction:
         assert result is not None
         assert validate_event_data(result)
 
+    @pytest.mark.integration
+    def test_next_data_fast_path_skips_capture(self, mock_driver):
+        """Test that a complete __NEXT_DATA__ blob with history short-circuits network capture."""
+        page_props = {
+            "priceHistory": [{"t": 1700000000, "p": 0.8}, {"t": 1700003600, "p": 0.82}],
+            "dehydratedState": {
+                "queries": [{
+                    "state": {
+                        "data": {
+                            "title": "Fed decision in December?",
+                            "endDate": "2024-12-18T00:00:00Z",
+                            "closed": False,
+                            "markets": [{
+                                "question": "Fed decision in December?",
+                                "outcomes": "[\"Yes\", \"No\"]",
+                                "outcomePrices": "[\"0.82\", \"0.18\"]",
+                                "volume": "125000.5",
+                            }],
+                        }
+                    }
+                }]
+            }
+        }
+
+        with patch('polyparse.extractor.navigate_to_event'), \
+             patch('polyparse.extractor.extract_next_data', return_value=page_props), \
+             patch('polyparse.extractor.extract_event_metadata') as mock_metadata, \
+             patch('polyparse.extractor.NetworkMonitor') as mock_monitor_class:
+
+            result = extract_event_data(mock_driver, "https://polymarket.com/event/fed-december")
+
+        monitor = mock_monitor_class.return_value
+        assert not monitor.capture_all_responses.called
+        assert monitor.stop.called
+        assert not mock_metadata.called
+        assert result["title"] == "Fed decision in December?"
+        assert result["resolved"] is False
+        assert [(m["outcome"], m["current_price"]) for m in result["markets"]] == [("Yes", 0.82), ("No", 0.18)]
+        assert [len(m["price_history"]) for m in result["markets"]] == [2, 2]
+        assert json.loads(json.dumps(result)) == result
+
+    @pytest.mark.integration
+    def test_next_data_without_history_captures_history_only(self, mock_driver):
+        """Test that __NEXT_DATA__ without history still captures each token's price history."""
+        page_props = {
+            "dehydratedState": {
+                "queries": [{
+                    "state": {
+                        "data": {
+                            "title": "Fed decision in December?",
+                            "markets": [{
+                                "question": "Fed decision in December?",
+                                "outcomes": "[\"Yes\", \"No\"]",
+                                "outcomePrices": "[\"0.82\", \"0.18\"]",
+                                "clobTokenIds": "[\"111\", \"222\"]",
+                            }],
+                        }
+                    }
+                }]
+            }
+        }
+
+        with patch('polyparse.extractor.navigate_to_event'), \
+             patch('polyparse.extractor.extract_next_data', return_value=page_props), \
+             patch('polyparse.extractor.extract_event_metadata') as mock_metadata, \
+             patch('polyparse.extractor.NetworkMonitor') as mock_monitor_class, \
+             patch('polyparse.extractor.time.sleep'):
+
+            monitor = mock_monitor_class.return_value
+            monitor.capture_all_responses.return_value = []
+            monitor.histories_by_token.return_value = {
+                "111": [{"t": 1700000000, "p": 0.8}],
+                "222": [{"t": 1700000000, "p": 0.2}],
+            }
+            monitor.extract_market_data.return_value = {"price_history": []}
+            monitor.responses = [{"url": "https://clob.polymarket.com/prices-history?market=111", "body": "{}"}]
+            captured = []
+            result = extract_event_data(mock_driver, "https://polymarket.com/event/fed-december",
+                                        captured=captured)
+
+        assert monitor.capture_all_responses.called
+        assert captured == monitor.responses
+        assert not mock_metadata.called
+        assert monitor.sufficient({"history_tokens": {"111"}}) is False
+        assert monitor.sufficient({"history_tokens": {"111", "222"}}) is True
+        assert result["title"] == "Fed decision in December?"
+        assert [(m["outcome"], m["price_history"][0]["price"]) for m in result["markets"]] == [
+            ("Yes", 0.8), ("No", 0.2)
+        ]
+
+    @pytest.mark.integration
+    def test_next_data_without_markets_falls_back_to_capture(self, mock_driver):
+        """Test that an incomplete __NEXT_DATA__ blob still runs network capture."""
+        with patch('polyparse.extractor.navigate_to_event'), \
+             patch('polyparse.extractor.extract_next_data', return_value={"dehydratedState": {"queries": []}}), \
+             patch('polyparse.extractor.extract_event_metadata', return_value={"title": "Test"}), \
+             patch('polyparse.extractor.extract_market_data', return_value=[]), \
+             patch('polyparse.extractor.extract_price_history', return_value=[]), \
+             patch('polyparse.extractor.NetworkMonitor') as mock_monitor_class, \
+             patch('polyparse.extractor.time.sleep'):
+
+            mock_monitor_class.return_value.responses = []
+            mock_monitor_class.return_value.extract_market_data.return_value = {}
+            extract_event_data(mock_driver, "https://polymarket.com/event/test")
+
+        assert mock_monitor_class.return_value.capture_all_responses.called
+
+    @pytest.mark.integration
+    def test_race_dom_wins_and_cancels_capture(self, mock_driver):
+        """Test that a complete DOM result stops a capture that has found nothing."""
+        def slow_capture(wait_time, scroll_attempts):
+            assert monitor.probe() is True, "capture was not cancelled"
+            return []
+
+        with patch('polyparse.extractor.navigate_to_event'), \
+             patch('polyparse.extractor.extract_next_data', return_value=None), \
+             patch('polyparse.extractor.extract_event_metadata', return_value={"title": "BTC Up or Down"}), \
+             patch('polyparse.extractor.extract_market_data', return_value=[
+                 {"outcome": "Up", "current_price": 0.55, "volume": 0.0, "liquidity": 0.0},
+                 {"outcome": "Down", "current_price": 0.45, "volume": 0.0, "liquidity": 0.0},
+             ]), \
+             patch('polyparse.extractor.extract_price_history', return_value=[]), \
+             patch('polyparse.extractor.time.sleep'), \
+             patch('polyparse.extractor.NetworkMonitor') as mock_monitor_class:
+
+            monitor = mock_monitor_class.return_value
+            monitor.capture_all_responses.side_effect = slow_capture
+            result = extract_event_data(mock_driver, "https://polymarket.com/event/btc-updown", race_dom=True)
+
+        assert result["title"] == "BTC Up or Down"
+        assert [m["outcome"] for m in result["markets"]] == ["Up", "Down"]
+        assert monitor.stop.called
+        assert not monitor.extract_market_data.called
+
+    @pytest.mark.integration
+    def test_race_capture_finishes_first(self, mock_driver):
+        """Test that the capture result is used when the DOM never yields a usable event."""
+        with patch('polyparse.extractor.navigate_to_event'), \
+             patch('polyparse.extractor.extract_next_data', return_value=None), \
+             patch('polyparse.extractor.extract_event_metadata', return_value={"title": "Test"}), \
+             patch('polyparse.extractor.extract_market_data', return_value=[
+                 {"outcome": "Unknown", "current_price": 0.0, "volume": 0.0, "liquidity": 0.0},
+             ]), \
+             patch('polyparse.extractor.extract_price_history', return_value=[]), \
+             patch('polyparse.extractor.time.sleep'), \
+             patch('polyparse.extractor.NetworkMonitor') as mock_monitor_class:
+
+            monitor = mock_monitor_class.return_value
+            def capture(wait_time, scroll_attempts):
+                assert monitor.probe() is False
+                return []
+
+            monitor.capture_all_responses.side_effect = capture
+            monitor.responses = []
+            monitor.extract_market_data.return_value = {
+                "markets": [{"outcome": "Yes", "price": 0.7}],
+            }
+            result = extract_event_data(mock_driver, "https://polymarket.com/event/test", race_dom=True)
+
+        assert [(m["outcome"], m["current_price"]) for m in result["markets"]] == [("Yes", 0.7)]
+
+    @pytest.mark.integration
+    def test_race_holds_both_sides_to_the_same_rules(self, mock_driver):
+        """Test that in fast mode neither the capture nor the DOM probe may finish without history."""
+        with patch('polyparse.extractor.navigate_to_event'), \
+             patch('polyparse.extractor.extract_next_data', return_value=None), \
+             patch('polyparse.extractor.extract_event_metadata', return_value={"title": "Test"}), \
+             patch('polyparse.extractor.extract_market_data', return_value=[
+                 {"outcome": "Yes", "current_price": 0.6, "volume": 0.0, "liquidity": 0.0},
+             ]), \
+             patch('polyparse.extractor.extract_price_history', return_value=[]), \
+             patch('polyparse.extractor.time.sleep'), \
+             patch('polyparse.extractor.NetworkMonitor') as mock_monitor_class:
+
+            monitor = mock_monitor_class.return_value
+            capture_event(mock_driver, "https://polymarket.com/event/test", fast_mode=True, race_dom=True)
+            sufficient = mock_monitor_class.call_args[1]["sufficient"]
+
+            assert monitor.probe() is False
+            assert sufficient({"event": {"title": "Test"}, "markets": [{"outcome": "Yes", "price": 0.6}],
+                               "price_history": [], "history_tokens": set()}) is False
+
     @pytest.mark.integration
     def test_extract_event_deduplication(self, mock_driver):
         """Test that duplicate market data is deduplicated."""
@@ -299,6 +618,227 @@ class TestRecurringEventExtraction:
             assert calls[1][1].get("fast_mode") is True or calls[1][0][3] is True
 
 
+    @pytest.mark.integration
+    def test_in_app_navigation_for_past_events(self, mock_driver):
+        """Test that in-app navigation is requested for past events only."""
+        with patch('polyparse.extractor.extract_event_data') as mock_extract, \
+             patch('polyparse.extractor.detect_recurring_event', return_value=True), \
+             patch('polyparse.extractor.get_past_event_urls', return_value=["https://polymarket.com/event/past-1"]):
+
+            mock_extract.return_value = {"event_id": "test"}
+            extract_recurring_events(
+                mock_driver,
+                "https://polymarket.com/event/current",
+                num_past_events=1,
+                in_app=True
+            )
+
+        main_call, past_call = mock_extract.call_args_list
+        assert main_call[1].get("in_app") is None
+        assert past_call[1]["in_app"] is True
+
+
+    @pytest.mark.integration
+    def test_prefetch_ahead_of_past_events(self, mock_driver):
+        """Test that each upcoming past event is prefetched once, depth pages ahead."""
+        urls = [f"https://polymarket.com/event/past-{n}" for n in (1, 2, 3)]
+        with patch('polyparse.extractor.extract_event_data') as mock_extract, \
+             patch('polyparse.extractor.detect_recurring_event', return_value=True), \
+             patch('polyparse.extractor.get_past_event_urls', return_value=urls), \
+             patch('polyparse.extractor.prefetch_pages') as mock_prefetch:
+
+            mock_extract.return_value = {"event_id": "test"}
+            extract_recurring_events(
+                mock_driver,
+                "https://polymarket.com/event/current",
+                num_past_events=3,
+                prefetch_depth=2
+            )
+
+        assert mock_prefetch.call_args[0][1] == urls[:2]
+        assert [c[1]["prefetch"] for c in mock_extract.call_args_list[1:]] == [[urls[2]], [], []]
+
+
+    @pytest.mark.integration
+    def test_series_discovery_skips_page_links(self, mock_driver):
+        """Test that past events found in series data bypass the DOM link scrape."""
+        discovered = [{"slug": "past-1", "url": "https://polymarket.com/event/past-1", "end_date": None}]
+        with patch('polyparse.extractor.extract_event_data') as mock_extract, \
+             patch('polyparse.extractor.discover_past_events', return_value=discovered), \
+             patch('polyparse.extractor.detect_recurring_event') as mock_detect, \
+             patch('polyparse.extractor.get_past_event_urls') as mock_past:
+
+            mock_extract.return_value = {"event_id": "test"}
+            result = extract_recurring_events(
+                mock_driver,
+                "https://polymarket.com/event/current",
+                num_past_events=1
+            )
+
+        assert len(result["past_events"]) == 1
+        assert mock_extract.call_args_list[1][0][1] == "https://polymarket.com/event/past-1"
+        assert not mock_detect.called
+        assert not mock_past.called
+
+    @pytest.mark.integration
+    def test_series_discovery_uses_main_capture(self, mock_driver):
+        """Test that discovery sees the main event's captured responses and the configured API URL."""
+        series_response = {"url": "https://gamma-api.polymarket.com/events?slug=current", "body": "{}"}
+
+        def fake_extract(driver, url, captured=None, **kwargs):
+            if captured is not None:
+                captured.append(series_response)
+            return {"event_id": url.rsplit("/", 1)[-1], "url": url}
+
+        client = Mock()
+        with patch('polyparse.extractor.extract_event_data', side_effect=fake_extract), \
+             patch('polyparse.extractor.discover_past_events', return_value=[]) as mock_discover, \
+             patch('polyparse.extractor.detect_recurring_event', return_value=False):
+
+            extract_recurring_events(
+                mock_driver,
+                "https://polymarket.com/event/current",
+                num_past_events=2,
+                gamma_url="http://localhost:8080",
+                client=client,
+            )
+
+        kwargs = mock_discover.call_args[1]
+        assert kwargs["responses"] == [series_response]
+        assert kwargs["gamma_url"] == "http://localhost:8080"
+        assert kwargs["client"] is client
+
+
+    @pytest.mark.integration
+    def test_resolved_cache_skips_cached_past_events(self, mock_driver, tmp_path):
+        """Test that cached resolved events are not scraped and new resolved ones are stored."""
+        from polyparse.store import ResolvedEventCache
+
+        urls = ["https://polymarket.com/event/past-1", "https://polymarket.com/event/past-2"]
+        cache = ResolvedEventCache(str(tmp_path))
+
+        def fake_extract(driver, url, **kwargs):
+            return {"url": url, "event_id": url.rsplit("/", 1)[-1], "resolved": True,
+                    "resolved_source": "event", "markets": [{
+                        "outcome": "Up", "current_price": 1.0,
+                        "price_history": [{"timestamp": "2024-01-01T00:00:00Z", "price": 1.0}],
+                    }]}
+
+        cache.put(fake_extract(mock_driver, urls[0]))
+
+        with patch('polyparse.extractor.extract_event_data', side_effect=fake_extract) as mock_extract, \
+             patch('polyparse.extractor.discover_past_events', return_value=[{"url": u} for u in urls]):
+            result = extract_recurring_events(
+                mock_driver,
+                "https://polymarket.com/event/current",
+                num_past_events=2,
+                resolved_cache=cache
+            )
+
+        assert [c[0][1] for c in mock_extract.call_args_list] == ["https://polymarket.com/event/current", urls[1]]
+        assert [e["event_id"] for e in result["past_events"]] == ["past-1", "past-2"]
+        assert cache.get("past-2") is not None
+
+
+    @pytest.mark.integration
+    def test_pipelined_past_events(self, mock_driver):
+        """Test that captures are parsed off the browser thread and returned in order."""
+        import threading
+
+        captured = []
+        built_on = []
+
+        def fake_capture(driver, url, **kwargs):
+            if url.endswith("broken"):
+                raise RuntimeError("navigation failed")
+            captured.append(url)
+            return EventCapture(url, result={"url": url})
+
+        def fake_build(capture, driver=None):
+            built_on.append(threading.current_thread())
+            return capture.result
+
+        urls = ["https://polymarket.com/event/past-1", "https://polymarket.com/event/broken",
+                "https://polymarket.com/event/past-2"]
+        with patch('polyparse.extractor.capture_event', side_effect=fake_capture) as mock_capture, \
+             patch('polyparse.extractor.build_event', side_effect=fake_build):
+            events = extract_past_events_pipelined(mock_driver, urls)
+
+        assert [e["url"] for e in events] == captured == [urls[0], urls[2]]
+        assert threading.current_thread() not in built_on
+        assert mock_capture.call_args[1]["collect_dom_fallback"] is True
+
+    @pytest.mark.integration
+    def test_build_event_without_driver(self, mock_driver):
+        """Test that a capture carrying a DOM fallback builds without touching the browser."""
+        capture = EventCapture("https://polymarket.com/event/past-1", event_data={"title": "Past"})
+        capture.dom_markets = [{"outcome": "Yes", "current_price": 0.7}]
+        capture.dom_history = []
+
+        event = build_event(capture)
+
+        assert event["title"] == "Past"
+        assert [m["outcome"] for m in event["markets"]] == ["Yes"]
+
+    @pytest.mark.integration
+    def test_dom_fallback_decided_on_buildable_markets(self, mock_driver):
+        """Test that captured Gamma markets skip the DOM read and still build without a driver."""
+        event = {"title": "BTC Up or Down", "markets": [{
+            "outcomes": '["Up", "Down"]', "outcomePrices": '["0.55", "0.45"]', "clobTokenIds": '["111", "222"]',
+        }]}
+
+        with patch('polyparse.extractor.navigate_to_event'), \
+             patch('polyparse.extractor.extract_next_data', return_value=None), \
+             patch('polyparse.extractor.extract_event_metadata', return_value={}), \
+             patch('polyparse.extractor.extract_market_data') as mock_dom_markets, \
+             patch('polyparse.extractor.extract_price_history', return_value=[]), \
+             patch('polyparse.extractor.NetworkMonitor') as mock_monitor_class, \
+             patch('polyparse.extractor.time.sleep'):
+
+            monitor = mock_monitor_class.return_value
+            monitor.capture_all_responses.return_value = []
+            monitor.responses = []
+            monitor.get_graphql_queries.return_value = []
+            # No title captured: the page supplies it, the markets are what decides the fallback.
+            monitor.progress = {"event": None, "markets": event["markets"], "price_history": []}
+            monitor.extract_market_data.return_value = {"event": event, "markets": event["markets"]}
+            capture = capture_event(mock_driver, "https://polymarket.com/event/btc", fast_mode=True,
+                                    collect_dom_fallback=True)
+
+        assert not mock_dom_markets.called
+        assert [m["outcome"] for m in build_event(capture)["markets"]] == ["Up", "Down"]
+
+    @pytest.mark.integration
+    def test_build_event_merges_markets_across_sources(self, mock_driver):
+        """Test that the same outcome from page props and CLOB tokens is emitted once."""
+        monitor = NetworkMonitor(mock_driver)
+        monitor.responses = [
+            {"url": "https://polymarket.com/_next/data/build/event/test.json", "body": json.dumps({
+                "pageProps": {"dehydratedState": {"queries": [{"state": {"data": {
+                    "title": "Test",
+                    "markets": [{
+                        "conditionId": "0xabc",
+                        "outcomes": '["Yes", "No"]',
+                        "outcomePrices": '["0.6", "0.4"]',
+                        "clobTokenIds": '["111", "222"]',
+                    }],
+                }}}]}},
+            })},
+            {"url": "https://clob.polymarket.com/api/markets/0xabc", "body": json.dumps({
+                "condition_id": "0xabc",
+                "tokens": [
+                    {"token_id": "111", "outcome": "Yes", "price": 0.61},
+                    {"token_id": "222", "outcome": "No", "price": 0.39},
+                ],
+            })},
+        ]
+        capture = EventCapture("https://polymarket.com/event/test", event_data={"title": "Test"}, monitor=monitor)
+
+        event = build_event(capture)
+
+        assert [(m["outcome"], m["token_id"]) for m in event["markets"]] == [("Yes", "111"), ("No", "222")]
+
+
 class TestDataValidation:
     """Integration tests for data validation."""
 
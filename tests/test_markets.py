@@ -0,0 +1,87 @@
+"""Unit tests for polyparse.markets module."""
+import pytest
+
+from polyparse.extractor import build_markets
+from polyparse.markets import MarketSet
+from polyparse.series import PriceSeries
+
+
+class TestMarketSet:
+    """Tests for the keyed market accumulator."""
+
+    @pytest.mark.unit
+    def test_merges_same_label(self):
+        """Test that markets without ids merge on their outcome label."""
+        markets = MarketSet([
+            {"outcome": "Yes", "current_price": 0.65, "volume": 100.0, "liquidity": 10.0},
+            {"outcome": "Yes", "current_price": 0.64, "volume": 250.0, "liquidity": 5.0},
+            {"outcome": "No", "current_price": 0.35, "volume": 100.0, "liquidity": 10.0},
+        ])
+
+        assert len(markets) == 2
+        yes = markets.find("Yes")
+        assert yes["volume"] == 250.0
+        assert yes["current_price"] == 0.64
+        assert yes["liquidity"] == 10.0
+
+    @pytest.mark.unit
+    def test_token_identity_beats_label(self):
+        """Test that distinct tokens sharing a label are kept apart."""
+        markets = MarketSet()
+        markets.add({"outcome": "Yes", "current_price": 0.3, "token_id": "1"})
+        markets.add({"outcome": "Yes", "current_price": 0.6, "token_id": "2"})
+        markets.add({"outcome": "Yes", "current_price": 0.31, "token_id": "1", "volume": 5.0})
+
+        assert [m["token_id"] for m in markets] == ["1", "2"]
+        assert markets.find("Yes")["current_price"] == 0.31
+
+    @pytest.mark.unit
+    def test_market_id_plus_outcome(self):
+        """Test that a market id keys each of its outcomes separately."""
+        markets = MarketSet([
+            {"outcome": "Yes", "current_price": 0.7, "market_id": "0xabc"},
+            {"outcome": "No", "current_price": 0.3, "market_id": "0xabc"},
+            {"outcome": "Yes", "current_price": 0.2, "market_id": "0xdef"},
+        ])
+
+        assert len(markets) == 3
+
+    @pytest.mark.unit
+    def test_history_merged_on_insert(self):
+        """Test that price histories are unioned by timestamp."""
+        markets = MarketSet()
+        stored = markets.add({"outcome": "Yes", "current_price": 0.5, "price_history": [
+            {"timestamp": "1700000000", "price": 0.4},
+            {"timestamp": "1700000060", "price": 0.5},
+        ]})
+        markets.add({"outcome": "Yes", "current_price": 0.5, "price_history": PriceSeries.from_points([
+            {"t": 1700000060, "p": 0.5},
+            {"t": 1700000120, "p": 0.55},
+        ])})
+
+        assert list(stored["price_history"].timestamps) == [
+            1700000000000, 1700000060000, 1700000120000
+        ]
+
+    @pytest.mark.unit
+    def test_missing_price_filled_from_later_insert(self):
+        """Test that a later insert supplies a missing price."""
+        markets = MarketSet([{"outcome": "Up", "current_price": None}])
+        markets.add({"outcome": "Up", "current_price": 0.52})
+
+        assert markets.find("Up")["current_price"] == 0.52
+
+    @pytest.mark.unit
+    def test_id_less_market_merges_into_keyed_entry(self):
+        """Test that an outcome seen without ids merges into the same outcome built with ids."""
+        markets = MarketSet(build_markets([{
+            "conditionId": "0xabc",
+            "outcomes": '["Yes", "No"]',
+            "outcomePrices": '["0.6", "0.4"]',
+            "clobTokenIds": '["111", "222"]',
+        }]))
+        markets.add({"outcome": "Yes", "current_price": 0.61, "volume": 10.0})
+        markets.add({"outcome": "No", "current_price": 0.39, "token_id": "222"})
+
+        assert [(m["outcome"], m["token_id"]) for m in markets] == [("Yes", "111"), ("No", "222")]
+        assert markets.find("Yes")["current_price"] == 0.61
@@ -0,0 +1,110 @@
+"""Unit tests for polyparse.matrix module."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from polyparse.extractor import build_markets
+from polyparse.matrix import align_event, align_markets
+from polyparse.series import PriceSeries
+
+
+def candidate_event():
+    """A multi-outcome event whose histories sit on different grids."""
+    return {
+        "markets": [
+            {"outcome": "Alice", "price_history": [
+                {"t": 1700000000, "p": 0.5}, {"t": 1700000120, "p": 0.6},
+            ]},
+            {"outcome": "Bob", "price_history": PriceSeries.from_points([
+                {"t": 1700000060, "p": 0.3}, {"t": 1700000120, "p": 0.2},
+            ])},
+            {"outcome": "Carol", "price_history": []},
+        ]
+    }
+
+
+class TestAlignMarkets:
+    """Tests for aligning outcome histories on a common index."""
+
+    @pytest.mark.unit
+    def test_forward_fill_on_union_index(self):
+        """Test that each outcome carries its last price forward."""
+        matrix = align_event(candidate_event())
+
+        assert matrix.outcomes == ["Alice", "Bob", "Carol"]
+        assert matrix.timestamps.tolist() == [1700000000000, 1700000060000, 1700000120000]
+        assert matrix.shape == (3, 3)
+        np.testing.assert_array_equal(matrix.prices[:, 0], [0.5, 0.5, 0.6])
+        np.testing.assert_array_equal(matrix.prices[:, 1], [np.nan, 0.3, 0.2])
+        assert np.isnan(matrix.prices[:, 2]).all()
+
+    @pytest.mark.unit
+    def test_normalize_rows(self):
+        """Test that normalized rows sum to one over known prices."""
+        matrix = align_event(candidate_event(), normalize=True)
+
+        np.testing.assert_allclose(np.nansum(matrix.prices, axis=1), [1.0, 1.0, 1.0])
+        np.testing.assert_allclose(matrix.prices[1, :2], [0.5 / 0.8, 0.3 / 0.8])
+
+    @pytest.mark.unit
+    def test_one_column_per_candidate(self):
+        """Test that a candidate event gets one uniquely labelled column per candidate."""
+        markets = build_markets([
+            {"question": "Will Alice win?", "conditionId": "0xa", "outcomes": '["Yes", "No"]',
+             "outcomePrices": '["0.6", "0.4"]', "clobTokenIds": '["1", "2"]',
+             "priceHistory": [{"t": 1700000000, "p": 0.6}]},
+            {"question": "Will Bob win?", "conditionId": "0xb", "outcomes": '["Yes", "No"]',
+             "outcomePrices": '["0.2", "0.8"]', "clobTokenIds": '["3", "4"]',
+             "priceHistory": [{"t": 1700000000, "p": 0.2}]},
+        ])
+
+        matrix = align_markets(markets, normalize=True)
+
+        assert matrix.outcomes == ["Will Alice win?", "Will Bob win?"]
+        np.testing.assert_allclose(matrix.prices[0], [0.75, 0.25])
+
+    @pytest.mark.unit
+    def test_shared_labels_made_unique(self):
+        """Test that distinct markets sharing a label get distinct column names."""
+        matrix = align_markets([
+            {"outcome": "Yes", "market_id": "0xa", "price_history": []},
+            {"outcome": "Yes", "market_id": "0xb", "price_history": []},
+        ])
+
+        assert matrix.outcomes == ["Yes", "Yes (2)"]
+
+    @pytest.mark.unit
+    def test_ohlc_bars_use_close(self):
+        """Test that resampled histories align on their closing prices."""
+        bars = PriceSeries.from_points([(1700000000, 0.4), (1700000030, 0.45)]).resample("1m")
+
+        matrix = align_markets([{"outcome": "Up", "price_history": bars}])
+
+        assert matrix.prices[:, 0].tolist() == [0.45]
+
+    @pytest.mark.unit
+    def test_save_npz_round_trip(self, tmp_path):
+        """Test that the .npz export loads back with its outcome labels."""
+        path = align_event(candidate_event()).save(str(tmp_path / "event.npz"))
+
+        with np.load(path) as data:
+            assert data["outcomes"].tolist() == ["Alice", "Bob", "Carol"]
+            assert data["timestamps"].tolist() == [1700000000000, 1700000060000, 1700000120000]
+            assert data["prices"].shape == (3, 3)
+
+    @pytest.mark.unit
+    def test_save_arrow(self, tmp_path):
+        """Test the Arrow IPC export."""
+        pa = pytest.importorskip("pyarrow")
+        path = align_event(candidate_event()).save(str(tmp_path / "event.arrow"))
+
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        assert table.column_names == ["timestamp", "Alice", "Bob", "Carol"]
+        assert table.column("Alice").to_pylist() == [0.5, 0.5, 0.6]
+
+    @pytest.mark.unit
+    def test_unknown_format(self, tmp_path):
+        """Test that unsupported extensions are rejected."""
+        with pytest.raises(ValueError):
+            align_event(candidate_event()).save(str(tmp_path / "event.csv"))
@@ -0,0 +1,99 @@
+"""Unit tests for polyparse.page module."""
+import pytest
+
+from polyparse.page import (
+    SCROLL_SETTLE_SCRIPT,
+    PageSnapshot,
+    invalidate_page_snapshot,
+    page_snapshot,
+    scroll_until_settled,
+)
+from polyparse.parser import detect_recurring_event
+
+
+class CountingDriver:
+    """Driver stand-in that counts page_source downloads."""
+
+    def __init__(self, source, url="https://polymarket.com/event/test"):
+        self.source = source
+        self.current_url = url
+        self.downloads = 0
+
+    @property
+    def page_source(self):
+        self.downloads += 1
+        return self.source
+
+
+class TestPageSnapshot:
+    """Tests for the per-navigation page snapshot cache."""
+
+    @pytest.mark.unit
+    def test_source_downloaded_once_per_page(self):
+        """Test that repeated checks share one download until the page changes."""
+        driver = CountingDriver("<html><body><h2>Past Events</h2> Resolved</body></html>")
+
+        assert page_snapshot(driver).contains_any(["Resolved", "Settled"])
+        assert detect_recurring_event(driver) is True
+        assert driver.downloads == 1
+
+        driver.current_url = "https://polymarket.com/event/other"
+        page_snapshot(driver)
+        assert driver.downloads == 2
+
+        invalidate_page_snapshot(driver)
+        page_snapshot(driver)
+        assert driver.downloads == 3
+
+    @pytest.mark.unit
+    def test_find_any_is_case_insensitive(self):
+        """Test the multi-keyword search over the lower-cased buffer."""
+        snapshot = PageSnapshot("u", "<div>Market CLOSED after the Previous Events</div>")
+
+        assert snapshot.find_any(["Previous Events", "Closed"]) == "closed"
+        assert snapshot.find_any(["Settled"]) is None
+        assert snapshot.find_any([]) is None
+
+    @pytest.mark.unit
+    def test_missing_source(self):
+        """Test that a missing page source behaves as an empty page."""
+        assert PageSnapshot("u", None).contains_any(["Resolved"]) is False
+
+
+class TestScrollUntilSettled:
+    """Tests for the shared adaptive scroll driver."""
+
+    @pytest.mark.unit
+    def test_stops_when_scroll_triggers_nothing(self, mock_driver):
+        """Test that scrolling ends on the first round with no growth and no requests."""
+        mock_driver.execute_async_script.side_effect = [
+            {"grew": True, "requests": 0},
+            {"grew": False, "requests": 3},
+            {"grew": False, "requests": 0},
+            {"grew": True, "requests": 1},
+        ]
+
+        assert scroll_until_settled(mock_driver, max_rounds=8) == 2
+        assert mock_driver.execute_async_script.call_count == 3
+        script, quiet_ms, max_ms = mock_driver.execute_async_script.call_args[0]
+        assert script == SCROLL_SETTLE_SCRIPT
+        assert (quiet_ms, max_ms) == (600, 3000)
+
+    @pytest.mark.unit
+    def test_after_scroll_ends_early(self, mock_driver):
+        """Test that the per-round callback can stop the scrolling."""
+        mock_driver.execute_async_script.return_value = {"grew": True, "requests": 1}
+
+        assert scroll_until_settled(mock_driver, max_rounds=8, after_scroll=lambda: True) == 1
+        assert mock_driver.execute_async_script.call_count == 1
+
+    @pytest.mark.unit
+    def test_falls_back_to_height_comparison(self, mock_driver):
+        """Test the fixed-pause fallback when async scripts are unavailable."""
+        mock_driver.execute_async_script.side_effect = Exception("unsupported")
+        heights = iter([100, None, 200, 200, None, 200])
+        mock_driver.execute_script.side_effect = lambda script: next(heights)
+        pauses = []
+
+        assert scroll_until_settled(mock_driver, max_rounds=5, fallback_pause=0.25, pause=pauses.append) == 1
+        assert pauses == [0.25, 0.25]
@@ -11,6 +11,12 @@ from polyparse.parser import (
     extract_resolved_outcome,
     detect_recurring_event,
     get_past_event_urls,
+    navigate_to_event,
+    prefetch_pages,
+    CLIENT_NAVIGATION_SCRIPT,
+    PREFETCH_SCRIPT,
+    SCAN_MAX_NODES,
+    SCAN_MAX_MS,
 )
 
 
@@ -59,6 +65,26 @@ class TestEventMetadataExtraction:
 
         assert isinstance(result, dict)
 
+    @pytest.mark.unit
+    def test_metadata_from_single_script(self, mock_driver):
+        """Test that in-page metadata is used without per-selector lookups."""
+        mock_driver.execute_script.return_value = {
+            "title": "Will Bitcoin hit $100k in 2024?",
+            "description": "This market will resolve to Yes if Bitcoin reaches $100,000",
+            "end_date": "Dec 31, 2024",
+            "resolved": 1,
+        }
+
+        metadata = extract_event_metadata(mock_driver)
+
+        assert metadata["title"] == "Will Bitcoin hit $100k in 2024?"
+        assert metadata["end_date"] == "Dec 31, 2024"
+        assert metadata["resolved"] is True
+        assert mock_driver.execute_script.call_count == 1
+        config = mock_driver.execute_script.call_args[0][1]
+        assert "h1" in config["title"]
+        mock_driver.find_elements.assert_not_called()
+
 
 class TestMarketDataExtraction:
     """Tests for market data extraction."""
@@ -86,6 +112,22 @@ class TestMarketDataExtraction:
         # Should return at least one market (Unknown as fallback)
         assert len(markets) >= 1
 
+    @pytest.mark.unit
+    def test_extract_scans_text_nodes_with_budget(self, mock_driver):
+        """Test that the in-page scan walks text nodes under a node/time budget."""
+        mock_driver.execute_script.return_value = [
+            {"outcome": "Yes", "price": 0.62},
+            {"outcome": "No", "price": 0.38},
+        ]
+
+        markets = extract_market_data(mock_driver)
+
+        assert [(m["outcome"], m["current_price"]) for m in markets] == [("Yes", 0.62), ("No", 0.38)]
+        script, max_nodes, max_ms = mock_driver.execute_script.call_args[0]
+        assert "createTreeWalker" in script
+        assert "querySelectorAll('button" not in script
+        assert (max_nodes, max_ms) == (SCAN_MAX_NODES, SCAN_MAX_MS)
+
     @pytest.mark.unit
     def test_extract_handles_exceptions_gracefully(self, mock_driver):
         """Test that extraction handles exceptions gracefully."""
@@ -426,3 +468,46 @@ class TestParserIntegration:
 
             urls = get_past_event_urls(mock_driver, 5)
             assert isinstance(urls, list)
+
+
+class TestClientNavigation:
+    """Tests for in-app navigation between events."""
+
+    @pytest.mark.unit
+    def test_in_app_navigation_skips_page_load(self, mock_driver):
+        """Test that a successful client-side navigation does not reload the page."""
+        mock_driver.execute_async_script.return_value = True
+
+        navigate_to_event(mock_driver, "https://polymarket.com/event/past-1", fast_mode=True, in_app=True)
+
+        script, url, timeout_ms = mock_driver.execute_async_script.call_args[0]
+        assert script == CLIENT_NAVIGATION_SCRIPT
+        assert url == "https://polymarket.com/event/past-1"
+        assert timeout_ms == 10000
+        mock_driver.get.assert_not_called()
+
+    @pytest.mark.unit
+    def test_falls_back_to_full_load(self, mock_driver):
+        """Test that a failed client-side navigation falls back to driver.get."""
+        mock_driver.execute_async_script.return_value = False
+        mock_driver.execute_script.return_value = "complete"
+
+        with patch("polyparse.parser.time.sleep"):
+            navigate_to_event(mock_driver, "https://polymarket.com/event/past-1", fast_mode=True, in_app=True)
+
+        mock_driver.get.assert_called_once_with("https://polymarket.com/event/past-1")
+
+    @pytest.mark.unit
+    def test_prefetch_pages(self, mock_driver):
+        """Test that upcoming pages are handed to the page in one call."""
+        urls = ["https://polymarket.com/event/past-2", "https://polymarket.com/event/past-3"]
+
+        assert prefetch_pages(mock_driver, urls, concurrency=1, in_app=True) is True
+        mock_driver.execute_script.assert_called_once_with(PREFETCH_SCRIPT, urls, 1, True)
+
+        assert prefetch_pages(mock_driver, []) is True
+        assert mock_driver.execute_script.call_count == 1
+
+        mock_driver.execute_script.side_effect = Exception("no js")
+        assert prefetch_pages(mock_driver, urls) is False
+
@@ -0,0 +1,168 @@
+"""Unit tests for polyparse.series module."""
+import json
+import pytest
+
+from polyparse import series
+from polyparse.series import OHLCSeries, PriceSeries, json_default, parse_interval, resample_event
+
+
+class TestPriceSeries:
+    """Tests for the columnar price history type."""
+
+    @pytest.mark.unit
+    def test_normalizes_sorts_and_dedups(self):
+        """Test bulk normalization of mixed point shapes."""
+        ps = PriceSeries.from_points([
+            {"t": 1700000120, "p": 0.55},
+            {"timestamp": "2023-11-14T22:13:20Z", "price": 0.4},
+            {"time": "1700000060000", "value": "0.5"},
+            {"timestamp": 1700000120, "price": 0.56},
+            {"timestamp": "", "price": 0.9},
+            "garbage",
+        ])
+
+        assert list(ps.timestamps) == [1700000000000, 1700000060000, 1700000120000]
+        assert list(ps.prices) == [0.4, 0.5, 0.56]
+
+    @pytest.mark.unit
+    def test_serializes_to_point_dicts(self):
+        """Test that output keeps the list-of-points JSON shape."""
+        ps = PriceSeries.from_points([{"timestamp": "2024-01-01T00:00:00Z", "price": 0.45}])
+
+        assert ps.to_list() == [{"timestamp": "2024-01-01T00:00:00Z", "price": 0.45}]
+        assert ps[0] == {"timestamp": "2024-01-01T00:00:00Z", "price": 0.45}
+        assert ps == [{"timestamp": "2024-01-01T00:00:00Z", "price": 0.45}]
+        assert json.loads(json.dumps({"h": ps}, default=json_default)) == {"h": ps.to_list()}
+
+    @pytest.mark.unit
+    def test_high_resolution_epochs_serialize(self):
+        """Test that microsecond epochs are stored as milliseconds and unusable ones dropped."""
+        ps = PriceSeries.from_points([
+            {"timestamp": 1704067200000000, "price": 0.5},
+            {"timestamp": 10 ** 25, "price": 0.6},
+        ])
+
+        assert json.loads(json.dumps(ps, default=json_default)) == [
+            {"timestamp": "2024-01-01T00:00:00Z", "price": 0.5}
+        ]
+
+    @pytest.mark.unit
+    def test_merge_prefers_other_on_ties(self):
+        """Test that merging unions timestamps and lets the argument win ties."""
+        a = PriceSeries.from_points([{"t": 1, "p": 0.1}, {"t": 2, "p": 0.2}])
+        b = PriceSeries.from_points([{"t": 2, "p": 0.25}, {"t": 3, "p": 0.3}])
+
+        merged = a.merge(b)
+
+        assert list(merged.timestamps) == [1000, 2000, 3000]
+        assert list(merged.prices) == [0.1, 0.25, 0.3]
+        assert a.merge(PriceSeries()) is a
+
+    @pytest.mark.unit
+    def test_merge_interleaved_and_disjoint(self):
+        """Test the linear merge against interleaved and non-overlapping inputs."""
+        a = PriceSeries.from_points([(t, 0.1) for t in (1, 3, 5, 7)])
+        b = PriceSeries.from_points([(t, 0.2) for t in (2, 3, 6, 9)])
+
+        merged = a.merge(b)
+
+        assert list(merged.timestamps) == [1000, 2000, 3000, 5000, 6000, 7000, 9000]
+        assert merged.prices[2] == 0.2
+        assert list(b.merge(PriceSeries.from_points([(10, 0.3)])).timestamps)[-1] == 10000
+
+    @pytest.mark.unit
+    def test_between_and_after(self):
+        """Test range filtering with mixed bound formats."""
+        ps = PriceSeries.from_points([(1704067200 + i * 60, i / 10) for i in range(5)])
+
+        window = ps.between("2024-01-01T00:01:00Z", 1704067380)
+        assert list(window.prices) == [0.1, 0.2, 0.3]
+        assert len(ps.between(end="2024-01-01T00:00:30Z")) == 1
+        assert list(ps.after(1704067320000).prices) == [0.3, 0.4]
+
+    @pytest.mark.unit
+    def test_numpy_and_python_paths_agree(self, monkeypatch):
+        """Test that the vectorized path matches the pure-Python one."""
+        points = [{"t": 1700000000 + (i * 37) % 500, "p": i / 1000} for i in range(1000)]
+
+        monkeypatch.setattr(series, "NUMPY_MIN_POINTS", 1)
+        vectorized = PriceSeries.from_points(points)
+        monkeypatch.setattr(series, "np", None)
+        pure = PriceSeries.from_points(points)
+
+        assert vectorized == pure
+        assert len(pure) == 500
+
+
+class TestResample:
+    """Tests for bar resampling of price series."""
+
+    @pytest.mark.unit
+    def test_parse_interval(self):
+        """Test interval strings and their validation."""
+        assert parse_interval("30s") == 30_000
+        assert parse_interval("15m") == 900_000
+        assert parse_interval("1H") == 3_600_000
+        assert parse_interval(5000) == 5000
+        with pytest.raises(ValueError):
+            parse_interval("hourly")
+        with pytest.raises(ValueError):
+            parse_interval("0h")
+
+    @pytest.mark.unit
+    def test_ohlc_bars(self):
+        """Test that bars are UTC-aligned and skip empty intervals."""
+        ps = PriceSeries.from_points([
+            ("2024-01-01T00:05:00Z", 0.5),
+            ("2024-01-01T00:20:00Z", 0.8),
+            ("2024-01-01T00:40:00Z", 0.3),
+            ("2024-01-01T00:55:00Z", 0.6),
+            ("2024-01-01T03:10:00Z", 0.9),
+        ])
+
+        bars = ps.resample("1h")
+
+        assert isinstance(bars, OHLCSeries)
+        assert bars.to_list() == [
+            {"timestamp": "2024-01-01T00:00:00Z", "open": 0.5, "high": 0.8, "low": 0.3, "close": 0.6},
+            {"timestamp": "2024-01-01T03:00:00Z", "open": 0.9, "high": 0.9, "low": 0.9, "close": 0.9},
+        ]
+        assert ps.resample("1h", how="last") == [
+            {"timestamp": "2024-01-01T00:00:00Z", "price": 0.6},
+            {"timestamp": "2024-01-01T03:00:00Z", "price": 0.9},
+        ]
+        assert len(PriceSeries().resample("1h")) == 0
+        with pytest.raises(ValueError):
+            ps.resample("1h", how="mean")
+
+    @pytest.mark.unit
+    def test_numpy_and_python_resample_agree(self, monkeypatch):
+        """Test that vectorized binning matches the pure-Python loop."""
+        ps = PriceSeries.from_points([(1700000000 + i * 7, (i * 37 % 101) / 100) for i in range(5000)])
+
+        monkeypatch.setattr(series, "NUMPY_MIN_POINTS", 1)
+        vectorized = (ps.resample("15m"), ps.resample("15m", how="last"))
+        monkeypatch.setattr(series, "np", None)
+        pure = (ps.resample("15m"), ps.resample("15m", how="last"))
+
+        assert vectorized == pure
+        assert len(pure[0]) == 40
+
+    @pytest.mark.unit
+    def test_resample_event_shares_results(self):
+        """Test that markets sharing one history share the resampled bars."""
+        shared = PriceSeries.from_points([(1700000000, 0.4), (1700000100, 0.5)])
+        event = {
+            "markets": [{"outcome": "Up", "price_history": shared}, {"outcome": "Down", "price_history": shared}],
+            "past_events": [{"markets": [{"outcome": "Up", "price_history": [{"t": 1690000000, "p": 0.3}]}]}],
+        }
+
+        resample_event(event, "1d", how="last")
+
+        up, down = event["markets"]
+        assert up["price_history"] is down["price_history"]
+        assert len(up["price_history"]) == 1
+        assert event["past_events"][0]["markets"][0]["price_history"] == [
+            {"timestamp": "2023-07-22T00:00:00Z", "price": 0.3}
+        ]
+        assert json.loads(json.dumps(event, default=json_default))["markets"][0]["price_history"][0]["price"] == 0.5
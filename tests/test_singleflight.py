@@ -0,0 +1,109 @@
+"""Unit tests for polyparse.singleflight module."""
+import threading
+import time
+import pytest
+
+from polyparse.series import copy_event
+from polyparse.singleflight import SingleFlight, flight_key
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent scrapes of the same event."""
+
+    @pytest.mark.unit
+    def test_flight_key_normalizes_urls(self):
+        """Test that URL forms and bare slugs of one event share a key."""
+        keys = {
+            flight_key("https://polymarket.com/event/btc-daily?tid=1"),
+            flight_key("polymarket.com/event/btc-daily/"),
+            flight_key("btc-daily"),
+        }
+        assert keys == {"btc-daily"}
+
+    @pytest.mark.unit
+    def test_concurrent_callers_share_one_call(self):
+        """Test that callers arriving mid-flight wait for and share the leader's result."""
+        arrived = threading.Semaphore(0)
+
+        def counting_key(url):
+            arrived.release()
+            return flight_key(url)
+
+        flights = SingleFlight(key=counting_key)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def scrape(url):
+            calls.append(url)
+            started.set()
+            release.wait(5)
+            return {"url": url}
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(
+            flights.do("https://polymarket.com/event/x", scrape, "https://polymarket.com/event/x")))
+        leader.start()
+        assert started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(flights.do("x", scrape, "x")))
+                     for _ in range(4)]
+        for follower in followers:
+            follower.start()
+        for _ in range(5):
+            assert arrived.acquire(timeout=5)
+        time.sleep(0.05)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert len(results) == 5
+        assert all(result is results[0] for result in results)
+        assert flights.in_flight() == 0
+
+    @pytest.mark.unit
+    def test_copy_gives_each_caller_its_own_result(self):
+        """Test that with copy= a caller changing its result does not change the others'."""
+        arrived = threading.Semaphore(0)
+
+        def counting_key(url):
+            arrived.release()
+            return flight_key(url)
+
+        flights = SingleFlight(key=counting_key, copy=copy_event)
+        started = threading.Event()
+        release = threading.Event()
+
+        def scrape():
+            started.set()
+            release.wait(5)
+            return {"title": "X", "markets": [{"outcome": "Yes", "current_price": 0.6}]}
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flights.do("x", scrape)))
+        leader.start()
+        assert started.wait(5)
+        follower = threading.Thread(target=lambda: results.append(flights.do("x", scrape)))
+        follower.start()
+        for _ in range(2):
+            assert arrived.acquire(timeout=5)
+        time.sleep(0.05)
+        release.set()
+        for thread in (leader, follower):
+            thread.join(5)
+
+        results[0]["markets"][0]["current_price"] = 1.0
+        results[0]["title"] = "changed"
+        assert results[1] == {"title": "X", "markets": [{"outcome": "Yes", "current_price": 0.6}]}
+
+    @pytest.mark.unit
+    def test_errors_reach_every_waiter_and_are_not_kept(self):
+        """Test that a failed flight raises for its callers and the next call runs again."""
+        flights = SingleFlight()
+
+        def fail():
+            raise RuntimeError("scrape failed")
+
+        with pytest.raises(RuntimeError):
+            flights.do("x", fail)
+        assert flights.do("x", lambda: "ok") == "ok"
@@ -0,0 +1,186 @@
+"""Unit tests for polyparse.store module."""
+import json
+import time
+import pytest
+
+from polyparse.series import PriceSeries, resample_event
+from polyparse.store import EventCache, HistoryStore, ResolvedEventCache
+
+
+def scraped_event(points):
+    """An event whose single market carries the given (timestamp, price) points."""
+    return {
+        "event_id": "btc-updown",
+        "title": "BTC Up or Down",
+        "markets": [{
+            "outcome": "Up",
+            "token_id": "111",
+            "current_price": points[-1][1],
+            "price_history": [{"timestamp": t, "price": p} for t, p in points],
+        }],
+    }
+
+
+class TestHistoryStore:
+    """Tests for the append-only price history store."""
+
+    @pytest.mark.unit
+    def test_first_write_stores_everything(self, tmp_path):
+        """Test that an empty store takes the whole history."""
+        store = HistoryStore(str(tmp_path), "btc-updown")
+
+        added = store.append(scraped_event([(1700000000, 0.5), (1700000060, 0.55)]))
+
+        assert added == 2
+        assert store.last_timestamps() == {"token/111": 1700000060000}
+        with open(store.snapshot_path) as f:
+            snapshot = json.load(f)
+        assert snapshot["title"] == "BTC Up or Down"
+        assert "price_history" not in snapshot["markets"][0]
+
+    @pytest.mark.unit
+    def test_refresh_appends_only_newer_points(self, tmp_path):
+        """Test that a refresh writes just the points after the last stored one."""
+        store = HistoryStore(str(tmp_path), "btc-updown")
+        store.append(scraped_event([(1700000000, 0.5), (1700000060, 0.55)]))
+
+        added = store.append(scraped_event([(1700000000, 0.5), (1700000060, 0.55), (1700000120, 0.6)]))
+
+        assert added == 1
+        with open(store.history_path) as f:
+            assert len(f.readlines()) == 3
+        assert store.append(scraped_event([(1700000060, 0.55)])) == 0
+
+    @pytest.mark.unit
+    def test_load_rebuilds_history(self, tmp_path):
+        """Test that loading returns the full de-duplicated history."""
+        store = HistoryStore(str(tmp_path), "btc-updown")
+        store.append(scraped_event([(1700000000, 0.5)]))
+        store.append(scraped_event([(1700000060, 0.55), (1700000120, 0.6)]))
+        with open(store.history_path, "a") as f:
+            f.write(json.dumps({"market": "token/111", "timestamp": 1700000120, "price": 0.6}) + "\n")
+
+        event = store.load()
+
+        assert event["markets"][0]["current_price"] == 0.6
+        assert list(event["markets"][0]["price_history"].prices) == [0.5, 0.55, 0.6]
+
+
+class TestResolvedEventCache:
+    """Tests for the write-once resolved-event cache."""
+
+    @pytest.mark.unit
+    def test_only_resolved_events_are_cached_once(self, tmp_path):
+        """Test admission by the resolved flag and that entries are never rewritten."""
+        cache = ResolvedEventCache(str(tmp_path))
+        event = scraped_event([(1700000000, 0.5), (1700000060, 1.0)])
+        event["url"] = "https://polymarket.com/event/btc-updown"
+        event["resolved_source"] = "event"
+
+        assert cache.put(event) is False
+        assert cache.get("btc-updown") is None
+
+        event["resolved"] = True
+        assert cache.put(event) is True
+        assert cache.put({**event, "title": "Changed"}) is False
+
+        cached = cache.get("btc-updown")
+        assert cached["title"] == "BTC Up or Down"
+        assert cached["resolved_source"] == "event"
+        assert isinstance(cached["markets"][0]["price_history"], list)
+        columnar = cache.get("btc-updown", columnar=True)
+        assert isinstance(columnar["markets"][0]["price_history"], PriceSeries)
+        assert len(columnar["markets"][0]["price_history"]) == 2
+
+
+    @pytest.mark.unit
+    def test_page_keyword_flag_alone_is_not_trusted(self, tmp_path):
+        """Test that a page-derived resolved flag is admitted only once the end date has passed."""
+        cache = ResolvedEventCache(str(tmp_path))
+        live = {**scraped_event([(1700000000, 0.5)]), "event_id": "live", "resolved": True,
+                "end_date": "2999-01-01T00:00:00Z"}
+        ended = {**scraped_event([(1700000000, 0.5)]), "event_id": "ended", "resolved": True,
+                 "end_date": "2024-01-01T00:00:00Z"}
+
+        assert cache.put(live) is False
+        assert cache.put({**live, "end_date": None}) is False
+        assert cache.put(ended) is True
+        assert cache.get("ended")["resolved_source"] == "end_date"
+
+    @pytest.mark.unit
+    def test_incomplete_scrapes_are_not_cached(self, tmp_path):
+        """Test that resolved events without priced markets or history are refused."""
+        cache = ResolvedEventCache(str(tmp_path))
+        event = {**scraped_event([(1700000000, 1.0)]), "resolved": True, "resolved_source": "event"}
+
+        assert cache.put({**event, "markets": []}) is False
+        assert cache.put({**event, "markets": [{**event["markets"][0], "current_price": None}]}) is False
+        assert cache.put({**event, "markets": [{**event["markets"][0], "price_history": []}]}) is False
+        assert cache.get("btc-updown") is None
+        assert cache.put(event) is True
+
+
+class TestEventCache:
+    """Tests for the TTL result cache."""
+
+    @pytest.mark.unit
+    def test_fresh_stale_and_expired(self, tmp_path):
+        """Test fresh hits, stale-while-revalidate and synchronous refresh after expiry."""
+        calls = []
+
+        def extract(url):
+            calls.append(url)
+            return {"url": url, "title": f"v{len(calls)}", "markets": []}
+
+        url = "https://polymarket.com/event/live-1"
+        with EventCache(str(tmp_path), ttl=10, stale_ttl=20) as cache:
+            assert cache.fetch(url, extract, url)["cache"]["status"] == "miss"
+            assert cache.fetch(url, extract, url)["cache"]["status"] == "fresh"
+            assert len(calls) == 1
+
+            cache.store("live-1", {"url": url, "title": "old", "markets": []}, stored_at=time.time() - 15)
+            stale = cache.fetch(url, extract, url)
+            assert (stale["title"], stale["cache"]["status"]) == ("old", "stale")
+            assert stale["cache"]["age_seconds"] >= 15
+            deadline = time.time() + 5
+            while cache.lookup("live-1")[1]["title"] != "v2" and time.time() < deadline:
+                time.sleep(0.01)
+            assert cache.lookup("live-1")[1]["title"] == "v2"
+
+            cache.store("live-1", {"url": url, "title": "old", "markets": []}, stored_at=time.time() - 60)
+            expired = cache.fetch(url, extract, url)
+            assert expired["cache"]["status"] == "miss"
+            assert expired["title"] == "v3"
+
+    @pytest.mark.unit
+    def test_disk_tier_and_per_event_ttl(self, tmp_path):
+        """Test that a new cache instance serves from disk and honours a TTL callable."""
+        url = "https://polymarket.com/event/live-2"
+        event = scraped_event([(1700000000, 0.5)])
+        with EventCache(str(tmp_path)) as cache:
+            cache.store("live-2", event, stored_at=time.time() - 100)
+
+        def extract(url):
+            raise AssertionError("should be served from disk")
+
+        with EventCache(str(tmp_path), ttl=lambda e: 1000 if e["event_id"] == "btc-updown" else 0) as cache:
+            served = cache.fetch(url, extract, url)
+        assert served["cache"]["status"] == "fresh"
+        assert served["markets"][0]["price_history"] == event["markets"][0]["price_history"]
+
+    @pytest.mark.unit
+    def test_served_results_do_not_share_state(self):
+        """Test that changing a served event, e.g. by resampling it, leaves the cached one intact."""
+        url = "https://polymarket.com/event/live-3"
+        event = scraped_event([(1700000000, 0.5), (1700000060, 0.6)])
+        with EventCache(ttl=1000) as cache:
+            served = cache.fetch(url, lambda: event)
+            resample_event(served, "1h")
+            served["markets"].append({"outcome": "Down"})
+
+            again = cache.fetch(url, lambda: event)
+        assert again["cache"]["status"] == "fresh"
+        assert [m["outcome"] for m in again["markets"]] == ["Up"]
+        assert again["markets"][0]["price_history"] == [
+            {"timestamp": 1700000000, "price": 0.5}, {"timestamp": 1700000060, "price": 0.6},
+        ]
@@ -5,6 +5,8 @@ from polyparse.utils import (
     extract_slug_from_url,
     extract_event_id_from_url,
     normalize_to_url,
+    to_epoch_ms,
+    format_epoch_ms,
 )
 
 
@@ -198,3 +200,59 @@ class TestEdgeCases:
         result = extract_slug_from_url(url)
         # The implementation captures until /?
         assert "test-event" in result
+
+
+class TestTimestampNormalization:
+    """Tests for converting raw timestamps to epoch milliseconds."""
+
+    @pytest.mark.unit
+    def test_epoch_seconds_and_millis(self):
+        """Test that numeric epochs in seconds or milliseconds agree."""
+        assert to_epoch_ms(1700000000) == 1700000000000
+        assert to_epoch_ms(1700000000.5) == 1700000000500
+        assert to_epoch_ms("1700000000") == 1700000000000
+        assert to_epoch_ms(1700000000000) == 1700000000000
+
+    @pytest.mark.unit
+    def test_epoch_micros_and_nanos(self):
+        """Test that microsecond and nanosecond epochs are scaled down to milliseconds."""
+        assert to_epoch_ms(1700000000123456) == 1700000000123
+        assert to_epoch_ms("1700000000123456789") == 1700000000123
+        assert to_epoch_ms(1700000000000000.0) == 1700000000000
+
+    @pytest.mark.unit
+    def test_out_of_range_epochs_dropped(self):
+        """Test that epochs no datetime can represent normalize to None."""
+        assert to_epoch_ms(10 ** 25) is None
+        assert to_epoch_ms(-(10 ** 20)) is None
+
+    @pytest.mark.unit
+    def test_iso_strings(self):
+        """Test ISO-8601 strings with fractions and UTC offsets."""
+        assert to_epoch_ms("2024-01-01T00:00:00Z") == 1704067200000
+        assert to_epoch_ms("2024-01-01T00:00:00.250Z") == 1704067200250
+        assert to_epoch_ms("2024-01-01T05:30:00+05:30") == 1704067200000
+        assert to_epoch_ms("2023-12-31T16:00:00-0800") == 1704067200000
+        assert to_epoch_ms("2024-01-01") == 1704067200000
+
+    @pytest.mark.unit
+    def test_invalid_values(self):
+        """Test that unusable values normalize to None."""
+        assert to_epoch_ms(None) is None
+        assert to_epoch_ms("") is None
+        assert to_epoch_ms("not a date") is None
+        assert to_epoch_ms("2024-02-30T00:00:00Z") is None
+        assert to_epoch_ms(float("nan")) is None
+
+    @pytest.mark.unit
+    def test_mixed_formats_order_correctly(self):
+        """Test that mixed formats sort chronologically once normalized."""
+        raw = ["2024-01-01T00:00:01Z", 1704067200, "1704067200500", "2024-01-01T01:00:00+01:00"]
+        ordered = sorted(raw, key=to_epoch_ms)
+        assert [to_epoch_ms(v) for v in ordered] == [1704067200000, 1704067200000, 1704067200500, 1704067201000]
+
+    @pytest.mark.unit
+    def test_format_round_trip(self):
+        """Test formatting epoch milliseconds back to ISO-8601."""
+        assert format_epoch_ms(1704067200000) == "2024-01-01T00:00:00Z"
+        assert to_epoch_ms(format_epoch_ms(1704067200250)) == 1704067200250